@@ -0,0 +1,182 @@
+"""
+Jellyfin API Benchmark
+
+/api/v1/jellyfin/* 엔드포인트 처리량 및 p50/p99 측정 (실제 Jellyfin 불필요)
+
+Fake Jellyfin(benchmarks.fake_jellyfin)과 WSOPTV 앱을 모두 in-process ASGI로 띄워
+동시 요청을 보내고, 시나리오별 처리량/지연과 업스트림 요청 수를 출력한다.
+인증과 DB 의존성은 대체한다 (미러 비활성).
+
+실행: python -m benchmarks.bench_jellyfin_api [--requests 500] [--concurrency 50]
+      [--items 2000] [--latency-ms 20] [--no-cache] [--scenario contents ...]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable
+
+# src 설정은 import 시점에 읽히므로 먼저 지정
+os.environ.setdefault("JELLYFIN_HOST", "http://fake-jellyfin")
+os.environ.setdefault("JELLYFIN_CACHE_REDIS_ENABLED", "false")
+os.environ.setdefault("JELLYFIN_MIRROR_ENABLED", "false")
+os.environ.setdefault("THUMBNAIL_CACHE_PATH", tempfile.mkdtemp(prefix="bench-thumbs-"))
+
+import httpx  # noqa: E402
+
+from benchmarks.fake_jellyfin import create_app  # noqa: E402
+from src.core.config import settings  # noqa: E402
+from src.core.database import get_db  # noqa: E402
+from src.core.deps import get_current_active_user  # noqa: E402
+from src.main import app  # noqa: E402
+from src.models.user import User  # noqa: E402
+from src.services.jellyfin import jellyfin_service  # noqa: E402
+
+PREFIX = f"{settings.API_V1_PREFIX}/jellyfin"
+
+
+@dataclass
+class Scenario:
+    name: str
+    make_path: Callable[[random.Random], str]
+
+
+def build_scenarios(item_ids: list[str], library_names: list[str]) -> dict[str, Scenario]:
+    """시나리오별 요청 경로 생성기 (핫셋: 목록 앞쪽 페이지, 최근 아이템 위주)"""
+    hot_ids = item_ids[:200]
+    terms = ["main event", "day 1", "day 2", "event #1", "wsop", "hcl"]
+
+    return {
+        "contents": Scenario(
+            "contents",
+            lambda rng: f"{PREFIX}/contents?library={rng.choice(library_names)}"
+                        f"&page={rng.randint(1, 5)}&limit=20",
+        ),
+        "detail": Scenario(
+            "detail",
+            lambda rng: f"{PREFIX}/contents/{rng.choice(hot_ids)}",
+        ),
+        "batch": Scenario(
+            "batch",
+            lambda rng: f"{PREFIX}/contents/batch?ids={','.join(rng.sample(hot_ids, 20))}",
+        ),
+        "search": Scenario(
+            "search",
+            lambda rng: f"{PREFIX}/search?q={rng.choice(terms)}&limit=20",
+        ),
+        "thumbnail": Scenario(
+            "thumbnail",
+            lambda rng: f"{PREFIX}/thumbnail/{rng.choice(hot_ids)}?width=480",
+        ),
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    total: int,
+    concurrency: int,
+    seed: int = 7,
+) -> tuple[list[float], Counter, float]:
+    """동시 요청 실행 → (지연 ms 목록, 상태 코드 집계, 총 소요 초)"""
+    rng = random.Random(seed)
+    paths = [scenario.make_path(rng) for _ in range(total)]
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for path in paths:
+        queue.put_nowait(path)
+
+    async def worker():
+        while not queue.empty():
+            path = queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def main_async(args: argparse.Namespace):
+    if args.no_cache:
+        settings.JELLYFIN_CACHE_ENABLED = False
+
+    fake = create_app(args.items, args.libraries, args.latency_ms, args.jitter_ms)
+    jellyfin_service._client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=fake),
+        base_url=settings.JELLYFIN_HOST,
+        headers=jellyfin_service.headers,
+    )
+
+    async def fake_user() -> User:
+        return User(id=1, username="bench", password_hash="", role="user", status="approved")
+
+    async def no_db():
+        yield None
+
+    app.dependency_overrides[get_current_active_user] = fake_user
+    app.dependency_overrides[get_db] = no_db
+
+    item_ids = [item["Id"] for item in sorted(
+        fake.state.catalog, key=lambda item: item["DateCreated"], reverse=True
+    )]
+    scenarios = build_scenarios(item_ids, [lib["Name"] for lib in fake.state.libraries])
+    selected = args.scenario or list(scenarios)
+
+    print(f"[JellyfinBench] items={args.items} latency={args.latency_ms}+{args.jitter_ms}ms "
+          f"requests={args.requests} concurrency={args.concurrency} "
+          f"cache={'off' if args.no_cache else 'on'}")
+    print(f"  {'scenario':<10} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'upstream':>9}  status")
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://wsoptv"
+    ) as client:
+        for name in selected:
+            before = sum(fake.state.requests.values())
+            latencies, statuses, elapsed = await run_scenario(
+                client, scenarios[name], args.requests, args.concurrency
+            )
+            upstream = sum(fake.state.requests.values()) - before
+            print(
+                f"  {name:<10} {len(latencies) / elapsed:8.0f} "
+                f"{statistics.median(latencies):8.1f} {percentile(latencies, 99):8.1f} "
+                f"{upstream:9d}  {dict(statuses)}"
+            )
+
+    print(f"[JellyfinBench] response cache: {jellyfin_service.cache.stats()}")
+    await jellyfin_service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jellyfin API benchmark against a fake Jellyfin")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--libraries", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--no-cache", action="store_true", help="Disable the response cache")
+    parser.add_argument(
+        "--scenario", action="append",
+        choices=["contents", "detail", "batch", "search", "thumbnail"],
+        help="Run only the given scenario (repeatable)",
+    )
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Jellyfin Decode Benchmark
+
+/Items 페이지 디코딩 경로 비교 (Jellyfin 서버 불필요)
+
+- legacy: 표준 json + 전체 필드(MediaSources) + JellyfinItem 중첩 모델
+          → from_jellyfin_item 재검증
+- lean:   jsonlib(orjson) + 필요한 필드만 + from_jellyfin_data(model_construct)
+
+실행: python -m benchmarks.bench_jellyfin_decode [--items 100] [--rounds 200]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Callable
+
+from src.core import jsonlib
+from src.schemas.jellyfin import (
+    JellyfinContentListResponse,
+    JellyfinContentResponse,
+    JellyfinItemListResponse,
+)
+
+HOST = "http://jellyfin:8096"
+API_KEY = "bench"
+
+
+def make_item(i: int, media_sources: bool) -> dict[str, Any]:
+    """Jellyfin BaseItemDto 형태의 샘플 아이템"""
+    item: dict[str, Any] = {
+        "Id": f"{i:032x}",
+        "Name": f"WSOP 2024 Main Event Day {i % 8 + 1} Part {i}",
+        "ServerId": "f" * 32,
+        "Type": "Video",
+        "Overview": "Final table coverage with hole cards. " * 4,
+        "Path": f"/media/wsop/2024/main_event/day{i % 8 + 1}/part{i:03d}.mp4",
+        "SeriesName": "WSOP 2024",
+        "ProductionYear": 2024,
+        "DateCreated": "2024-07-01T12:00:00.1234567Z",
+        "RunTimeTicks": 36_000_000_000 + i,
+        "ImageTags": {"Primary": f"{i:016x}"},
+        "IsFolder": False,
+        "MediaType": "Video",
+    }
+    if media_sources:
+        item["MediaSources"] = [{
+            "Id": item["Id"],
+            "Name": item["Name"],
+            "Path": item["Path"],
+            "Container": "mp4",
+            "Size": 4_500_000_000,
+            "Bitrate": 10_000_000,
+            "SupportsDirectPlay": True,
+            "SupportsDirectStream": True,
+            "SupportsTranscoding": True,
+            "MediaStreams": [
+                {"Type": "Video", "Codec": "h264", "Index": 0, "IsDefault": True,
+                 "Width": 1920, "Height": 1080, "BitRate": 9_800_000,
+                 "DisplayTitle": "1080p H264 SDR"},
+                {"Type": "Audio", "Codec": "aac", "Index": 1, "IsDefault": True,
+                 "Language": "eng", "Channels": 2, "SampleRate": 48000,
+                 "BitRate": 192_000, "DisplayTitle": "English - AAC - Stereo"},
+                {"Type": "Subtitle", "Codec": "subrip", "Index": 2,
+                 "Language": "kor", "DisplayTitle": "Korean - SUBRIP"},
+            ],
+        }]
+    return item
+
+
+def make_page(count: int, media_sources: bool) -> bytes:
+    items = [make_item(i, media_sources) for i in range(count)]
+    return json.dumps({"Items": items, "TotalRecordCount": count * 10, "StartIndex": 0}).encode()
+
+
+def decode_legacy(body: bytes) -> JellyfinContentListResponse:
+    data = json.loads(body)
+    response = JellyfinItemListResponse(**data)
+    items = [
+        JellyfinContentResponse.from_jellyfin_item(item, HOST, API_KEY)
+        for item in response.items
+    ]
+    return JellyfinContentListResponse(
+        items=items, total=response.total_record_count, page=1, limit=len(items),
+        has_next=len(items) < response.total_record_count,
+    )
+
+
+def decode_lean(body: bytes) -> JellyfinContentListResponse:
+    data = jsonlib.loads(body)
+    items = [
+        JellyfinContentResponse.from_jellyfin_data(item, HOST, API_KEY)
+        for item in data["Items"]
+    ]
+    return JellyfinContentListResponse.model_construct(
+        items=items, total=data["TotalRecordCount"], page=1, limit=len(items),
+        has_next=len(items) < data["TotalRecordCount"],
+    )
+
+
+def measure(fn: Callable[[bytes], Any], body: bytes, rounds: int) -> list[float]:
+    fn(body)  # warm-up
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(body)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name: str, samples: list[float], body: bytes) -> float:
+    samples.sort()
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"  {name:<8} {len(body) / 1024:8.1f} KiB  p50 {p50:7.3f} ms  p99 {p99:7.3f} ms")
+    return p50
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jellyfin /Items decode benchmark")
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    full_body = make_page(args.items, media_sources=True)
+    lean_body = make_page(args.items, media_sources=False)
+
+    # 두 경로의 결과가 같은지 먼저 확인
+    legacy = decode_legacy(full_body).model_dump(by_alias=True)
+    lean = decode_lean(lean_body).model_dump(by_alias=True)
+    assert legacy == lean, "decode paths disagree"
+
+    print(f"[JellyfinDecode] {args.items} items/page, {args.rounds} rounds, json={jsonlib.JSON_BACKEND}")
+    legacy_p50 = report("legacy", measure(decode_legacy, full_body, args.rounds), full_body)
+    lean_p50 = report("lean", measure(decode_lean, lean_body, args.rounds), lean_body)
+    print(f"[JellyfinDecode] speedup x{legacy_p50 / lean_p50:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Fake Jellyfin
+
+벤치마크/테스트용 Jellyfin 대역 서버 (ASGI)
+
+생성된 카탈로그로 /System/Info, /Library/MediaFolders, /Items,
+/Items/{id}/Images/{type}를 응답하고, 요청마다 지연(latency + jitter)을 준다.
+app.state.requests에 엔드포인트별 요청 수를 기록해 캐시/병합 효과를 확인할 수 있다.
+
+단독 실행: python -m benchmarks.fake_jellyfin [--items 5000] [--latency-ms 50] [--port 8096]
+"""
+
+import argparse
+import asyncio
+import random
+import struct
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+SERVER_ID = "f" * 32
+LIBRARY_NAMES = ["WSOP", "HCL", "GGMillions", "WPT", "EPT", "Triton"]
+
+
+def make_catalog(items: int, libraries: int) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """(라이브러리 목록, 아이템 목록) 생성 (seed 고정)"""
+    rng = random.Random(42)
+    folders = []
+    for index in range(libraries):
+        name = LIBRARY_NAMES[index % len(LIBRARY_NAMES)]
+        if index >= len(LIBRARY_NAMES):
+            name = f"{name} {index}"
+        folders.append({
+            "Id": f"{index + 1:032x}",
+            "Name": name,
+            "CollectionType": "homevideos",
+            "Path": f"/media/{name.lower().replace(' ', '_')}",
+        })
+
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    catalog = []
+    for index in range(items):
+        library = folders[index % libraries]
+        item_id = f"{0x1000 + index:032x}"
+        created = base + timedelta(minutes=index * 7)
+        name = f"{library['Name']} {2020 + index % 5} Event #{index % 90 + 1} Day {index % 8 + 1}"
+        catalog.append({
+            "Id": item_id,
+            "Name": name,
+            "SortName": name.lower(),
+            "ServerId": SERVER_ID,
+            "ParentId": library["Id"],
+            "Type": "Video",
+            "MediaType": "Video",
+            "IsFolder": False,
+            "Overview": f"Final table coverage of {name}.",
+            "Path": f"{library['Path']}/{item_id}.mp4",
+            "SeriesName": library["Name"],
+            "ProductionYear": 2020 + index % 5,
+            "DateCreated": created.strftime("%Y-%m-%dT%H:%M:%S.0000000Z"),
+            "DateLastSaved": created.strftime("%Y-%m-%dT%H:%M:%S.0000000Z"),
+            "RunTimeTicks": rng.randint(20, 360) * 60 * 10_000_000,
+            "ImageTags": {"Primary": f"{index:016x}"},
+            "MediaSources": [{
+                "Id": item_id,
+                "Path": f"{library['Path']}/{item_id}.mp4",
+                "Container": "mp4",
+                "Size": rng.randint(1, 8) * 1_000_000_000,
+                "Bitrate": 8_000_000,
+                "SupportsDirectPlay": True,
+                "SupportsDirectStream": True,
+                "SupportsTranscoding": True,
+                "MediaStreams": [
+                    {"Type": "Video", "Codec": "h264", "Index": 0, "IsDefault": True,
+                     "Width": 1920, "Height": 1080, "BitRate": 7_800_000},
+                    {"Type": "Audio", "Codec": "aac", "Index": 1, "IsDefault": True,
+                     "Language": "eng", "Channels": 2, "SampleRate": 48000},
+                ],
+            }],
+        })
+    return folders, catalog
+
+
+def make_png(width: int, height: int) -> bytes:
+    """단색 PNG (크기에 비례한 실제 이미지 바이트)"""
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    row = b"\x00" + b"\x20\x40\x60" * width
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(row * height, 1))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _project(item: dict[str, Any], fields: set[str]) -> dict[str, Any]:
+    """Fields에 없는 선택 필드 제외 (Jellyfin과 같은 방식)"""
+    optional = {"Path", "Overview", "MediaSources", "SortName", "DateLastSaved", "DateCreated"}
+    return {k: v for k, v in item.items() if k not in optional or k in fields}
+
+
+def create_app(
+    items: int = 1000,
+    libraries: int = 3,
+    latency_ms: float = 20.0,
+    jitter_ms: float = 5.0,
+) -> FastAPI:
+    """
+    Fake Jellyfin 앱 생성
+
+    Args:
+        items: 카탈로그 아이템 수
+        libraries: 라이브러리 수
+        latency_ms: 요청당 기본 지연
+        jitter_ms: 지연 편차 (0 ~ jitter_ms 추가)
+    """
+    app = FastAPI(title="Fake Jellyfin")
+    folders, catalog = make_catalog(items, libraries)
+    by_id = {item["Id"]: item for item in catalog}
+    app.state.requests = Counter()
+    app.state.catalog = catalog
+    app.state.libraries = folders
+
+    @app.middleware("http")
+    async def simulate_latency(request: Request, call_next):
+        path = request.url.path
+        app.state.requests["/Items/{id}/Images" if "/Images/" in path else path] += 1
+        delay = latency_ms + random.uniform(0, jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        return await call_next(request)
+
+    @app.get("/System/Info")
+    async def system_info():
+        return {
+            "ServerName": "fake-jellyfin",
+            "Version": "10.11.0",
+            "OperatingSystem": "Linux",
+            "Id": SERVER_ID,
+            "StartupWizardCompleted": True,
+        }
+
+    @app.get("/System/Info/Public")
+    async def public_info():
+        return {"ServerName": "fake-jellyfin", "Version": "10.11.0", "Id": SERVER_ID}
+
+    @app.get("/Library/MediaFolders")
+    async def media_folders():
+        return {"Items": folders, "TotalRecordCount": len(folders)}
+
+    @app.get("/Items")
+    async def get_items(request: Request):
+        # Jellyfin 쿼리 파라미터는 대소문자 구분 없음
+        query = {k.lower(): v for k, v in request.query_params.items()}
+        fields = set(filter(None, query.get("fields", "").split(",")))
+
+        if "ids" in query:
+            wanted = query["ids"].split(",")
+            result = [by_id[i] for i in wanted if i in by_id]
+        else:
+            result = catalog
+            if "parentid" in query:
+                result = [item for item in result if item["ParentId"] == query["parentid"]]
+            if "searchterm" in query:
+                term = query["searchterm"].lower()
+                result = [item for item in result if term in item["SortName"]]
+            if "mindatelastsaved" in query:
+                since = query["mindatelastsaved"][:19]
+                result = [item for item in result if item["DateLastSaved"][:19] > since]
+
+            sort_key = "SortName" if query.get("sortby", "").startswith("SortName") else "DateCreated"
+            result = sorted(
+                result,
+                key=lambda item: item[sort_key],
+                reverse=query.get("sortorder") == "Descending",
+            )
+
+        total = len(result)
+        start = int(query.get("startindex", 0))
+        limit = int(query["limit"]) if "limit" in query else None
+        page = result[start:start + limit if limit is not None else None]
+
+        return JSONResponse({
+            "Items": [_project(item, fields) for item in page],
+            "TotalRecordCount": total,
+            "StartIndex": start,
+        })
+
+    @app.get("/Items/{item_id}/Images/{image_type}")
+    async def get_image(item_id: str, image_type: str, maxWidth: int = 320, maxHeight: int | None = None):
+        if item_id not in by_id:
+            return Response(status_code=404)
+        width = min(maxWidth, 1920)
+        height = min(maxHeight or width * 9 // 16, 1080)
+        return Response(make_png(width, height), media_type="image/png")
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake Jellyfin server")
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--libraries", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8096)
+    args = parser.parse_args()
+
+    print(f"[FakeJellyfin] {args.items} items, {args.libraries} libraries, "
+          f"latency {args.latency_ms}+{args.jitter_ms}ms on :{args.port}")
+    uvicorn.run(
+        create_app(args.items, args.libraries, args.latency_ms, args.jitter_ms),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
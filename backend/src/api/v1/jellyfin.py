@@ -4,11 +4,25 @@ Jellyfin API Router
 Jellyfin 통합 API 엔드포인트
 """
 
-from fastapi import APIRouter, HTTPException, Query, status
-from fastapi.responses import RedirectResponse
-
-from ...core.deps import ActiveUser
-from ...services.jellyfin import JellyfinError, JellyfinService
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
+from meilisearch.errors import MeilisearchError
+from starlette.background import BackgroundTask
+
+from ...core.config import settings
+from ...core.deps import ActiveUser, AdminUser, DbSession
+from ...services.jellyfin import (
+    JellyfinError,
+    JellyfinService,
+    jellyfin_service,
+    normalize_id,
+)
+from ...services.jellyfin_hls import jellyfin_hls_service
+from ...services.jellyfin_mirror import JellyfinMirrorService
+from ...services.jellyfin_search import jellyfin_search_indexer
+from ...services.thumbnail_cache import read_media_type, thumbnail_cache_service
 from ...schemas.jellyfin import (
     JellyfinContentListResponse,
     JellyfinContentResponse,
@@ -19,16 +33,9 @@ from ...schemas.common import ApiResponse
 
 router = APIRouter()
 
-# Lazy-initialized service instance
-_jellyfin_service: JellyfinService | None = None
-
-
 def get_jellyfin_service() -> JellyfinService:
-    """Get or create JellyfinService instance"""
-    global _jellyfin_service
-    if _jellyfin_service is None:
-        _jellyfin_service = JellyfinService()
-    return _jellyfin_service
+    """Shared JellyfinService (캐시, 커넥션 풀, 서킷 브레이커 공유)"""
+    return jellyfin_service
 
 
 # =============================================================================
@@ -60,6 +67,22 @@ async def get_server_info(
         )
 
 
+@router.delete("/cache")
+async def invalidate_cache(
+    _: AdminUser,
+) -> dict:
+    """
+    Jellyfin 응답 캐시 삭제
+
+    - 🔒 관리자 전용
+    - 라이브러리 변경을 즉시 반영할 때 사용
+    """
+    service = get_jellyfin_service()
+    stats = service.cache.stats()
+    await service.cache.invalidate()
+    return {"invalidated": stats["entries"]}
+
+
 # =============================================================================
 # Libraries
 # =============================================================================
@@ -97,6 +120,7 @@ async def list_libraries(
 @router.get("/contents")
 async def list_contents(
     _: ActiveUser,
+    db: DbSession,
     library: str | None = Query(None, description="Library name (e.g., WSOP, HCL)"),
     q: str | None = Query(None, description="Search query"),
     page: int = Query(1, ge=1),
@@ -109,8 +133,19 @@ async def list_contents(
     - 라이브러리 필터링
     - 검색 지원
     - 페이지네이션 지원
+    - 미러 활성화 시 로컬 jellyfin_items에서 조회
     """
     service = get_jellyfin_service()
+    if settings.JELLYFIN_MIRROR_ENABLED:
+        contents = await JellyfinMirrorService(service).get_contents(
+            db,
+            library_name=library,
+            page=page,
+            limit=limit,
+            search_term=q,
+        )
+        return ApiResponse(data=contents)
+
     try:
         contents = await service.get_contents(
             library_name=library,
@@ -129,10 +164,58 @@ async def list_contents(
         )
 
 
+@router.get("/contents/batch")
+async def get_contents_batch(
+    _: ActiveUser,
+    db: DbSession,
+    ids: str = Query(..., min_length=1, description="Comma-separated item IDs"),
+) -> ApiResponse[list[JellyfinContentResponse]]:
+    """
+    Jellyfin 콘텐츠 일괄 조회 (시청 기록, 이어보기 등)
+
+    - 🔒 인증 필요
+    - 최대 JELLYFIN_BATCH_MAX_IDS개, 요청 순서 유지 (없는 아이템 제외)
+    - 캐시에 없는 아이템은 Jellyfin /Items?Ids= 한 번으로 조회
+    """
+    # 결과는 정규화된 jellyfin_id 기준이므로 요청 ID도 같은 형식으로 맞춤
+    item_ids = list(dict.fromkeys(
+        normalize_id(i.strip()) for i in ids.split(",") if i.strip()
+    ))
+    if len(item_ids) > settings.JELLYFIN_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "TOO_MANY_IDS",
+                "message": f"최대 {settings.JELLYFIN_BATCH_MAX_IDS}개까지 조회할 수 있습니다",
+            },
+        )
+
+    service = get_jellyfin_service()
+    found: dict[str, JellyfinContentResponse] = {}
+    if settings.JELLYFIN_MIRROR_ENABLED:
+        found = await JellyfinMirrorService(service).get_contents_by_ids(db, item_ids)
+
+    missing = [item_id for item_id in item_ids if item_id not in found]
+    try:
+        for content in await service.get_contents_by_ids(missing):
+            found[content.jellyfin_id] = content
+    except JellyfinError as e:
+        raise HTTPException(
+            status_code=e.status_code or status.HTTP_502_BAD_GATEWAY,
+            detail={
+                "code": "JELLYFIN_ERROR",
+                "message": e.message,
+            },
+        )
+
+    return ApiResponse(data=[found[item_id] for item_id in item_ids if item_id in found])
+
+
 @router.get("/contents/{item_id}")
 async def get_content(
     item_id: str,
     _: ActiveUser,
+    db: DbSession,
 ) -> ApiResponse[JellyfinContentResponse]:
     """
     Jellyfin 콘텐츠 상세 (WSOPTV 형식)
@@ -140,8 +223,14 @@ async def get_content(
     - 🔒 인증 필요
     - 스트림 URL 포함
     - 썸네일 URL 포함
+    - 미러에 없는 아이템(동기화 전)은 Jellyfin에서 조회
     """
     service = get_jellyfin_service()
+    if settings.JELLYFIN_MIRROR_ENABLED:
+        content = await JellyfinMirrorService(service).get_content(db, item_id)
+        if content:
+            return ApiResponse(data=content)
+
     try:
         content = await service.get_content(item_id)
         return ApiResponse(data=content)
@@ -170,13 +259,16 @@ async def get_stream_url(
     Jellyfin 스트림 URL 조회
 
     - 🔒 인증 필요
-    - HLS 스트림 URL 반환
+    - HLS 스트림 URL 반환 (프록시 모드면 api_key 없는 백엔드 경로)
     - redirect=true 시 스트림으로 리다이렉트
     """
-    service = get_jellyfin_service()
-
-    stream_url = service.get_stream_url(item_id)
-    direct_url = service.get_direct_stream_url(item_id)
+    if settings.JELLYFIN_HLS_PROXY_ENABLED:
+        stream_url = jellyfin_hls_service.get_playlist_url(item_id)
+        direct_url = jellyfin_hls_service.get_direct_url(item_id)
+    else:
+        service = get_jellyfin_service()
+        stream_url = service.get_stream_url(item_id)
+        direct_url = service.get_direct_stream_url(item_id)
 
     if redirect:
         return RedirectResponse(url=stream_url)
@@ -185,29 +277,134 @@ async def get_stream_url(
         "item_id": item_id,
         "hls_url": stream_url,
         "direct_url": direct_url,
-        "thumbnail_url": service.get_thumbnail_url(item_id),
+        "thumbnail_url": f"{settings.API_V1_PREFIX}/jellyfin/thumbnail/{item_id}",
     }
 
 
-@router.get("/thumbnail/{item_id}")
+@router.get("/stream/{item_id}/{path:path}", response_model=None)
+async def proxy_stream(
+    item_id: str,
+    path: str,
+    request: Request,
+    user: ActiveUser,
+) -> Response:
+    """
+    Jellyfin HLS 리버스 프록시
+
+    - 🔒 인증 필요
+    - *.m3u8: URI를 프록시 경로로 재작성 (api_key 제거, 시청자별 재생 세션)
+    - 세그먼트: 디스크 캐시에서 응답 (같은 아이템 시청자끼리 세그먼트 인덱스별 공유)
+    - stream: Direct Stream (Range 전달)
+    """
+    if not settings.JELLYFIN_HLS_PROXY_ENABLED or ".." in path.split("/"):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "NOT_FOUND", "message": "스트림을 찾을 수 없습니다"},
+        )
+
+    params = list(request.query_params.multi_items())
+    service = jellyfin_hls_service
+    segment_media_type = service.get_segment_media_type(path)
+
+    try:
+        if service.is_playlist(path):
+            playlist = await service.get_playlist(item_id, path, params, str(user.id))
+            if playlist is not None:
+                return Response(
+                    content=playlist,
+                    media_type="application/vnd.apple.mpegurl",
+                    headers={"Cache-Control": "no-cache"},
+                )
+
+        elif segment_media_type:
+            segment_path = await service.get_segment(item_id, path, params)
+            if segment_path is not None:
+                return FileResponse(
+                    segment_path,
+                    media_type=segment_media_type,
+                    headers={"Cache-Control": "public, max-age=31536000, immutable"},
+                )
+
+        elif service.is_direct(path):
+            upstream, headers = await service.open_direct(
+                item_id, path, params, request.headers.get("range")
+            )
+            return StreamingResponse(
+                upstream.aiter_raw(),
+                status_code=upstream.status_code,
+                headers=headers,
+                background=BackgroundTask(upstream.aclose),
+            )
+
+    except JellyfinError as e:
+        raise HTTPException(
+            status_code=(
+                status.HTTP_404_NOT_FOUND if e.status_code == 404
+                else status.HTTP_502_BAD_GATEWAY
+            ),
+            detail={
+                "code": "JELLYFIN_ERROR",
+                "message": e.message,
+            },
+        )
+
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail={"code": "NOT_FOUND", "message": "스트림을 찾을 수 없습니다"},
+    )
+
+
+@router.get("/thumbnail/{item_id}", response_model=None)
 async def get_thumbnail(
     item_id: str,
+    request: Request,
     width: int | None = Query(None, ge=1, le=1920),
     height: int | None = Query(None, ge=1, le=1080),
-) -> RedirectResponse:
+    image_type: str = Query("Primary", alias="type", pattern="^(Primary|Backdrop|Thumb)$"),
+    tag: str | None = Query(
+        None, pattern="^[0-9A-Fa-f]{1,64}$", description="Image tag (cache busting)"
+    ),
+) -> Response:
     """
-    Jellyfin 썸네일 이미지 (리다이렉트)
+    Jellyfin 썸네일 이미지 (프록시 + 디스크 캐시)
 
-    - 인증 불필요 (Jellyfin이 처리)
-    - 크기 조절 가능
+    - 인증 불필요
+    - 크기는 허용 목록으로 올림, 크기별로 한 번만 Jellyfin에서 받아 로컬 캐시에서 응답
+    - ETag / If-None-Match 지원, tag 지정 시 immutable 캐시
     """
-    service = get_jellyfin_service()
-    thumbnail_url = service.get_thumbnail_url(
-        item_id,
-        max_width=width,
-        max_height=height,
-    )
-    return RedirectResponse(url=thumbnail_url)
+    try:
+        image = await thumbnail_cache_service.load(item_id, image_type, width, height, tag)
+    except JellyfinError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail={
+                "code": "JELLYFIN_ERROR",
+                "message": e.message,
+            },
+        )
+
+    if image is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "THUMBNAIL_NOT_FOUND",
+                "message": "썸네일을 찾을 수 없습니다",
+            },
+        )
+
+    path, etag = image
+    headers = {
+        "ETag": etag,
+        "Cache-Control": (
+            "public, max-age=31536000, immutable" if tag else "public, max-age=86400"
+        ),
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # 본문 응답에만 시그니처 확인, 전송은 FileResponse (sendfile)
+    media_type = await asyncio.to_thread(read_media_type, path)
+    return FileResponse(path, media_type=media_type, headers=headers)
 
 
 # =============================================================================
@@ -219,6 +416,8 @@ async def get_thumbnail(
 async def search_contents(
     _: ActiveUser,
     q: str = Query(..., min_length=1, description="Search query"),
+    library: str | None = Query(None, description="Library name"),
+    page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
 ) -> ApiResponse[JellyfinContentListResponse]:
     """
@@ -226,36 +425,24 @@ async def search_contents(
 
     - 🔒 인증 필요
     - 제목, 개요에서 검색
+    - 검색 인덱스 활성화 시 MeiliSearch에서 조회 (library 필터, 페이징)
+    - 인덱스 비활성/장애 시 Jellyfin 검색으로 대체 (같은 library/page 적용)
     """
+    if settings.JELLYFIN_SEARCH_INDEX_ENABLED:
+        try:
+            result = await jellyfin_search_indexer.search(
+                query=q, library=library, page=page, limit=limit
+            )
+            return ApiResponse(data=result)
+        except MeilisearchError:
+            pass
+
     service = get_jellyfin_service()
     try:
-        result = await service.search_items(
-            query=q,
-            include_item_types=["Movie", "Episode", "Video"],
-            limit=limit,
-        )
-
-        # Convert to WSOPTV format
-        from ...schemas.jellyfin import JellyfinContentResponse
-
-        items = [
-            JellyfinContentResponse.from_jellyfin_item(
-                item=item,
-                jellyfin_host=service.host,
-                api_key=service.api_key,
-            )
-            for item in result.items
-        ]
-
-        return ApiResponse(
-            data=JellyfinContentListResponse(
-                items=items,
-                total=result.total_record_count,
-                page=1,
-                limit=limit,
-                has_next=len(items) < result.total_record_count,
-            )
+        result = await service.search_contents(
+            query=q, library_name=library, page=page, limit=limit
         )
+        return ApiResponse(data=result)
     except JellyfinError as e:
         raise HTTPException(
             status_code=e.status_code or status.HTTP_502_BAD_GATEWAY,
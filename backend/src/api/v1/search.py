@@ -31,6 +31,8 @@ async def search(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     sort: str = Query("relevance", regex="^(relevance|date|views)$"),
+    source: str | None = Query(None, regex="^(native|jellyfin|all)$"),
+    library: str | None = Query(None, description="Jellyfin library name"),
 ) -> ApiResponse[SearchResponse]:
     """
     통합 검색
@@ -38,12 +40,16 @@ async def search(
     - 🔒 인증 필요
     - MeiliSearch 기반 전문 검색
     - 패싯 필터링 지원
+    - source: native / jellyfin / all (Jellyfin 아이템은 JELLYFIN_SEARCH_INDEX_ENABLED 시 색인,
+      색인이 켜져 있으면 기본 native)
     """
     filters = {
         "catalog_id": catalog_id,
         "player_id": player_id,
         "hand_grade": hand_grade,
         "year": year,
+        "source": source,
+        "library": library,
     }
     # Remove None values
     filters = {k: v for k, v in filters.items() if v is not None}
@@ -69,6 +75,9 @@ async def search(
             catalog_id=hit.get("catalog_id", ""),
             series_title=hit.get("series_title", ""),
             hands_count=hit.get("hands_count", 0),
+            source=hit.get("source") or "native",
+            jellyfin_id=hit.get("jellyfin_id"),
+            library=hit.get("library"),
         )
         for hit in result.get("results", [])
     ]
@@ -4,30 +4,231 @@ Stream API Router
 HLS 스트리밍 관련 API 엔드포인트
 """
 
-from fastapi import APIRouter, HTTPException, Query, status
-from fastapi.responses import Response, StreamingResponse
+import httpx
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from ...core.config import settings
-from ...core.deps import ActiveUser, DbSession
+from ...core.deps import ActiveUser, AdminUser, DbSession
 from ...models.content import Content
+from ...models.hand import Hand, HandPlayer
+from ...services.admission import LOAD_SHEDDING, admission_controller
+from ...services.clip import SOURCE_RENDITION, clip_service
+from ...services.cluster import ROUTED_HEADER, cluster_service
+from ...services.multiview import multiview_service
+from ...services.source_cache import source_cache_service
 from ...services.streaming import streaming_service
 
 router = APIRouter()
 
 
+@router.get("/stats")
+async def get_stream_stats(
+    _: AdminUser,
+) -> dict:
+    """
+    트랜스코딩 부하 및 원본 캐시 지표
+
+    - 🔒 관리자 전용
+    """
+    return {
+        "admission": admission_controller.stats(),
+        "source_cache": source_cache_service.stats(),
+    }
+
+
+async def _load_multiview_contents(
+    db: DbSession, ids: str, audio: int
+) -> list[Content]:
+    """멀티뷰 타일 콘텐츠 조회 (요청 순서 유지)"""
+    content_ids = [int(i) for i in ids.split(",")]
+    if len(set(content_ids)) != len(content_ids) or audio >= len(content_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "INVALID_MULTIVIEW",
+                "message": f"콘텐츠는 중복 없이 최대 {settings.MULTIVIEW_MAX_TILES}개, "
+                           "audio는 타일 인덱스여야 합니다",
+            },
+        )
+
+    result = await db.execute(
+        select(Content)
+        .where(Content.id.in_(content_ids))
+        .options(selectinload(Content.file))
+    )
+    contents = {c.id: c for c in result.scalars().all()}
+
+    missing = [i for i in content_ids if i not in contents or not contents[i].file]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "CONTENT_NOT_FOUND",
+                "message": f"콘텐츠를 찾을 수 없습니다: {missing}",
+            },
+        )
+
+    return [contents[i] for i in content_ids]
+
+
+MULTIVIEW_IDS_PATTERN = rf"^\d+(,\d+){{0,{settings.MULTIVIEW_MAX_TILES - 1}}}$"
+
+
+@router.get("/multiview/playlist.m3u8")
+async def get_multiview_manifest(
+    request: Request,
+    db: DbSession,
+    _: ActiveUser,
+    ids: str = Query(..., pattern=MULTIVIEW_IDS_PATTERN, description="Content IDs (comma separated)"),
+    audio: int = Query(0, ge=0, description="Tile index for audio"),
+) -> Response:
+    """
+    멀티뷰 모자이크 HLS 매니페스트
+
+    - 🔒 인증 필요
+    - 최대 4개 콘텐츠를 하나의 스트림으로 합성 (길이는 가장 짧은 콘텐츠 기준)
+    """
+    contents = await _load_multiview_contents(db, ids, audio)
+
+    manifest = multiview_service.generate_manifest(
+        duration_sec=min(c.duration_sec for c in contents),
+        query=request.url.query,
+    )
+
+    return Response(
+        content=manifest,
+        media_type="application/vnd.apple.mpegurl",
+        headers={
+            "Cache-Control": "max-age=3600",
+            "Access-Control-Allow-Origin": "*",
+        },
+    )
+
+
+@router.get("/multiview/segment_{segment_index:int}.ts")
+async def get_multiview_segment(
+    segment_index: int,
+    db: DbSession,
+    _: ActiveUser,
+    ids: str = Query(..., pattern=MULTIVIEW_IDS_PATTERN, description="Content IDs (comma separated)"),
+    audio: int = Query(0, ge=0, description="Tile index for audio"),
+) -> StreamingResponse:
+    """
+    멀티뷰 모자이크 세그먼트
+
+    - 🔒 인증 필요
+    - 타일/오디오 조합별로 세그먼트 캐싱
+    """
+    contents = await _load_multiview_contents(db, ids, audio)
+
+    num_segments = multiview_service.segment_count(min(c.duration_sec for c in contents))
+    if segment_index < 0 or segment_index >= num_segments:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "SEGMENT_NOT_FOUND",
+                "message": "세그먼트를 찾을 수 없습니다",
+            },
+        )
+
+    tiles = [
+        (c.file.canonical_id, settings.convert_nas_path(c.file.nas_path))
+        for c in contents
+    ]
+
+    return StreamingResponse(
+        multiview_service.get_segment(tiles, segment_index, audio),
+        media_type="video/mp2t",
+        headers={
+            "Cache-Control": "max-age=86400",
+            "Access-Control-Allow-Origin": "*",
+        },
+    )
+
+
+@router.get("/hands/{hand_id}/clip.mp4")
+async def get_hand_clip(
+    hand_id: int,
+    db: DbSession,
+    _: ActiveUser,
+    quality: str = Query(SOURCE_RENDITION, pattern="^(source|360p|480p|720p|1080p)$"),
+) -> FileResponse:
+    """
+    핸드 MP4 클립 다운로드
+
+    - 🔒 인증 필요
+    - source: 키프레임 사이 스트림 복사 + 양 끝 GOP만 재인코딩
+    - 핸드 + 렌디션별 캐싱, faststart MP4
+    """
+    result = await db.execute(
+        select(Hand)
+        .where(Hand.id == hand_id)
+        .options(selectinload(Hand.file), selectinload(Hand.content).selectinload(Content.file))
+    )
+    hand = result.scalar_one_or_none()
+
+    if not hand:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "HAND_NOT_FOUND",
+                "message": "핸드를 찾을 수 없습니다",
+            },
+        )
+
+    file = hand.file or hand.content.file
+    if not file or hand.end_sec <= hand.start_sec:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "FILE_NOT_FOUND",
+                "message": "미디어 파일을 찾을 수 없습니다",
+            },
+        )
+
+    clip_path = await clip_service.get_clip(
+        hand_id=hand.id,
+        file_id=file.canonical_id,
+        nas_path=settings.convert_nas_path(file.nas_path),
+        start_sec=hand.start_sec,
+        end_sec=hand.end_sec,
+        rendition=quality,
+    )
+
+    if clip_path is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "code": "CLIP_FAILED",
+                "message": "클립을 생성하지 못했습니다",
+            },
+        )
+
+    return FileResponse(
+        clip_path,
+        media_type="video/mp4",
+        filename=f"hand_{hand.hand_number or hand.id}.mp4",
+        headers={"Cache-Control": "max-age=86400"},
+    )
+
+
 @router.get("/{content_id}/manifest.m3u8")
 async def get_master_manifest(
     content_id: int,
     db: DbSession,
-    _: ActiveUser,
+    user: ActiveUser,
+    hands: bool = Query(False, description="Embed hand markers (EXT-X-DATERANGE)"),
 ) -> Response:
     """
     HLS 마스터 매니페스트
 
     - 🔒 인증 필요
     - 품질 옵션 제공
+    - hands=true 시 품질별 플레이리스트에 핸드 마커 포함
     """
     # Get content
     result = await db.execute(
@@ -46,16 +247,28 @@ async def get_master_manifest(
             },
         )
 
+    # 재생 시작 기록 (여러 시청자가 재생하는 원본은 로컬 SSD로 스테이징)
+    with_audio = True
+    if content.file:
+        container_path = settings.convert_nas_path(content.file.nas_path)
+        await source_cache_service.record_playback(container_path, str(user.id))
+        with_audio = await streaming_service.has_audio(container_path)
+
     manifest = await streaming_service.generate_master_manifest(
         content_id=content_id,
         duration_sec=content.duration_sec,
+        with_hands=hands,
+        with_audio=with_audio,
     )
 
+    # 과부하로 렌디션이 축소된 매니페스트는 부하 해소 후 바로 갱신되도록 짧게 캐시
+    shedding = admission_controller.level >= LOAD_SHEDDING
+
     return Response(
         content=manifest,
         media_type="application/vnd.apple.mpegurl",
         headers={
-            "Cache-Control": "max-age=3600",
+            "Cache-Control": "max-age=30" if shedding else "max-age=3600",
             "Access-Control-Allow-Origin": "*",
         },
     )
@@ -67,14 +280,18 @@ async def get_quality_manifest(
     quality: str,
     db: DbSession,
     _: ActiveUser,
+    hands: bool = Query(False, description="Embed hand markers (EXT-X-DATERANGE)"),
+    msn: int | None = Query(None, alias="_HLS_msn", ge=0, description="Blocking reload"),
 ) -> Response:
     """
     품질별 HLS 매니페스트
 
     - 🔒 인증 필요
+    - hands=true 시 핸드를 EXT-X-DATERANGE로 포함 (등급, 플레이어, 팟)
+    - 녹화 중인 파일은 EVENT 플레이리스트 (_HLS_msn 블로킹 리로드 지원)
     """
     # Validate quality
-    valid_qualities = ["360p", "480p", "720p", "1080p"]
+    valid_qualities = ["360p", "480p", "720p", "1080p", "audio"]
     if quality not in valid_qualities:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -85,9 +302,12 @@ async def get_quality_manifest(
         )
 
     # Get content
-    result = await db.execute(
-        select(Content).where(Content.id == content_id)
-    )
+    query = select(Content).where(Content.id == content_id).options(selectinload(Content.file))
+    if hands:
+        query = query.options(
+            selectinload(Content.hands).selectinload(Hand.players).selectinload(HandPlayer.player)
+        )
+    result = await db.execute(query)
     content = result.scalar_one_or_none()
 
     if not content:
@@ -99,17 +319,45 @@ async def get_quality_manifest(
             },
         )
 
-    manifest = await streaming_service.generate_quality_manifest(
-        content_id=content_id,
-        duration_sec=content.duration_sec,
-        quality=quality,
-    )
+    live = None
+    if content.file:
+        container_path = settings.convert_nas_path(content.file.nas_path)
+        if msn is not None:
+            live = await streaming_service.wait_for_segment(
+                container_path, msn, content.file.bitrate_kbps
+            )
+        else:
+            live = await streaming_service.get_live_status(
+                container_path, content.file.bitrate_kbps
+            )
+
+    if live is not None:
+        media_sec, growing = live
+        manifest = await streaming_service.generate_event_manifest(
+            content_id=content_id,
+            media_sec=media_sec,
+            quality=quality,
+            growing=growing,
+            hands=content.hands if hands else None,
+            program_start=content.created_at,
+        )
+        # 녹화 중에는 세그먼트 주기마다 갱신되므로 짧게 캐시
+        cache_control = f"max-age={settings.HLS_SEGMENT_DURATION // 2}" if growing else "max-age=60"
+    else:
+        manifest = await streaming_service.generate_quality_manifest(
+            content_id=content_id,
+            duration_sec=content.duration_sec,
+            quality=quality,
+            hands=content.hands if hands else None,
+            program_start=content.created_at,
+        )
+        cache_control = "max-age=3600"
 
     return Response(
         content=manifest,
         media_type="application/vnd.apple.mpegurl",
         headers={
-            "Cache-Control": "max-age=3600",
+            "Cache-Control": cache_control,
             "Access-Control-Allow-Origin": "*",
         },
     )
@@ -119,9 +367,10 @@ async def get_quality_manifest(
 async def get_segment(
     content_id: int,
     segment_index: int,
+    request: Request,
     db: DbSession,
     _: ActiveUser,
-    quality: str = Query("720p", regex="^(360p|480p|720p|1080p)$"),
+    quality: str = Query("720p", regex="^(360p|480p|720p|1080p|audio)$"),
 ) -> StreamingResponse:
     """
     HLS 세그먼트 스트리밍
@@ -129,6 +378,7 @@ async def get_segment(
     - 🔒 인증 필요
     - On-demand 트랜스먹싱
     - 캐싱 지원
+    - 클러스터 모드에서는 파일 담당 노드로 프록시
     """
     # Get content with file info
     result = await db.execute(
@@ -156,8 +406,14 @@ async def get_segment(
             },
         )
 
-    # Validate segment index
+    # Convert DB path to container path
+    container_path = settings.convert_nas_path(content.file.nas_path)
+
+    # Validate segment index (녹화 중이면 현재 인코딩 가능한 구간까지만)
     max_segments = (content.duration_sec + 5) // 6  # Approximate
+    live = await streaming_service.get_live_status(container_path, content.file.bitrate_kbps)
+    if live is not None:
+        max_segments = streaming_service.count_ready_segments(*live) - 1
     if segment_index < 0 or segment_index > max_segments:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -167,12 +423,42 @@ async def get_segment(
             },
         )
 
-    # Convert DB path to container path
-    container_path = settings.convert_nas_path(content.file.nas_path)
+    # 다른 노드가 담당하는 파일이면 해당 노드의 캐시를 사용
+    owner_url = None
+    if not cluster_service.is_routed(request.headers.get(ROUTED_HEADER), request.url.path):
+        owner_url = cluster_service.owner_url(content.file.canonical_id)
+
+    if owner_url:
+        try:
+            upstream = await cluster_service.forward(
+                owner_url,
+                request.url.path,
+                request.url.query,
+                dict(request.cookies),
+            )
+        except httpx.RequestError:
+            upstream = None  # owner 장애 시 로컬에서 처리
+
+        if upstream is not None and not upstream.is_success:
+            # owner 오류 응답(JSON)은 세그먼트로 전달하지 않고 로컬에서 처리
+            await upstream.aclose()
+            upstream = None
+
+        if upstream is not None:
+            return StreamingResponse(
+                upstream.aiter_raw(),
+                status_code=upstream.status_code,
+                media_type="video/mp2t",
+                headers={
+                    "Cache-Control": upstream.headers.get("Cache-Control", "max-age=86400"),
+                    "Access-Control-Allow-Origin": "*",
+                },
+                background=BackgroundTask(upstream.aclose),
+            )
 
     return StreamingResponse(
         streaming_service.get_segment(
-            content_id=content_id,
+            file_id=content.file.canonical_id,
             segment_index=segment_index,
             nas_path=container_path,
             quality=quality,
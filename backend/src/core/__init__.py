@@ -1,6 +1,7 @@
 # Core module
 from .config import settings
 from .database import get_db, engine, Base
+from .redis import get_redis, close_redis
 from .security import (
     verify_password,
     get_password_hash,
@@ -14,6 +15,8 @@ __all__ = [
     "get_db",
     "engine",
     "Base",
+    "get_redis",
+    "close_redis",
     "verify_password",
     "get_password_hash",
     "create_access_token",
@@ -70,6 +70,87 @@ class Settings(BaseSettings):
     NAS_UNC_PREFIX: str = "\\\\10.10.100.122\\docker\\GGPNAs"  # DB에 저장된 UNC 경로 prefix
     HLS_SEGMENT_DURATION: int = 6
     HLS_CACHE_PATH: str = "/tmp/hls-cache"
+    HLS_SEGMENT_PRESET: str = "fast"
+
+    # Fast-start: 탐색 직후 세그먼트를 빠른 프리셋으로 먼저 인코딩 후 백그라운드 교체
+    HLS_FAST_START_ENABLED: bool = True
+    HLS_FAST_START_SEGMENTS: int = 3
+    HLS_FAST_START_PRESET: str = "ultrafast"
+    HLS_FAST_START_UPGRADE_CONCURRENCY: int = 2
+
+    # Live(EVENT) 플레이리스트: 최근 mtime이 갱신된 파일은 녹화 중으로 보고 인코딩 가능한 구간만 노출
+    HLS_LIVE_GROWTH_WINDOW_SEC: int = 30
+    HLS_LIVE_SAFETY_SEGMENTS: int = 1
+    HLS_LIVE_POLL_INTERVAL_SEC: float = 1.0
+    HLS_LIVE_PROBE_INTERVAL_SEC: float = 6.0  # 녹화 중 파일 길이 재프로브 간격 (세그먼트 길이)
+    HLS_LIVE_PROBE_TIMEOUT_SEC: int = 10
+    HLS_LIVE_MAX_SOURCES: int = 256
+    HLS_AUDIO_PROBE_CACHE_SIZE: int = 4096  # 파일별 오디오 트랙 유무 캐시
+    HLS_BLOCKING_RELOAD_TIMEOUT_SEC: int = 18
+
+    # Multiview: 최대 4개 콘텐츠를 xstack 모자이크 단일 스트림으로 합성
+    MULTIVIEW_MAX_TILES: int = 4
+    MULTIVIEW_TILE_SIZE: str = "960x540"
+    MULTIVIEW_VIDEO_SETTINGS: str = "-b:v 5000k -maxrate 5350k -bufsize 7500k"
+
+    # Admission control: 트랜스코딩 대기 시간이 목표를 넘으면 품질을 낮춰 응답
+    TRANSCODE_MAX_CONCURRENCY: int = 4
+    ADMISSION_TARGET_WAIT_MS: int = 2000
+    ADMISSION_RECOVERY_RATIO: float = 0.5
+    ADMISSION_DEGRADED_PRESET: str = "ultrafast"
+    ADMISSION_SHED_MAX_QUALITY: str = "720p"
+
+    # Mezzanine proxy: 저화질 렌디션용 로컬 저해상도 중간 파일
+    MEZZANINE_ENABLED: bool = False
+    MEZZANINE_PATH: str = "/tmp/hls-cache/mezzanine"
+    MEZZANINE_HEIGHT: int = 480
+    MEZZANINE_KEYFRAME_INTERVAL: int = 1
+    MEZZANINE_QUALITIES: List[str] = ["360p", "480p"]
+    MEZZANINE_CONCURRENCY: int = 1
+
+    # Source cache: 자주 트랜스코딩되는 NAS 원본의 로컬 SSD 사본
+    SOURCE_CACHE_ENABLED: bool = False
+    SOURCE_CACHE_PATH: str = "/tmp/source-cache"
+    SOURCE_CACHE_MAX_BYTES: int = 200 * 1024**3
+    SOURCE_CACHE_HOT_THRESHOLD: int = 3  # 시간 창 안의 서로 다른 시청자 수
+    SOURCE_CACHE_HOT_WINDOW_SEC: int = 3600
+    SOURCE_CACHE_MAX_TRACKED: int = 10000
+    SOURCE_CACHE_CHUNK_SIZE: int = 8 * 1024**2
+    SOURCE_CACHE_CONCURRENCY: int = 1
+    SOURCE_CACHE_FRESH_TTL_SEC: float = 30.0  # 원본 변경 확인(NAS stat) 간격
+
+    # Transcode queue: local(API 프로세스 내 실행) 또는 redis(전용 워커)
+    TRANSCODE_QUEUE_BACKEND: str = "local"
+    TRANSCODE_QUEUE_KEY: str = "transcode:jobs"
+    TRANSCODE_JOB_TIMEOUT_SEC: int = 120
+    TRANSCODE_WORKER_CONCURRENCY: int = 2
+    # 전체 파일 인코딩(proxy) 전용 큐/슬롯
+    TRANSCODE_BACKGROUND_JOB_TIMEOUT_SEC: int = 6 * 3600
+    TRANSCODE_BACKGROUND_WORKER_CONCURRENCY: int = 1
+
+    # Cluster: File.id consistent-hash 라우팅 (CLUSTER_NODES 미설정 시 Redis heartbeat)
+    CLUSTER_ENABLED: bool = False
+    CLUSTER_NODE_ID: str = "backend-1"
+    CLUSTER_NODE_URL: str = "http://localhost:8001"
+    CLUSTER_NODES: List[str] = []  # e.g. ["backend-1=http://10.0.0.1:8001"]
+    CLUSTER_REDIS_KEY: str = "cluster:nodes"
+    CLUSTER_NODE_TTL_SEC: int = 15
+    CLUSTER_REFRESH_SEC: int = 5
+    CLUSTER_SECRET: str = ""  # 노드 간 전달 요청 서명 키 (비어 있으면 JWT_SECRET_KEY)
+
+    # Dedup: 파일 크기 + 샘플 블록 fingerprint로 NAS 중복 미디어 탐지
+    DEDUP_SAMPLE_COUNT: int = 16
+    DEDUP_SAMPLE_SIZE: int = 64 * 1024
+    DEDUP_CONCURRENCY: int = 4
+
+    # NAS scanner / ffprobe
+    NAS_SCAN_STATE_PATH: str = "/tmp/nas-scan-state.json"
+    NAS_SCAN_CONCURRENCY: int = 16
+    NAS_SCAN_SETTLE_SEC: int = 300  # 이 시간 안에 수정된 파일은 다음 스캔에서 다시 확인
+    PROBE_CONCURRENCY: int = 4
+    PROBE_TIMEOUT_SEC: int = 30
+    ENRICH_BATCH_SIZE: int = 500
+    ENRICH_DURATION_TOLERANCE_SEC: int = 2
 
     def convert_nas_path(self, db_path: str) -> str:
         """
@@ -98,6 +179,18 @@ class Settings(BaseSettings):
         # 변환 불가시 원본 반환 (로컬 경로일 수 있음)
         return db_path
 
+    def to_db_nas_path(self, container_path: str) -> str:
+        """
+        컨테이너 내부 경로를 DB 저장용 NAS 경로로 변환 (convert_nas_path의 역변환)
+
+        예: /mnt/nas/GGPNAs/ARCHIVE/MPP/...
+         -> \\\\10.10.100.122\\docker\\GGPNAs/ARCHIVE/MPP/...
+        """
+        mount_prefix = f"{self.NAS_MOUNT_PATH}/GGPNAs"
+        if container_path.startswith(mount_prefix):
+            return f"{self.NAS_UNC_PREFIX}{container_path[len(mount_prefix):]}"
+        return container_path
+
     # Rate Limiting
     RATE_LIMIT_REQUESTS: int = 100
     RATE_LIMIT_WINDOW_SECONDS: int = 60
@@ -106,6 +199,63 @@ class Settings(BaseSettings):
     JELLYFIN_HOST: str = "http://localhost:8096"
     JELLYFIN_API_KEY: str = ""
 
+    # Jellyfin 클라이언트 (커넥션 풀, 작업별 타임아웃, GET 재시도, 서킷 브레이커)
+    JELLYFIN_MAX_CONNECTIONS: int = 50
+    JELLYFIN_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    JELLYFIN_KEEPALIVE_EXPIRY_SEC: float = 30.0
+    JELLYFIN_CONNECT_TIMEOUT_SEC: float = 3.0
+    JELLYFIN_POOL_TIMEOUT_SEC: float = 2.0
+    JELLYFIN_TIMEOUT_SEC: float = 10.0  # 기본 읽기 타임아웃
+    JELLYFIN_TIMEOUT_INFO_SEC: float = 5.0
+    JELLYFIN_TIMEOUT_PLAYBACK_SEC: float = 15.0
+    JELLYFIN_TIMEOUT_IMAGE_SEC: float = 20.0
+    JELLYFIN_TIMEOUT_SYNC_SEC: float = 60.0
+    JELLYFIN_RETRY_ATTEMPTS: int = 2  # GET 추가 시도 횟수
+    JELLYFIN_RETRY_BACKOFF_SEC: float = 0.2
+    JELLYFIN_BREAKER_FAILURE_THRESHOLD: int = 5
+    JELLYFIN_BREAKER_RESET_SEC: float = 30.0
+
+    # Jellyfin 단건 조회 배치 (창 안에 모인 id를 /Items?Ids=a,b,c 한 번으로 조회)
+    JELLYFIN_BATCH_WINDOW_MS: int = 5
+    JELLYFIN_BATCH_MAX_IDS: int = 100
+
+    # Jellyfin 응답 캐시 (TTL + stale-while-revalidate, 프로세스 + Redis)
+    JELLYFIN_CACHE_ENABLED: bool = True
+    JELLYFIN_CACHE_REDIS_ENABLED: bool = True
+    JELLYFIN_CACHE_REDIS_PREFIX: str = "jellyfin:cache"
+    JELLYFIN_CACHE_MAX_ENTRIES: int = 2000
+    JELLYFIN_CACHE_STALE_SEC: int = 3600
+    JELLYFIN_CACHE_TTL_LIBRARIES: int = 600
+    JELLYFIN_CACHE_TTL_ITEMS: int = 60
+    JELLYFIN_CACHE_TTL_ITEM: int = 300
+    JELLYFIN_CACHE_TTL_PLAYBACK: int = 30
+
+    # Jellyfin 카탈로그 미러 (jellyfin_items 테이블, 목록 API가 미러에서 조회)
+    JELLYFIN_MIRROR_ENABLED: bool = False
+    JELLYFIN_SYNC_PAGE_SIZE: int = 500
+    JELLYFIN_SYNC_INTERVAL_SEC: int = 300
+
+    # Jellyfin 검색 인덱스 (MeiliSearch contents 인덱스에 source="jellyfin"으로 색인)
+    # 미러 동기화 시 변경분 색인, 기존 미러는 --full 동기화 또는 jellyfin_search 재색인 필요
+    JELLYFIN_SEARCH_INDEX_ENABLED: bool = False
+
+    # Jellyfin 썸네일 프록시 디스크 캐시 (동기화 시 목록용 크기 미리 생성)
+    THUMBNAIL_CACHE_PATH: str = "/tmp/thumbnail-cache"
+    THUMBNAIL_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024  # 2 GiB
+    THUMBNAIL_FETCH_CONCURRENCY: int = 8
+    THUMBNAIL_LIST_WIDTH: int = 480
+    THUMBNAIL_PREWARM_WIDTHS: List[int] = [480]
+    # 요청 크기는 아래 목록 중 가장 가까운 큰 값으로 맞춤 (임의 크기로 캐시가 늘지 않도록)
+    THUMBNAIL_ALLOWED_WIDTHS: List[int] = [160, 320, 480, 720, 960, 1280, 1920]
+    THUMBNAIL_ALLOWED_HEIGHTS: List[int] = [90, 180, 270, 405, 540, 720, 1080]
+
+    # Jellyfin HLS 리버스 프록시 (스트림 URL에서 api_key 제거, 세그먼트 디스크 캐시)
+    JELLYFIN_HLS_PROXY_ENABLED: bool = True
+    JELLYFIN_HLS_CACHE_PATH: str = "/tmp/jellyfin-hls-cache"
+    JELLYFIN_HLS_CACHE_MAX_BYTES: int = 20 * 1024 * 1024 * 1024  # 20 GiB
+    JELLYFIN_HLS_MAX_CONNECTIONS: int = 100
+    JELLYFIN_HLS_TIMEOUT_SEC: float = 60.0
+
     @property
     def JELLYFIN_AUTH_HEADER(self) -> str:
         """Jellyfin 10.11+ Authorization header format"""
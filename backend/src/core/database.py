@@ -6,6 +6,7 @@ SQLAlchemy async engine and session management
 
 from typing import AsyncGenerator
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -49,7 +50,33 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+# Extensions required by model indexes (must exist before create_all)
+SCHEMA_PREREQUISITES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+]
+
+# Idempotent column additions for existing databases
+# (create_all creates missing tables but never alters existing ones)
+SCHEMA_UPGRADES = [
+    "ALTER TABLE files ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)",
+    "ALTER TABLE files ADD COLUMN IF NOT EXISTS duplicate_of VARCHAR(100) "
+    "REFERENCES files(id) ON DELETE SET NULL",
+    "CREATE INDEX IF NOT EXISTS ix_files_content_hash ON files(content_hash)",
+    "ALTER TABLE files ADD COLUMN IF NOT EXISTS probed_at TIMESTAMPTZ",
+    "CREATE INDEX IF NOT EXISTS ix_jellyfin_items_library_name_created "
+    "ON jellyfin_items (lower(library_name), date_created DESC NULLS LAST, id)",
+    "CREATE INDEX IF NOT EXISTS ix_jellyfin_items_created "
+    "ON jellyfin_items (date_created DESC NULLS LAST, id)",
+    "CREATE INDEX IF NOT EXISTS ix_jellyfin_items_name_trgm "
+    "ON jellyfin_items USING gin (name gin_trgm_ops)",
+]
+
+
 async def init_db() -> None:
     """Initialize database tables"""
     async with engine.begin() as conn:
+        for statement in SCHEMA_PREREQUISITES:
+            await conn.execute(text(statement))
         await conn.run_sync(Base.metadata.create_all)
+        for statement in SCHEMA_UPGRADES:
+            await conn.execute(text(statement))
@@ -0,0 +1,21 @@
+"""
+JSON Helpers
+
+orjson 기반 JSON 인코딩/디코딩 (표준 json보다 빠름)
+"""
+
+from typing import Any
+
+import orjson
+
+JSON_BACKEND = "orjson"
+
+
+def loads(data: bytes | str) -> Any:
+    """JSON 디코딩"""
+    return orjson.loads(data)
+
+
+def dumps(value: Any) -> str:
+    """JSON 인코딩 (str)"""
+    return orjson.dumps(value).decode()
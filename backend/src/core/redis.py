@@ -0,0 +1,27 @@
+"""
+Redis Configuration
+
+Redis async client management
+"""
+
+import redis.asyncio as redis
+
+from .config import settings
+
+_client: redis.Redis | None = None
+
+
+def get_redis() -> redis.Redis:
+    """Shared Redis client (lazy initialization)"""
+    global _client
+    if _client is None:
+        _client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _client
+
+
+async def close_redis() -> None:
+    """Close shared Redis client"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
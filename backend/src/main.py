@@ -13,6 +13,11 @@ from fastapi.responses import JSONResponse
 
 from .core.config import settings
 from .core.database import init_db
+from .core.redis import close_redis
+from .services.cluster import cluster_service
+from .services.jellyfin import jellyfin_service
+from .services.jellyfin_hls import jellyfin_hls_service
+from .services.search import search_service
 
 # API Routers
 from .api.v1 import auth, catalogs, contents, jellyfin, search, stream, users
@@ -28,10 +33,20 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await init_db()
     print("✅ Database initialized")
 
+    # Apply MeiliSearch index settings (filterable source/library 등)
+    await search_service.create_indexes()
+
+    # Join transcode cluster (no-op unless CLUSTER_ENABLED)
+    await cluster_service.start()
+
     yield
 
     # Shutdown
     print("👋 Shutting down...")
+    await cluster_service.stop()
+    await jellyfin_hls_service.close()
+    await jellyfin_service.close()
+    await close_redis()
 
 
 app = FastAPI(
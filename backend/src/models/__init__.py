@@ -6,6 +6,7 @@ from .content import Content
 from .file import File
 from .player import Player
 from .hand import Hand, HandPlayer
+from .jellyfin_item import JellyfinItemRecord
 
 __all__ = [
     "User",
@@ -19,4 +20,5 @@ __all__ = [
     "Player",
     "Hand",
     "HandPlayer",
+    "JellyfinItemRecord",
 ]
@@ -4,9 +4,10 @@ File Model
 미디어 파일 메타데이터 SQLAlchemy 모델
 """
 
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, Float, Integer, String
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..core.database import Base
@@ -31,10 +32,20 @@ class File(Base):
     codec: Mapped[str | None] = mapped_column(String(50), nullable=True)  # e.g., 'h264'
     fps: Mapped[float | None] = mapped_column(Float, nullable=True)
     bitrate_kbps: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # 마지막 ffprobe 성공 시각 (NULL이면 보강 대상)
+    probed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     hls_ready: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     hls_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
 
+    # 중복 탐지 (크기 + 샘플 블록 fingerprint)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    duplicate_of: Mapped[str | None] = mapped_column(
+        String(100),
+        ForeignKey("files.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
     # Relationships
     contents: Mapped[list["Content"]] = relationship(
         "Content",
@@ -44,3 +55,8 @@ class File(Base):
         "Hand",
         back_populates="file",
     )
+
+    @property
+    def canonical_id(self) -> str:
+        """트랜스코딩/캐시에 사용할 대표 파일 ID"""
+        return self.duplicate_of or self.id
@@ -0,0 +1,66 @@
+"""
+Jellyfin Item Model
+
+Jellyfin 카탈로그 로컬 미러 SQLAlchemy 모델
+"""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from ..core.database import Base
+
+
+class JellyfinItemRecord(Base):
+    """Jellyfin 아이템 미러 모델 (목록/정렬/페이징용)"""
+
+    __tablename__ = "jellyfin_items"
+    __table_args__ = (
+        Index("ix_jellyfin_items_library_created", "library_id", "date_created"),
+        Index("ix_jellyfin_items_library_sort_name", "library_id", "sort_name"),
+        # 목록 쿼리: lower(library_name) 필터 + date_created DESC NULLS LAST, id 정렬
+        Index(
+            "ix_jellyfin_items_library_name_created",
+            func.lower(text("library_name")),
+            text("date_created DESC NULLS LAST"),
+            "id",
+        ),
+        Index("ix_jellyfin_items_created", text("date_created DESC NULLS LAST"), "id"),
+        # 이름 부분 검색 (ILIKE '%term%', pg_trgm)
+        Index(
+            "ix_jellyfin_items_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)  # Jellyfin Item Id
+    library_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    library_name: Mapped[str] = mapped_column(String(200), nullable=False)
+
+    name: Mapped[str] = mapped_column(String(500), nullable=False)
+    sort_name: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    type: Mapped[str] = mapped_column(String(50), nullable=False)
+    path: Mapped[str | None] = mapped_column(Text, nullable=True)
+    series_name: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    production_year: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    run_time_ticks: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+    date_created: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    date_last_saved: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
+    )
+
+    # Jellyfin BaseItemDto 원본 (MediaSources, ImageTags 등)
+    data: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    synced_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
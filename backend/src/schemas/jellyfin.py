@@ -9,6 +9,18 @@ from typing import Any
 
 from pydantic import BaseModel, Field
 
+from ..core.config import settings
+
+
+def parse_jellyfin_date(value: str | None) -> datetime | None:
+    """Jellyfin ISO 8601 날짜 (7자리 소수 초, Z 접미사) 파싱"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
 
 # =============================================================================
 # Server Info
@@ -208,6 +220,29 @@ class JellyfinContentResponse(BaseModel):
     class Config:
         populate_by_name = True
 
+    @staticmethod
+    def _build_urls(
+        item_id: str, primary_tag: str | None, jellyfin_host: str, api_key: str
+    ) -> tuple[str | None, str]:
+        """(썸네일 URL, 스트림 URL)"""
+        # 썸네일 URL 생성 (백엔드 프록시 캐시, 태그가 바뀌면 URL도 바뀜)
+        thumbnail_url = None
+        if primary_tag:
+            thumbnail_url = (
+                f"{settings.API_V1_PREFIX}/jellyfin/thumbnail/{item_id}"
+                f"?width={settings.THUMBNAIL_LIST_WIDTH}&tag={primary_tag}"
+            )
+
+        # HLS 스트림 URL (프록시 모드면 api_key 없는 백엔드 경로)
+        if settings.JELLYFIN_HLS_PROXY_ENABLED:
+            stream_url = f"{settings.API_V1_PREFIX}/jellyfin/stream/{item_id}/stream.m3u8"
+        else:
+            stream_url = (
+                f"{jellyfin_host}/Videos/{item_id}/stream.m3u8"
+                f"?Static=true&mediaSourceId={item_id}&api_key={api_key}"
+            )
+        return thumbnail_url, stream_url
+
     @classmethod
     def from_jellyfin_item(
         cls,
@@ -216,15 +251,11 @@ class JellyfinContentResponse(BaseModel):
         api_key: str,
     ) -> "JellyfinContentResponse":
         """JellyfinItem을 WSOPTV 응답 형식으로 변환"""
-        # 썸네일 URL 생성
-        thumbnail_url = None
-        if item.image_tags and item.image_tags.primary:
-            thumbnail_url = f"{jellyfin_host}/Items/{item.id}/Images/Primary"
-
-        # HLS 스트림 URL (Direct Stream)
-        stream_url = (
-            f"{jellyfin_host}/Videos/{item.id}/stream.m3u8"
-            f"?Static=true&mediaSourceId={item.id}&api_key={api_key}"
+        thumbnail_url, stream_url = cls._build_urls(
+            item.id,
+            item.image_tags.primary if item.image_tags else None,
+            jellyfin_host,
+            api_key,
         )
 
         return cls(
@@ -243,6 +274,42 @@ class JellyfinContentResponse(BaseModel):
             supports_hls=True,
         )
 
+    @classmethod
+    def from_jellyfin_data(
+        cls,
+        data: dict[str, Any],
+        jellyfin_host: str,
+        api_key: str,
+    ) -> "JellyfinContentResponse":
+        """
+        Jellyfin BaseItemDto(dict)에서 바로 변환 (목록용 fast path)
+
+        JellyfinItem 중간 모델 검증 없이 model_construct로 생성한다.
+        """
+        item_id = data["Id"]
+        thumbnail_url, stream_url = cls._build_urls(
+            item_id,
+            (data.get("ImageTags") or {}).get("Primary"),
+            jellyfin_host,
+            api_key,
+        )
+
+        return cls.model_construct(
+            jellyfin_id=item_id,
+            title=data.get("Name") or "",
+            description=data.get("Overview"),
+            duration_sec=(data.get("RunTimeTicks") or 0) // 10_000_000,
+            thumbnail_url=thumbnail_url,
+            stream_url=stream_url,
+            library_name=data.get("SeriesName"),
+            path=data.get("Path"),
+            year=data.get("ProductionYear"),
+            date_created=parse_jellyfin_date(data.get("DateCreated")),
+            media_type=data.get("Type") or "Video",
+            supports_direct_play=True,
+            supports_hls=True,
+        )
+
 
 class JellyfinContentListResponse(BaseModel):
     """Jellyfin 콘텐츠 목록 응답 (WSOPTV 형식)"""
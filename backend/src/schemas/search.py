@@ -26,9 +26,9 @@ class SearchRequest(BaseModel):
 
 
 class SearchResultItem(BaseModel):
-    """검색 결과 항목"""
+    """검색 결과 항목 (source="jellyfin"이면 id는 "jellyfin-{jellyfinId}")"""
 
-    id: int
+    id: int | str
     title: str
     description: str | None = None
     thumbnail_url: str | None = Field(None, alias="thumbnailUrl")
@@ -37,6 +37,9 @@ class SearchResultItem(BaseModel):
     catalog_id: str = Field(alias="catalogId")
     series_title: str = Field(alias="seriesTitle")
     hands_count: int = Field(alias="handsCount")
+    source: Literal["native", "jellyfin"] = "native"
+    jellyfin_id: str | None = Field(None, alias="jellyfinId")
+    library: str | None = None
 
     class Config:
         from_attributes = True
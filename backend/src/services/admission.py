@@ -0,0 +1,168 @@
+"""
+Admission Control Service
+
+트랜스코딩 부하 기반 승인 제어
+
+트랜스코더가 포화되면 요청 품질을 그대로 유지한 채 대기시키는 대신
+캐시된 저화질 세그먼트, 저비용 프리셋, 고화질 렌디션 제외 순으로
+품질을 낮춰 세그먼트 지연 시간을 제한한다.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from ..core.config import settings
+
+# 부하 단계
+LOAD_NORMAL = 0
+LOAD_DEGRADED = 1  # 캐시된 저화질 세그먼트 또는 저비용 프리셋 사용
+LOAD_SHEDDING = 2  # 신규 세션 마스터 플레이리스트에서 고화질 렌디션 제외
+
+QUALITY_ORDER = ["360p", "480p", "720p", "1080p"]
+
+
+class AdmissionController:
+    """트랜스코딩 슬롯 및 부하 단계 관리"""
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        target_wait_ms: float | None = None,
+        recovery_ratio: float | None = None,
+        half_life_sec: float = 5.0,
+    ):
+        self.max_concurrency = max_concurrency or settings.TRANSCODE_MAX_CONCURRENCY
+        self.target_wait_ms = target_wait_ms or settings.ADMISSION_TARGET_WAIT_MS
+        self.recovery_ratio = recovery_ratio or settings.ADMISSION_RECOVERY_RATIO
+        self.half_life_sec = half_life_sec
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._waiting = 0
+        self._running = 0
+        self._wait_ewma_ms = 0.0
+        self._service_ewma_ms = 0.0
+        self._last_sample = time.monotonic()
+        self._level = LOAD_NORMAL
+        self._normal = asyncio.Event()
+        self._normal.set()
+
+    # =========================================================================
+    # Load Estimation
+    # =========================================================================
+
+    def _decayed_wait_ms(self) -> float:
+        """관측 대기 시간 EWMA (샘플이 없으면 시간에 따라 감쇠)"""
+        elapsed = time.monotonic() - self._last_sample
+        return self._wait_ewma_ms * 0.5 ** (elapsed / self.half_life_sec)
+
+    def estimated_wait_ms(self) -> float:
+        """신규 요청의 예상 대기 시간"""
+        queued = 0.0
+        if self._running >= self.max_concurrency:
+            queued = (self._waiting + 1) / self.max_concurrency * self._service_ewma_ms
+        return max(self._decayed_wait_ms(), queued)
+
+    @property
+    def level(self) -> int:
+        """현재 부하 단계 (히스테리시스 적용)"""
+        wait = self.estimated_wait_ms()
+
+        if wait > self.target_wait_ms * 2:
+            level = LOAD_SHEDDING
+        elif wait > self.target_wait_ms:
+            level = max(LOAD_DEGRADED, self._level)
+        elif wait < self.target_wait_ms * self.recovery_ratio:
+            level = LOAD_NORMAL
+        else:
+            level = self._level
+
+        self._set_level(level)
+        return self._level
+
+    def _set_level(self, level: int) -> None:
+        self._level = level
+        if level == LOAD_NORMAL:
+            self._normal.set()
+        else:
+            self._normal.clear()
+
+    def _record(self, wait_ms: float, alpha: float = 0.2) -> None:
+        self._wait_ewma_ms = alpha * wait_ms + (1 - alpha) * self._decayed_wait_ms()
+        self._last_sample = time.monotonic()
+
+    # =========================================================================
+    # Admission
+    # =========================================================================
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """트랜스코딩 슬롯 획득 (대기 시간 및 처리 시간 기록)"""
+        queued_at = time.monotonic()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        started_at = time.monotonic()
+        self._record((started_at - queued_at) * 1000)
+        self._running += 1
+        try:
+            yield
+        finally:
+            self._running -= 1
+            self._semaphore.release()
+            service_ms = (time.monotonic() - started_at) * 1000
+            self._service_ewma_ms = 0.2 * service_ms + 0.8 * self._service_ewma_ms
+
+    async def wait_until_normal(self) -> None:
+        """부하가 정상 단계로 돌아올 때까지 대기 (백그라운드 작업용)"""
+        while self.level != LOAD_NORMAL:
+            try:
+                await asyncio.wait_for(self._normal.wait(), timeout=self.half_life_sec)
+            except asyncio.TimeoutError:
+                pass
+
+    # =========================================================================
+    # Degradation Policies
+    # =========================================================================
+
+    def choose_preset(self, preset: str) -> str:
+        """부하 단계에 맞는 인코딩 프리셋"""
+        if self.level >= LOAD_DEGRADED:
+            return settings.ADMISSION_DEGRADED_PRESET
+        return preset
+
+    def filter_qualities(self, qualities: list[str]) -> list[str]:
+        """신규 세션용 렌디션 목록 (과부하 시 고화질 제외)"""
+        if self.level < LOAD_SHEDDING:
+            return qualities
+
+        ceiling = QUALITY_ORDER.index(settings.ADMISSION_SHED_MAX_QUALITY)
+        allowed = [
+            q for q in qualities
+            if q not in QUALITY_ORDER or QUALITY_ORDER.index(q) <= ceiling
+        ]
+        return allowed or qualities[:1]
+
+    def lower_qualities(self, quality: str) -> list[str]:
+        """요청 품질보다 낮은 품질 목록 (높은 순)"""
+        if quality not in QUALITY_ORDER:
+            return []
+        return list(reversed(QUALITY_ORDER[:QUALITY_ORDER.index(quality)]))
+
+    def stats(self) -> dict[str, float | int]:
+        """부하 지표"""
+        return {
+            "level": self.level,
+            "running": self._running,
+            "waiting": self._waiting,
+            "estimated_wait_ms": round(self.estimated_wait_ms(), 1),
+            "service_ms": round(self._service_ewma_ms, 1),
+        }
+
+
+# Singleton instance
+admission_controller = AdmissionController()
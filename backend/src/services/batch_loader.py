@@ -0,0 +1,89 @@
+"""
+Batch Loader
+
+DataLoader 방식 배치 조회
+
+짧은 시간 창 안에 들어온 단건 조회 키를 모아 batch 함수 한 번으로 처리하고
+결과를 키별로 나눠 돌려준다. 같은 키가 대기 중이면 같은 결과를 공유한다.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """키 배치 로더"""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[K]], Awaitable[dict[K, V]]],
+        window_sec: float = 0.005,
+        max_batch: int = 100,
+    ):
+        """
+        Args:
+            batch_fn: 키 목록 → {키: 값} (결과에 없는 키는 None)
+            window_sec: 첫 키 이후 배치를 모으는 시간
+            max_batch: 배치 최대 키 수 (도달 시 즉시 전송)
+        """
+        self.batch_fn = batch_fn
+        self.window_sec = window_sec
+        self.max_batch = max_batch
+        self._pending: dict[K, asyncio.Future] = {}
+        self._timer: asyncio.TimerHandle | None = None
+
+        # Metrics
+        self.loads = 0
+        self.batches = 0
+
+    async def load(self, key: K) -> V | None:
+        """단건 조회 (다른 조회와 묶여 전송)"""
+        self.loads += 1
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window_sec, self._flush)
+
+        # 한 호출자가 취소되어도 배치 결과는 다른 호출자에게 전달
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: list[K]) -> list[V | None]:
+        """여러 건 조회 (입력 순서 유지)"""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        self.batches += 1
+        asyncio.get_running_loop().create_task(self._dispatch(batch))
+
+    async def _dispatch(self, batch: dict[K, asyncio.Future]) -> None:
+        try:
+            results = await self.batch_fn(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    future.exception()  # 대기자가 모두 취소된 경우 경고 방지
+            return
+
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results.get(key))
+
+    def stats(self) -> dict[str, int]:
+        """배치 지표"""
+        return {"loads": self.loads, "batches": self.batches, "pending": len(self._pending)}
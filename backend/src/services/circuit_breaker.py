@@ -0,0 +1,64 @@
+"""
+Circuit Breaker
+
+외부 서비스 장애 시 빠른 실패 (Jellyfin 클라이언트용)
+
+- closed: 정상. 연속 실패가 임계값에 도달하면 open
+- open: reset 시간 동안 요청을 보내지 않고 즉시 실패
+- half_open: reset 시간이 지나면 시험 요청 하나만 허용 (성공 시 closed, 실패 시 open)
+"""
+
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """연속 실패 기반 서킷 브레이커"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probe_started: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self) -> bool:
+        """요청 허용 여부 (half_open이면 시험 요청 하나만 허용)"""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == OPEN:
+            return False
+
+        # 시험 요청이 결과 없이 끝난 경우(취소 등) reset 시간 후 다시 허용
+        now = time.monotonic()
+        if self._probe_started is None or now - self._probe_started >= self.reset_timeout:
+            self._probe_started = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probe_started is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probe_started = None
+
+    def stats(self) -> dict[str, int | str]:
+        """브레이커 상태"""
+        return {"state": self.state, "failures": self.failures}
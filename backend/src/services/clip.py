@@ -0,0 +1,344 @@
+"""
+Clip Service
+
+핸드 단위 MP4 클립 생성 (smart cut)
+
+Hand.start_sec..end_sec 구간을 전부 재인코딩하지 않고, 구간 안쪽의
+첫/마지막 키프레임 사이는 스트림 복사하고 양 끝의 불완전한 GOP만
+재인코딩한 뒤 concat demuxer로 잇는다. 결과는 faststart MP4로
+핸드 + 렌디션 기준 캐시에 저장한다.
+
+스트림 복사 구간과 경계 구간이 한 트랙에서 디코딩되려면 코덱/프로파일/
+레벨/해상도/픽셀 포맷이 같아야 하므로, 원본이 8-bit H.264(yuv420p)일 때만
+경계를 같은 파라미터로 고정해 smart cut하고, 그 외(HEVC, 10-bit 등)는
+구간 전체를 재인코딩한다.
+"""
+
+import asyncio
+import hashlib
+from pathlib import Path
+
+from ..core.config import settings
+from .admission import admission_controller
+from .media_probe import probe_media
+from .source_cache import source_cache_service
+from .streaming import AUDIO_SETTINGS, QUALITY_VIDEO_SETTINGS, streaming_service
+from .transcode_queue import make_tmp_path, transcode_queue
+
+# 원본 화질 유지 (키프레임 사이 스트림 복사)
+SOURCE_RENDITION = "source"
+
+# 재인코딩 구간 화질 (짧은 구간이므로 원본에 가깝게)
+EDGE_VIDEO_SETTINGS = "-crf 18 -pix_fmt yuv420p"
+
+# ffprobe H.264 profile → libx264 -profile:v
+X264_PROFILES = {
+    "Constrained Baseline": "baseline",
+    "Baseline": "baseline",
+    "Main": "main",
+    "High": "high",
+}
+
+
+def edge_video_settings(probe: dict | None) -> list[str] | None:
+    """
+    스트림 복사 구간과 이어 붙일 경계 재인코딩 옵션
+
+    원본과 같은 profile/level/해상도/yuv420p로 고정한다.
+
+    Returns:
+        libx264 옵션 (원본이 smart cut 불가 형식이면 None)
+    """
+    if not probe or probe.get("codec") != "h264" or probe.get("pix_fmt") != "yuv420p":
+        return None
+
+    profile = X264_PROFILES.get(probe.get("profile") or "")
+    level = probe.get("level")
+    if not profile or not level or level <= 0 or not probe.get("resolution"):
+        return None
+
+    return [
+        "-profile:v", profile,
+        "-level:v", f"{level // 10}.{level % 10}",
+        "-s", probe["resolution"],
+        *EDGE_VIDEO_SETTINGS.split(),
+    ]
+
+
+async def probe_keyframes(path: str, start: float, end: float) -> list[float]:
+    """
+    구간 내 비디오 키프레임 시각
+
+    디코딩 없이 패킷 플래그만 읽는다.
+    """
+    process = await asyncio.create_subprocess_exec(
+        "ffprobe",
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-read_intervals", f"{start}%{end}",
+        "-show_entries", "packet=pts_time,flags",
+        "-of", "csv=p=0",
+        path,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(
+            process.communicate(), timeout=settings.PROBE_TIMEOUT_SEC
+        )
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return []
+
+    if process.returncode != 0:
+        return []
+    return parse_keyframes(stdout.decode(errors="ignore"), start, end)
+
+
+def parse_keyframes(output: str, start: float, end: float) -> list[float]:
+    """ffprobe packet CSV (pts_time,flags)에서 구간 내 키프레임 추출"""
+    keyframes = set()
+    for line in output.splitlines():
+        pts, _, flags = line.partition(",")
+        if "K" not in flags:
+            continue
+        try:
+            t = float(pts)
+        except ValueError:
+            continue
+        if start <= t <= end:
+            keyframes.add(t)
+    return sorted(keyframes)
+
+
+class ClipService:
+    """핸드 클립 서비스"""
+
+    def __init__(self):
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    @property
+    def cache_path(self) -> Path:
+        return streaming_service.cache_path / "clips"
+
+    def get_clip_path(
+        self, hand_id: int, file_id: str, start_sec: float, end_sec: float, rendition: str
+    ) -> Path:
+        """
+        클립 캐시 경로
+
+        핸드 구간이나 인코딩 파라미터가 바뀌면 다른 키가 된다.
+        """
+        params = "|".join([
+            file_id,
+            f"{start_sec:.3f}",
+            f"{end_sec:.3f}",
+            QUALITY_VIDEO_SETTINGS.get(rendition, EDGE_VIDEO_SETTINGS),
+            AUDIO_SETTINGS,
+        ])
+        digest = hashlib.sha1(params.encode()).hexdigest()[:8]
+        return self.cache_path / f"hand_{hand_id}_{rendition}-{digest}.mp4"
+
+    def plan_cut(
+        self, start: float, end: float, keyframes: list[float]
+    ) -> list[tuple[str, float, float]]:
+        """
+        구간 분할 계획
+
+        Returns:
+            [(mode, 시작, 끝)] - mode는 "encode"(재인코딩) 또는 "copy"(스트림 복사)
+        """
+        inner = [k for k in keyframes if start <= k <= end]
+        if len(inner) < 2:
+            return [("encode", start, end)]
+
+        first, last = inner[0], inner[-1]
+        parts = []
+        if first > start:
+            parts.append(("encode", start, first))
+        parts.append(("copy", first, last))
+        if end > last:
+            parts.append(("encode", last, end))
+        return parts
+
+    def build_part_command(
+        self,
+        source: str,
+        mode: str,
+        start: float,
+        end: float,
+        output_path: Path,
+        edge_settings: list[str] | None = None,
+    ) -> list[str]:
+        """
+        비디오 구간 추출 명령 (오디오는 최종 mux에서 한 번에 인코딩)
+
+        Args:
+            edge_settings: 경계 재인코딩 옵션 (edge_video_settings, 없으면 기본 화질)
+        """
+        if mode == "copy":
+            codec = ["-c:v", "copy"]
+        else:
+            codec = [
+                "-c:v", "libx264",
+                "-preset", admission_controller.choose_preset(settings.HLS_SEGMENT_PRESET),
+                *(edge_settings or EDGE_VIDEO_SETTINGS.split()),
+            ]
+
+        return [
+            "ffmpeg",
+            "-ss", f"{start:.3f}",
+            "-i", source,
+            "-t", f"{end - start:.3f}",
+            "-map", "0:v:0",
+            *codec,
+            "-an",
+            "-f", "mpegts",
+            "-y",
+            str(output_path),
+        ]
+
+    def build_mux_command(
+        self, concat_list: Path, source: str, start: float, end: float, output_path: Path
+    ) -> list[str]:
+        """
+        구간 연결 + 원본 오디오 mux (faststart MP4)
+
+        경계 구간(libx264)과 복사 구간의 SPS/PPS가 달라 avcC 하나로 표현할 수
+        없으므로, 파라미터 세트를 키프레임마다 in-band로 두는 avc3로 기록한다.
+        """
+        return [
+            "ffmpeg",
+            "-f", "concat",
+            "-safe", "0",
+            "-i", str(concat_list),
+            "-ss", f"{start:.3f}",
+            "-t", f"{end - start:.3f}",
+            "-i", source,
+            "-map", "0:v:0",
+            "-map", "1:a:0?",
+            "-c:v", "copy",
+            "-tag:v", "avc3",
+            *AUDIO_SETTINGS.split(),
+            "-movflags", "+faststart",
+            "-f", "mp4",
+            "-y",
+            str(output_path),
+        ]
+
+    def build_transcode_command(
+        self, source: str, start: float, end: float, quality: str, output_path: Path
+    ) -> list[str]:
+        """
+        전체 재인코딩 클립
+
+        품질 지정(스케일링) 또는 smart cut 불가 원본의 source 렌디션에 사용한다.
+        """
+        return [
+            "ffmpeg",
+            "-ss", f"{start:.3f}",
+            "-i", source,
+            "-t", f"{end - start:.3f}",
+            "-c:v", "libx264",
+            "-preset", admission_controller.choose_preset(settings.HLS_SEGMENT_PRESET),
+            *QUALITY_VIDEO_SETTINGS.get(quality, EDGE_VIDEO_SETTINGS).split(),
+            *AUDIO_SETTINGS.split(),
+            "-movflags", "+faststart",
+            "-f", "mp4",
+            "-y",
+            str(output_path),
+        ]
+
+    async def get_clip(
+        self,
+        hand_id: int,
+        file_id: str,
+        nas_path: str,
+        start_sec: float,
+        end_sec: float,
+        rendition: str = SOURCE_RENDITION,
+    ) -> Path | None:
+        """
+        클립 파일 경로 (없으면 생성)
+
+        같은 클립을 동시에 요청하면 한 번만 생성한다.
+
+        Returns:
+            MP4 경로 (생성 실패 시 None)
+        """
+        clip_path = self.get_clip_path(hand_id, file_id, start_sec, end_sec, rendition)
+        if clip_path.exists():
+            return clip_path
+
+        key = str(clip_path)
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._create_clip(clip_path, nas_path, start_sec, end_sec, rendition)
+            )
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+
+        await asyncio.shield(task)
+        return clip_path if clip_path.exists() else None
+
+    async def _create_clip(
+        self, clip_path: Path, nas_path: str, start: float, end: float, rendition: str
+    ) -> bool:
+        try:
+            clip_path.parent.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return False
+        source = await source_cache_service.resolve(nas_path)
+
+        async with admission_controller.slot():
+            tmp_path = make_tmp_path(clip_path)
+
+            if rendition != SOURCE_RENDITION:
+                cmd = self.build_transcode_command(source, start, end, rendition, tmp_path)
+                return await transcode_queue.run("clip", cmd, tmp_path, clip_path)
+
+            keyframes = await probe_keyframes(source, start, end)
+            plan = self.plan_cut(start, end, keyframes)
+            edge_settings = None
+            if any(mode == "copy" for mode, _, _ in plan):
+                edge_settings = edge_video_settings(await probe_media(source))
+                if edge_settings is None:
+                    # 경계 구간과 한 트랙으로 이을 수 없는 원본 → 전체 재인코딩
+                    cmd = self.build_transcode_command(
+                        source, start, end, SOURCE_RENDITION, tmp_path
+                    )
+                    return await transcode_queue.run("clip", cmd, tmp_path, clip_path)
+
+            parts_dir = make_tmp_path(clip_path).with_suffix(".parts")
+            try:
+                parts_dir.mkdir()
+                part_paths = []
+                for i, (mode, part_start, part_end) in enumerate(plan):
+                    part_path = parts_dir / f"part_{i}.ts"
+                    part_tmp = make_tmp_path(part_path)
+                    cmd = self.build_part_command(
+                        source, mode, part_start, part_end, part_tmp, edge_settings
+                    )
+                    if not await transcode_queue.run("clip", cmd, part_tmp, part_path):
+                        return False
+                    part_paths.append(part_path)
+
+                concat_list = parts_dir / "parts.txt"
+                concat_list.write_text(
+                    "".join(f"file '{p.resolve()}'\n" for p in part_paths)
+                )
+                cmd = self.build_mux_command(concat_list, source, start, end, tmp_path)
+                return await transcode_queue.run("clip", cmd, tmp_path, clip_path)
+            except OSError:
+                return False
+            finally:
+                if parts_dir.exists():
+                    for path in parts_dir.iterdir():
+                        path.unlink(missing_ok=True)
+                    parts_dir.rmdir()
+
+
+# Singleton instance
+clip_service = ClipService()
@@ -0,0 +1,187 @@
+"""
+Cluster Service
+
+트랜스코딩 노드 consistent-hash 라우팅
+
+여러 백엔드 노드가 로드밸런서 뒤에 있을 때 같은 미디어 파일의 세그먼트가
+항상 같은 노드(owner)에서 인코딩·캐시되도록 File.id 기준 해시 링을 유지한다.
+owner가 아닌 노드는 세그먼트 요청을 owner에게 프록시한다.
+
+노드 목록은 CLUSTER_NODES(정적) 또는 Redis heartbeat(동적)로 구성되며,
+노드가 추가/제거되면 링을 다시 만들어 해당 구간의 키만 이동한다.
+
+전달 요청 헤더(X-WSOPTV-Routed)는 노드 ID와 경로를 공유 비밀키로 서명한 값이라,
+클라이언트가 헤더를 직접 붙여 owner가 아닌 노드의 인코딩을 강제할 수 없다.
+"""
+
+import asyncio
+import bisect
+import hashlib
+import hmac
+import time
+
+import httpx
+from redis.exceptions import RedisError
+
+from ..core.config import settings
+from ..core.redis import get_redis
+
+ROUTED_HEADER = "X-WSOPTV-Routed"
+
+
+class HashRing:
+    """가상 노드 기반 consistent-hash 링"""
+
+    def __init__(self, nodes: dict[str, str] | None = None, vnodes: int = 100):
+        self.vnodes = vnodes
+        self.nodes: dict[str, str] = {}
+        self._keys: list[int] = []
+        self._owners: list[str] = []
+        self.rebuild(nodes or {})
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
+
+    def rebuild(self, nodes: dict[str, str]) -> None:
+        """노드 목록으로 링 재구성"""
+        points = sorted(
+            (self._hash(f"{node_id}#{i}"), node_id)
+            for node_id in nodes
+            for i in range(self.vnodes)
+        )
+        self.nodes = dict(nodes)
+        self._keys = [p[0] for p in points]
+        self._owners = [p[1] for p in points]
+
+    def owner(self, key: str) -> str | None:
+        """키를 담당하는 노드 ID"""
+        if not self._keys:
+            return None
+        idx = bisect.bisect(self._keys, self._hash(key)) % len(self._keys)
+        return self._owners[idx]
+
+
+class ClusterService:
+    """노드 멤버십 및 세그먼트 요청 라우팅"""
+
+    def __init__(self):
+        self.node_id = settings.CLUSTER_NODE_ID
+        self.node_url = settings.CLUSTER_NODE_URL
+        self.ring = HashRing()
+        self._client: httpx.AsyncClient | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.CLUSTER_ENABLED
+
+    def _static_nodes(self) -> dict[str, str]:
+        """CLUSTER_NODES ("id=url" 목록) 파싱"""
+        nodes = {}
+        for entry in settings.CLUSTER_NODES:
+            node_id, _, url = entry.partition("=")
+            if node_id and url:
+                nodes[node_id] = url.rstrip("/")
+        return nodes
+
+    async def refresh(self) -> None:
+        """heartbeat 기록 및 살아있는 노드로 링 갱신"""
+        nodes = self._static_nodes()
+
+        if not nodes:
+            redis = get_redis()
+            now = time.time()
+            key = settings.CLUSTER_REDIS_KEY
+            await redis.zadd(key, {self.node_id: now})
+            await redis.hset(f"{key}:urls", self.node_id, self.node_url)
+            await redis.zremrangebyscore(key, 0, now - settings.CLUSTER_NODE_TTL_SEC)
+
+            alive = await redis.zrange(key, 0, -1)
+            urls = await redis.hgetall(f"{key}:urls")
+            nodes = {node_id: urls[node_id] for node_id in alive if node_id in urls}
+
+        nodes.setdefault(self.node_id, self.node_url)
+        if nodes != self.ring.nodes:
+            self.ring.rebuild(nodes)
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except RedisError:
+                pass  # 마지막으로 알려진 링 유지
+            await asyncio.sleep(settings.CLUSTER_REFRESH_SEC)
+
+    async def start(self) -> None:
+        """멤버십 갱신 루프 시작"""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._heartbeat_loop())
+
+    async def stop(self) -> None:
+        """루프 종료 및 멤버십 해제"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+            try:
+                redis = get_redis()
+                await redis.zrem(settings.CLUSTER_REDIS_KEY, self.node_id)
+            except RedisError:
+                pass
+        if self._client and not self._client.is_closed:
+            await self._client.aclose()
+
+    @staticmethod
+    def _sign(node_id: str, path: str) -> str:
+        secret = settings.CLUSTER_SECRET or settings.JWT_SECRET_KEY
+        message = f"{node_id}:{path}".encode()
+        return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+    def routed_header(self, path: str) -> str:
+        """owner로 전달하는 요청의 서명 헤더 값"""
+        return f"{self.node_id}:{self._sign(self.node_id, path)}"
+
+    def is_routed(self, value: str | None, path: str) -> bool:
+        """다른 노드가 서명해 전달한 요청인지 (서명이 틀리면 일반 요청으로 처리)"""
+        if not value:
+            return False
+        node_id, _, signature = value.rpartition(":")
+        return bool(node_id) and hmac.compare_digest(signature, self._sign(node_id, path))
+
+    def owner_url(self, key: str) -> str | None:
+        """
+        키 담당 노드 URL
+
+        클러스터 비활성화 또는 자신이 owner면 None
+        """
+        if not self.enabled:
+            return None
+        owner = self.ring.owner(key)
+        if owner is None or owner == self.node_id:
+            return None
+        return self.ring.nodes.get(owner)
+
+    async def forward(
+        self,
+        owner_url: str,
+        path: str,
+        query: str,
+        cookies: dict[str, str],
+    ) -> httpx.Response:
+        """owner 노드로 요청 전달 (스트리밍 응답)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.TRANSCODE_JOB_TIMEOUT_SEC, connect=2.0),
+            )
+
+        url = f"{owner_url}{path}" + (f"?{query}" if query else "")
+        headers = {ROUTED_HEADER: self.routed_header(path)}
+        if cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in cookies.items())
+
+        request = self._client.build_request("GET", url, headers=headers)
+        return await self._client.send(request, stream=True)
+
+
+# Singleton instance
+cluster_service = ClusterService()
@@ -0,0 +1,176 @@
+"""
+Dedup Service
+
+NAS 중복 미디어 탐지
+
+File.id는 nas_path 해시라서 같은 녹화본이 두 폴더에 복사되면 서로 다른
+파일로 취급되어 프로브/캐시/패키징이 중복된다. 파일 크기와 샘플 블록으로
+빠른 fingerprint를 계산해 같은 미디어를 찾아 대표 파일(duplicate_of)로
+묶는다.
+
+실행: python -m src.services.dedup [--merge]
+"""
+
+import asyncio
+import hashlib
+import os
+import sys
+from collections import defaultdict
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..models.content import Content
+from ..models.file import File
+from ..models.hand import Hand
+
+
+def compute_fingerprint(
+    path: str,
+    sample_count: int | None = None,
+    sample_size: int | None = None,
+) -> str:
+    """
+    크기 + 균등 간격 샘플 블록 fingerprint
+
+    전체 파일을 읽지 않고 앞/뒤/중간 블록만 해시한다.
+    """
+    sample_count = max(2, sample_count or settings.DEDUP_SAMPLE_COUNT)
+    sample_size = sample_size or settings.DEDUP_SAMPLE_SIZE
+
+    size = os.path.getsize(path)
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+
+    with open(path, "rb") as f:
+        if size <= sample_count * sample_size:
+            digest.update(f.read())
+        else:
+            step = (size - sample_size) // (sample_count - 1)
+            for i in range(sample_count):
+                f.seek(i * step)
+                digest.update(f.read(sample_size))
+
+    return digest.hexdigest()
+
+
+class DedupService:
+    """중복 미디어 파일 탐지 서비스"""
+
+    def __init__(self, concurrency: int | None = None):
+        self._semaphore = asyncio.Semaphore(concurrency or settings.DEDUP_CONCURRENCY)
+
+    async def _fingerprint(self, file: File) -> tuple[str, str | None]:
+        """NAS I/O 동시성을 제한하며 fingerprint 계산"""
+        path = settings.convert_nas_path(file.nas_path)
+        async with self._semaphore:
+            try:
+                return file.id, await asyncio.to_thread(compute_fingerprint, path)
+            except OSError:
+                return file.id, None
+
+    async def scan(self, db: AsyncSession, merge: bool = False) -> dict[str, int]:
+        """
+        중복 탐지 실행
+
+        Args:
+            db: DB 세션
+            merge: True면 콘텐츠/핸드의 file_id를 대표 파일로 변경
+
+        Returns:
+            처리 통계
+        """
+        result = await db.execute(select(File))
+        files = list(result.scalars().all())
+
+        # 크기가 같은 파일이 있어야 중복 후보 (크기 미상은 항상 후보)
+        by_size: dict[int, list[File]] = defaultdict(list)
+        for file in files:
+            by_size[file.size_bytes].append(file)
+        candidates = [
+            f for size, group in by_size.items()
+            if size <= 0 or len(group) > 1
+            for f in group
+        ]
+
+        pending = [f for f in candidates if f.content_hash is None]
+        hashes = dict(await asyncio.gather(*(self._fingerprint(f) for f in pending)))
+
+        for file in pending:
+            if hashes.get(file.id):
+                file.content_hash = hashes[file.id]
+
+        # fingerprint별 그룹 → 대표 파일 선정
+        groups: dict[str, list[File]] = defaultdict(list)
+        for file in candidates:
+            if file.content_hash:
+                groups[file.content_hash].append(file)
+
+        duplicates = 0
+        flagged: set[str] = set()
+        for group in groups.values():
+            if len(group) < 2:
+                continue
+
+            # 이미 대표인 파일 우선, 없으면 ID 순
+            group.sort(key=lambda f: (f.duplicate_of is not None, f.id))
+            canonical = group[0]
+            canonical.duplicate_of = None
+
+            for dup in group[1:]:
+                dup.duplicate_of = canonical.id
+                flagged.add(dup.id)
+                duplicates += 1
+
+                if merge:
+                    await db.execute(
+                        update(Content)
+                        .where(Content.file_id == dup.id)
+                        .values(file_id=canonical.id)
+                    )
+                    await db.execute(
+                        update(Hand)
+                        .where(Hand.file_id == dup.id)
+                        .values(file_id=canonical.id)
+                    )
+
+        # 더 이상 어떤 그룹의 중복도 아닌 파일은 해제 (내용이 바뀐 파일 등)
+        unflagged = 0
+        for file in files:
+            if file.id not in flagged and file.duplicate_of is not None:
+                file.duplicate_of = None
+                unflagged += 1
+
+        await db.commit()
+
+        return {
+            "files": len(files),
+            "candidates": len(candidates),
+            "hashed": sum(1 for h in hashes.values() if h),
+            "duplicates": duplicates,
+            "unflagged": unflagged,
+        }
+
+
+async def run_dedup(merge: bool = False):
+    """중복 탐지 실행"""
+    from ..core.database import async_session_maker, engine, init_db
+
+    print(f"[Dedup] Scanning files (merge={merge})...")
+    try:
+        await init_db()
+        async with async_session_maker() as session:
+            results = await DedupService().scan(session, merge=merge)
+
+        for key, value in results.items():
+            print(f"  {key}: {value}")
+        print("[Dedup] Completed successfully!")
+    except Exception as e:
+        print(f"[Dedup] ERROR: {e}")
+        sys.exit(1)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_dedup(merge="--merge" in sys.argv))
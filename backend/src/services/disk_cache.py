@@ -0,0 +1,155 @@
+"""
+Disk Cache
+
+용량 제한 로컬 디스크 캐시 (썸네일, Jellyfin HLS 세그먼트 공용)
+
+키별로 원본을 한 번만 받아 파일로 저장하고, 동시에 들어온 같은 키 요청은
+하나의 조회를 공유한다. 용량 한도를 넘으면 가장 오래 사용하지 않은 파일부터
+제거한다.
+"""
+
+import asyncio
+import hashlib
+import os
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable
+
+
+class DiskCache:
+    """LRU read-through 디스크 캐시"""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.cache_path = Path(path)
+        self.max_bytes = max_bytes
+
+        # local path -> size (LRU 순서)
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._bytes_used = 0
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._loaded = False
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_path(self, key: str) -> Path:
+        """캐시 키 → 파일 경로"""
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return self.cache_path / digest[:2] / digest
+
+    def _load_index(self) -> None:
+        """기존 파일을 접근 시각 순으로 LRU에 등록"""
+        self._loaded = True
+        if not self.cache_path.exists():
+            return
+
+        files = [p for p in self.cache_path.glob("*/*") if not p.name.startswith(".")]
+        for path in sorted(files, key=lambda p: p.stat().st_atime):
+            size = path.stat().st_size
+            self._entries[str(path)] = size
+            self._bytes_used += size
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[bytes | None]],
+    ) -> Path | None:
+        """
+        캐시된 파일 경로 (없으면 fetch 결과를 저장)
+
+        Returns:
+            파일 경로 (fetch가 None을 반환하면 None)
+        """
+        if not self._loaded:
+            await asyncio.to_thread(self._load_index)
+
+        path = self.get_path(key)
+        local_key = str(path)
+        if local_key in self._entries and path.exists():
+            self._entries.move_to_end(local_key)
+            self.hits += 1
+            return path
+        if local_key not in self._entries and self._adopt(path):
+            self.hits += 1
+            return path
+
+        self.misses += 1
+        task = self._tasks.get(local_key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(path, fetch))
+            self._tasks[local_key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(local_key, None))
+
+        # 한 호출자가 취소되어도 공유 조회는 계속 진행
+        return await asyncio.shield(task)
+
+    def _adopt(self, path: Path) -> bool:
+        """
+        인덱스에 없는 기존 파일을 LRU에 등록
+
+        다른 프로세스(미러 동기화의 미리 생성 등)가 같은 캐시 디렉터리에 쓴
+        파일도 적중으로 쓰고 용량 계산에 포함한다.
+        """
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return False
+        self._make_room(size)
+        self._entries[str(path)] = size
+        self._bytes_used += size
+        return True
+
+    def discard(self, path: Path) -> None:
+        """사라진 파일을 인덱스에서 제거 (다음 요청은 다시 받음)"""
+        size = self._entries.pop(str(path), None)
+        if size is not None:
+            self._bytes_used -= size
+
+    async def _fetch(
+        self, path: Path, fetch: Callable[[], Awaitable[bytes | None]]
+    ) -> Path | None:
+        data = await fetch()
+        if data is None:
+            return None
+
+        await asyncio.to_thread(self._write, path, data)
+        previous = self._entries.pop(str(path), None)
+        if previous is not None:
+            self._bytes_used -= previous
+        self._make_room(len(data))
+        self._entries[str(path)] = len(data)
+        self._bytes_used += len(data)
+        return path
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        """임시 파일에 쓴 뒤 원자적 교체"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _make_room(self, size: int) -> None:
+        """용량 한도 내로 LRU 제거"""
+        while self._entries and self._bytes_used + size > self.max_bytes:
+            oldest, oldest_size = self._entries.popitem(last=False)
+            self._bytes_used -= oldest_size
+            self.evictions += 1
+            Path(oldest).unlink(missing_ok=True)
+
+    def stats(self) -> dict[str, int]:
+        """캐시 지표"""
+        return {
+            "entries": len(self._entries),
+            "bytes_used": self._bytes_used,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -4,11 +4,16 @@ Jellyfin Service
 Jellyfin API 통합 서비스
 """
 
-from typing import Any
+from typing import Any, Awaitable, Callable, TypeVar
+
+import asyncio
+import random
+from functools import partial
 
 import httpx
 from httpx import HTTPStatusError, RequestError
 
+from ..core import jsonlib
 from ..core.config import settings
 from ..schemas.jellyfin import (
     JellyfinContentListResponse,
@@ -21,6 +26,29 @@ from ..schemas.jellyfin import (
     JellyfinPlaybackInfo,
     JellyfinServerInfo,
 )
+from .batch_loader import BatchLoader
+from .circuit_breaker import CLOSED, CircuitBreaker
+from .response_cache import ResponseCache
+
+T = TypeVar("T")
+
+# 재시도 대상 응답 (게이트웨이/일시적 장애)
+RETRY_STATUS_CODES = {502, 503, 504}
+
+# WSOPTV 콘텐츠 응답에 필요한 필드만 요청 (MediaSources 제외)
+# Name, Type, RunTimeTicks, ProductionYear, SeriesName, ImageTags는 기본 포함
+CONTENT_FIELDS = ["Path", "Overview", "DateCreated"]
+CONTENT_ITEM_TYPES = ["Movie", "Episode", "Video"]
+LEAN_ITEM_PARAMS = {
+    "EnableImageTypes": "Primary",
+    "ImageTypeLimit": 1,
+    "EnableUserData": "false",
+}
+
+
+def normalize_id(item_id: str) -> str:
+    """Jellyfin GUID 정규화 (하이픈 제거, 소문자)"""
+    return item_id.replace("-", "").lower()
 
 
 class JellyfinError(Exception):
@@ -39,6 +67,18 @@ class JellyfinService:
         self.host = settings.JELLYFIN_HOST
         self.api_key = settings.JELLYFIN_API_KEY
         self._client: httpx.AsyncClient | None = None
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._item_loaders: dict[str, BatchLoader[str, dict[str, Any]]] = {}
+        self.cache = ResponseCache(
+            namespace=settings.JELLYFIN_CACHE_REDIS_PREFIX,
+            stale_sec=settings.JELLYFIN_CACHE_STALE_SEC,
+            max_entries=settings.JELLYFIN_CACHE_MAX_ENTRIES,
+            use_redis=settings.JELLYFIN_CACHE_REDIS_ENABLED,
+        )
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.JELLYFIN_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.JELLYFIN_BREAKER_RESET_SEC,
+        )
 
     @property
     def headers(self) -> dict[str, str]:
@@ -48,13 +88,27 @@ class JellyfinService:
             "Content-Type": "application/json",
         }
 
+    @staticmethod
+    def _timeout(read_sec: float | None = None) -> httpx.Timeout:
+        """작업별 타임아웃 (연결/풀 대기는 짧게 고정)"""
+        return httpx.Timeout(
+            read_sec or settings.JELLYFIN_TIMEOUT_SEC,
+            connect=settings.JELLYFIN_CONNECT_TIMEOUT_SEC,
+            pool=settings.JELLYFIN_POOL_TIMEOUT_SEC,
+        )
+
     async def _get_client(self) -> httpx.AsyncClient:
         """HTTP 클라이언트 (lazy initialization)"""
         if self._client is None or self._client.is_closed:
             self._client = httpx.AsyncClient(
                 base_url=self.host,
                 headers=self.headers,
-                timeout=30.0,
+                timeout=self._timeout(),
+                limits=httpx.Limits(
+                    max_connections=settings.JELLYFIN_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.JELLYFIN_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.JELLYFIN_KEEPALIVE_EXPIRY_SEC,
+                ),
             )
         return self._client
 
@@ -69,8 +123,68 @@ class JellyfinService:
         endpoint: str,
         params: dict[str, Any] | None = None,
         json_data: dict[str, Any] | None = None,
+        timeout: float | None = None,
     ) -> dict[str, Any]:
-        """API 요청 수행"""
+        """
+        API 요청 수행
+
+        동시에 들어온 같은 GET 요청(메서드 + 엔드포인트 + 파라미터)은
+        업스트림 요청 하나를 공유한다 (single-flight).
+        """
+        if method != "GET" or json_data is not None:
+            return await self._send(method, endpoint, params, json_data, timeout)
+
+        key = self._request_key(method, endpoint, params)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._send(method, endpoint, params, None, timeout))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # 한 호출자가 취소되어도 공유 요청은 계속 진행
+        return await asyncio.shield(task)
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        json_data: dict[str, Any] | None = None,
+        timeout: float | None = None,
+    ) -> dict[str, Any]:
+        """
+        HTTP 요청 전송
+
+        GET은 연결 오류/게이트웨이 오류 시 지터 백오프로 재시도한다.
+        서킷이 열려 있으면 요청을 보내지 않고 즉시 503으로 실패한다.
+        """
+        retries = settings.JELLYFIN_RETRY_ATTEMPTS if method == "GET" else 0
+        attempt = 0
+        while True:
+            try:
+                return await self._send_once(method, endpoint, params, json_data, timeout)
+            except JellyfinError as e:
+                retryable = e.status_code is None or e.status_code in RETRY_STATUS_CODES
+                if not retryable or attempt >= retries or self.breaker.state != CLOSED:
+                    raise
+            # Full jitter: 동시에 실패한 요청들이 같은 시점에 몰리지 않도록
+            await asyncio.sleep(random.uniform(0, settings.JELLYFIN_RETRY_BACKOFF_SEC * 2**attempt))
+            attempt += 1
+
+    def _check_breaker(self) -> None:
+        """서킷이 열려 있으면 즉시 실패"""
+        if not self.breaker.allow():
+            raise JellyfinError("Jellyfin unavailable (circuit open)", status_code=503)
+
+    async def _send_once(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None,
+        json_data: dict[str, Any] | None,
+        timeout: float | None,
+    ) -> dict[str, Any]:
+        self._check_breaker()
         client = await self._get_client()
         try:
             response = await client.request(
@@ -78,31 +192,81 @@ class JellyfinService:
                 url=endpoint,
                 params=params,
                 json=json_data,
+                timeout=self._timeout(timeout),
             )
             response.raise_for_status()
-            return response.json()
         except HTTPStatusError as e:
+            if e.response.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
             raise JellyfinError(
                 f"Jellyfin API error: {e.response.text}",
                 status_code=e.response.status_code,
             )
         except RequestError as e:
+            self.breaker.record_failure()
             raise JellyfinError(f"Connection error: {str(e)}")
 
+        self.breaker.record_success()
+        return jsonlib.loads(response.content)
+
+    @staticmethod
+    def _request_key(method: str, endpoint: str, params: dict[str, Any] | None) -> str:
+        """요청 식별 키 (파라미터 순서/대소문자 무관, Jellyfin 쿼리는 대소문자 구분 없음)"""
+        query = "&".join(
+            f"{k}={v}" for k, v in sorted((k.lower(), str(v)) for k, v in (params or {}).items())
+        )
+        return f"{method}:{endpoint}?{query}"
+
+    async def _cached_request(
+        self,
+        endpoint: str,
+        ttl: int,
+        parse: Callable[[dict[str, Any]], T],
+        params: dict[str, Any] | None = None,
+        timeout: float | None = None,
+        fetch: Callable[[], Awaitable[dict[str, Any]]] | None = None,
+    ) -> T:
+        """
+        캐시된 GET 요청
+
+        TTL이 지난 값은 stale 허용 구간 동안 즉시 반환하고 백그라운드에서 갱신한다.
+        Jellyfin 장애(서킷 open 포함) 시에는 stale 구간이 지난 값이라도 반환한다.
+
+        Args:
+            fetch: 원본 조회 함수 (기본: endpoint + params로 GET)
+        """
+        fetch = fetch or partial(self._request, "GET", endpoint, params=params, timeout=timeout)
+
+        if not settings.JELLYFIN_CACHE_ENABLED:
+            return parse(await fetch())
+
+        key = self._request_key("GET", endpoint, params)
+        try:
+            return await self.cache.get_or_fetch(key, ttl, fetch, parse)
+        except JellyfinError as e:
+            if e.status_code is not None and e.status_code < 500:
+                raise
+            entry = self.cache.peek(key)
+            if entry is None:
+                raise
+            return entry.value
+
     # =========================================================================
     # Server Info
     # =========================================================================
 
     async def get_server_info(self) -> JellyfinServerInfo:
         """서버 정보 조회"""
-        data = await self._request("GET", "/System/Info")
+        data = await self._request("GET", "/System/Info", timeout=settings.JELLYFIN_TIMEOUT_INFO_SEC)
         return JellyfinServerInfo(**data)
 
     async def get_public_info(self) -> dict[str, Any]:
         """공개 서버 정보 (인증 불필요)"""
-        client = await self._get_client()
-        response = await client.get("/System/Info/Public")
-        return response.json()
+        return await self._request(
+            "GET", "/System/Info/Public", timeout=settings.JELLYFIN_TIMEOUT_INFO_SEC
+        )
 
     # =========================================================================
     # Libraries
@@ -110,9 +274,11 @@ class JellyfinService:
 
     async def get_libraries(self) -> list[JellyfinLibrary]:
         """라이브러리 목록 조회"""
-        data = await self._request("GET", "/Library/MediaFolders")
-        response = JellyfinLibraryListResponse(**data)
-        return response.items
+        return await self._cached_request(
+            "/Library/MediaFolders",
+            settings.JELLYFIN_CACHE_TTL_LIBRARIES,
+            lambda data: JellyfinLibraryListResponse(**data).items,
+        )
 
     async def get_library_by_name(self, name: str) -> JellyfinLibrary | None:
         """이름으로 라이브러리 조회"""
@@ -152,6 +318,30 @@ class JellyfinService:
             search_term: 검색어
             fields: 포함할 필드 (Path, Overview, MediaSources 등)
         """
+        params = self._items_params(
+            parent_id, include_item_types, recursive, start_index, limit,
+            sort_by, sort_order, search_term, fields,
+        )
+        return await self._cached_request(
+            "/Items",
+            settings.JELLYFIN_CACHE_TTL_ITEMS,
+            lambda data: JellyfinItemListResponse(**data),
+            params=params,
+        )
+
+    @staticmethod
+    def _items_params(
+        parent_id: str | None = None,
+        include_item_types: list[str] | None = None,
+        recursive: bool = True,
+        start_index: int = 0,
+        limit: int = 20,
+        sort_by: str = "DateCreated",
+        sort_order: str = "Descending",
+        search_term: str | None = None,
+        fields: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """/Items 쿼리 파라미터"""
         params: dict[str, Any] = {
             "Recursive": str(recursive).lower(),
             "StartIndex": start_index,
@@ -175,8 +365,13 @@ class JellyfinService:
             # 기본 필드
             params["Fields"] = "Path,Overview,DateCreated,MediaSources"
 
-        data = await self._request("GET", "/Items", params=params)
-        return JellyfinItemListResponse(**data)
+        return params
+
+    async def get_raw_items(self, params: dict[str, Any]) -> dict[str, Any]:
+        """캐시를 거치지 않는 /Items 원본 JSON 조회 (미러 동기화용)"""
+        return await self._request(
+            "GET", "/Items", params=params, timeout=settings.JELLYFIN_TIMEOUT_SYNC_SEC
+        )
 
     async def get_item(
         self,
@@ -188,17 +383,61 @@ class JellyfinService:
 
         Note: Jellyfin 10.11+에서는 /Items/{id} 대신 /Items?Ids={id} 사용
         """
-        params: dict[str, Any] = {"Ids": item_id}
-        if fields:
-            params["Fields"] = ",".join(fields)
-        else:
-            params["Fields"] = "Path,Overview,DateCreated,MediaSources"
+        params = {"Fields": ",".join(fields) if fields else "Path,Overview,DateCreated,MediaSources"}
 
-        data = await self._request("GET", "/Items", params=params)
-        items = data.get("Items", [])
-        if not items:
+        item = await self._cached_item(
+            item_id,
+            params,
+            lambda data: JellyfinItem(**data["Items"][0]) if data.get("Items") else None,
+        )
+        if item is None:
             raise JellyfinError(f"Item not found: {item_id}", status_code=404)
-        return JellyfinItem(**items[0])
+        return item
+
+    def _item_loader(self, params: dict[str, Any]) -> BatchLoader[str, dict[str, Any]]:
+        """같은 파라미터(Fields 등)의 단건 조회를 /Items?Ids=a,b,c 한 번으로 묶는 로더"""
+        key = self._request_key("GET", "/Items", params)
+        loader = self._item_loaders.get(key)
+        if loader is None:
+
+            async def fetch_batch(item_ids: list[str]) -> dict[str, dict[str, Any]]:
+                data = await self._request(
+                    "GET", "/Items", params=params | {"Ids": ",".join(item_ids)}
+                )
+                return {normalize_id(item["Id"]): item for item in data.get("Items", [])}
+
+            loader = BatchLoader(
+                fetch_batch,
+                window_sec=settings.JELLYFIN_BATCH_WINDOW_MS / 1000,
+                max_batch=settings.JELLYFIN_BATCH_MAX_IDS,
+            )
+            self._item_loaders[key] = loader
+        return loader
+
+    async def _cached_item(
+        self,
+        item_id: str,
+        params: dict[str, Any],
+        parse: Callable[[dict[str, Any]], T],
+    ) -> T:
+        """
+        단건 /Items?Ids= 캐시 조회
+
+        캐시 키는 아이템별이고, 캐시 미스는 배치 로더로 묶어 한 번에 조회한 뒤
+        아이템별로 나눠 각 캐시 항목에 저장한다.
+        """
+
+        async def fetch() -> dict[str, Any]:
+            item = await self._item_loader(params).load(normalize_id(item_id))
+            return {"Items": [item] if item else [], "TotalRecordCount": 1 if item else 0}
+
+        return await self._cached_request(
+            "/Items",
+            settings.JELLYFIN_CACHE_TTL_ITEM,
+            parse,
+            params=params | {"Ids": item_id},
+            fetch=fetch,
+        )
 
     async def search_items(
         self,
@@ -221,8 +460,12 @@ class JellyfinService:
 
     async def get_playback_info(self, item_id: str) -> JellyfinPlaybackInfo:
         """재생 정보 조회"""
-        data = await self._request("GET", f"/Items/{item_id}/PlaybackInfo")
-        return JellyfinPlaybackInfo(**data)
+        return await self._cached_request(
+            f"/Items/{item_id}/PlaybackInfo",
+            settings.JELLYFIN_CACHE_TTL_PLAYBACK,
+            lambda data: JellyfinPlaybackInfo(**data),
+            timeout=settings.JELLYFIN_TIMEOUT_PLAYBACK_SEC,
+        )
 
     def get_stream_url(
         self,
@@ -239,6 +482,53 @@ class JellyfinService:
         """Direct Stream URL (트랜스코딩 없이)"""
         return f"{self.host}/Videos/{item_id}/stream?Static=true&api_key={self.api_key}"
 
+    async def get_image(
+        self,
+        item_id: str,
+        image_type: str = "Primary",
+        max_width: int | None = None,
+        max_height: int | None = None,
+        tag: str | None = None,
+    ) -> bytes | None:
+        """
+        아이템 이미지 조회 (Jellyfin에서 리사이즈)
+
+        Returns:
+            이미지 바이트 (이미지가 없으면 None)
+        """
+        params: dict[str, Any] = {}
+        if max_width:
+            params["maxWidth"] = max_width
+        if max_height:
+            params["maxHeight"] = max_height
+        if tag:
+            params["tag"] = tag
+
+        self._check_breaker()
+        client = await self._get_client()
+        try:
+            response = await client.get(
+                f"/Items/{item_id}/Images/{image_type}",
+                params=params,
+                timeout=self._timeout(settings.JELLYFIN_TIMEOUT_IMAGE_SEC),
+            )
+        except RequestError as e:
+            self.breaker.record_failure()
+            raise JellyfinError(f"Connection error: {str(e)}")
+
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        if response.status_code == 404:
+            return None
+        if response.is_error:
+            raise JellyfinError(
+                f"Jellyfin image error: {response.status_code}",
+                status_code=response.status_code,
+            )
+        return response.content
+
     def get_thumbnail_url(
         self,
         item_id: str,
@@ -261,6 +551,22 @@ class JellyfinService:
     # WSOPTV 통합 메서드
     # =========================================================================
 
+    def _to_content_list(
+        self, data: dict[str, Any], page: int, limit: int
+    ) -> JellyfinContentListResponse:
+        """/Items 원본 JSON → WSOPTV 목록 (중간 모델 없이 한 번만 변환)"""
+        total = data.get("TotalRecordCount", 0)
+        return JellyfinContentListResponse.model_construct(
+            items=[
+                JellyfinContentResponse.from_jellyfin_data(item, self.host, self.api_key)
+                for item in data.get("Items", [])
+            ],
+            total=total,
+            page=page,
+            limit=limit,
+            has_next=(page - 1) * limit + limit < total,
+        )
+
     async def get_contents(
         self,
         library_name: str | None = None,
@@ -271,7 +577,8 @@ class JellyfinService:
         """
         WSOPTV 콘텐츠 목록 조회 (통합 API)
 
-        기존 WSOPTV ContentListResponse 형식과 호환
+        기존 WSOPTV ContentListResponse 형식과 호환.
+        응답에 필요한 필드만 요청하고 JSON에서 바로 응답 모델을 만든다.
         """
         # 라이브러리 ID 조회
         parent_id = None
@@ -280,47 +587,82 @@ class JellyfinService:
             if library:
                 parent_id = library.id
 
-        # 아이템 조회
-        start_index = (page - 1) * limit
-        response = await self.get_items(
+        params = self._items_params(
             parent_id=parent_id,
-            include_item_types=["Movie", "Episode", "Video"],
-            start_index=start_index,
+            include_item_types=CONTENT_ITEM_TYPES,
+            start_index=(page - 1) * limit,
             limit=limit,
             search_term=search_term,
-            fields=["Path", "Overview", "DateCreated", "MediaSources"],
+            fields=CONTENT_FIELDS,
+        ) | LEAN_ITEM_PARAMS
+
+        return await self._cached_request(
+            "/Items",
+            settings.JELLYFIN_CACHE_TTL_ITEMS,
+            lambda data: self._to_content_list(data, page, limit),
+            params=params,
         )
 
-        # WSOPTV 형식으로 변환
-        items = [
-            JellyfinContentResponse.from_jellyfin_item(
-                item=item,
-                jellyfin_host=self.host,
-                api_key=self.api_key,
-            )
-            for item in response.items
-        ]
+    async def search_contents(
+        self,
+        query: str,
+        library_name: str | None = None,
+        page: int = 1,
+        limit: int = 20,
+    ) -> JellyfinContentListResponse:
+        """WSOPTV 형식 검색 (이름순, 라이브러리 필터/페이징은 get_contents와 동일)"""
+        parent_id = None
+        if library_name:
+            library = await self.get_library_by_name(library_name)
+            if library:
+                parent_id = library.id
 
-        return JellyfinContentListResponse(
-            items=items,
-            total=response.total_record_count,
-            page=page,
+        params = self._items_params(
+            parent_id=parent_id,
+            include_item_types=CONTENT_ITEM_TYPES,
+            start_index=(page - 1) * limit,
             limit=limit,
-            has_next=(start_index + limit) < response.total_record_count,
+            sort_by="SortName",
+            sort_order="Ascending",
+            search_term=query,
+            fields=CONTENT_FIELDS,
+        ) | LEAN_ITEM_PARAMS
+
+        return await self._cached_request(
+            "/Items",
+            settings.JELLYFIN_CACHE_TTL_ITEMS,
+            lambda data: self._to_content_list(data, page, limit),
+            params=params,
         )
 
     async def get_content(self, item_id: str) -> JellyfinContentResponse:
         """단일 콘텐츠 조회 (WSOPTV 형식)"""
-        item = await self.get_item(
+        content = await self._load_content(item_id)
+        if content is None:
+            raise JellyfinError(f"Item not found: {item_id}", status_code=404)
+        return content
+
+    async def _load_content(self, item_id: str) -> JellyfinContentResponse | None:
+        return await self._cached_item(
             item_id,
-            fields=["Path", "Overview", "DateCreated", "MediaSources"],
+            {"Fields": ",".join(CONTENT_FIELDS)} | LEAN_ITEM_PARAMS,
+            lambda data: (
+                JellyfinContentResponse.from_jellyfin_data(data["Items"][0], self.host, self.api_key)
+                if data.get("Items") else None
+            ),
         )
 
-        return JellyfinContentResponse.from_jellyfin_item(
-            item=item,
-            jellyfin_host=self.host,
-            api_key=self.api_key,
-        )
+    async def get_contents_by_ids(self, item_ids: list[str]) -> list[JellyfinContentResponse]:
+        """
+        여러 콘텐츠 조회 (시청 기록, 이어보기 등)
+
+        캐시에 없는 아이템은 /Items?Ids=a,b,c 한 번으로 조회한다.
+
+        Returns:
+            입력 순서의 콘텐츠 목록 (없는 아이템 제외)
+        """
+        contents = await asyncio.gather(*(self._load_content(item_id) for item_id in item_ids))
+        return [content for content in contents if content is not None]
 
 
 # Singleton instance
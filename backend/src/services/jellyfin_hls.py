@@ -0,0 +1,302 @@
+"""
+Jellyfin HLS Proxy Service
+
+Jellyfin HLS 스트림 리버스 프록시
+
+- 플레이리스트: 업스트림 m3u8의 URI를 /jellyfin/stream/{item_id}/... 로 재작성
+  (api_key는 서버에만 두고 클라이언트 URL에서는 제거)
+  (프록시 범위 밖 URI는 업스트림 호스트가 드러나지 않도록 제거)
+- 세그먼트: 디스크 캐시에 한 번만 받아 같은 아이템의 모든 시청자가 공유
+- Direct Stream: Range 요청을 그대로 전달하며 스트리밍 (캐시 없음)
+
+PlaySessionId는 시청자별로 두어 한 시청자의 탐색이 다른 시청자의 트랜스코딩을
+중단시키지 않게 하고, 세그먼트 캐시 키에서는 세션을 빼서 같은 세그먼트 인덱스는
+세션과 무관하게 공유한다. 모든 업스트림 요청은 커넥션 풀이 있는 하나의
+클라이언트를 재사용한다.
+"""
+
+import re
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit
+
+import httpx
+from httpx import RequestError
+
+from ..core.config import settings
+from .disk_cache import DiskCache
+from .jellyfin import JellyfinError
+
+PLAYLIST_SUFFIX = ".m3u8"
+SEGMENT_MEDIA_TYPES = {
+    ".ts": "video/mp2t",
+    ".mp4": "video/mp4",
+    ".m4s": "video/iso.segment",
+    ".aac": "audio/aac",
+    ".vtt": "text/vtt",
+}
+DIRECT_PATHS = ("stream",)
+
+# 클라이언트 URL에 남기지 않는 쿼리 파라미터 (소문자)
+SECRET_PARAMS = {"api_key", "apikey"}
+
+# 세그먼트 캐시 키에서 빼는 시청자별 파라미터 (소문자)
+SESSION_PARAMS = {"playsessionid"}
+
+# 바로 다음 URI 줄에 붙는 태그 (URI를 제거하면 함께 제거)
+URI_TAG_PREFIXES = ("#EXTINF", "#EXT-X-STREAM-INF", "#EXT-X-BYTERANGE")
+
+URI_ATTR_PATTERN = re.compile(r'URI="([^"]*)"')
+
+# Direct Stream 응답에서 그대로 전달하는 헤더
+PASSTHROUGH_HEADERS = ("content-type", "content-length", "content-range", "accept-ranges")
+
+
+def strip_secrets(params: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    """api_key 등 비밀 파라미터 제거"""
+    return [(k, v) for k, v in params if k.lower() not in SECRET_PARAMS]
+
+
+def rewrite_playlist(text: str, upstream_url: str, upstream_prefix: str, proxy_base: str) -> str:
+    """
+    업스트림 m3u8의 URI를 프록시 URL로 재작성
+
+    Args:
+        text: 업스트림 플레이리스트
+        upstream_url: 플레이리스트를 받은 업스트림 URL (상대 URI 기준)
+        upstream_prefix: 프록시 대상 업스트림 경로 (/Videos/{item_id}/)
+        proxy_base: 프록시 경로 (/api/v1/jellyfin/stream/{item_id})
+    """
+
+    def to_proxy(uri: str) -> str | None:
+        parts = urlsplit(urljoin(upstream_url, uri))
+        if not parts.path.startswith(upstream_prefix):
+            return None  # 프록시 범위 밖 (업스트림 URL을 노출하지 않도록 제거)
+        query = urlencode(strip_secrets(parse_qsl(parts.query, keep_blank_values=True)))
+        path = f"{proxy_base}/{parts.path[len(upstream_prefix):]}"
+        return f"{path}?{query}" if query else path
+
+    lines: list[str] = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            lines.append(line)
+        elif stripped.startswith("#"):
+            uris = [to_proxy(uri) for uri in URI_ATTR_PATTERN.findall(line)]
+            if None in uris:
+                continue
+            replacements = iter(uris)
+            lines.append(URI_ATTR_PATTERN.sub(lambda _: f'URI="{next(replacements)}"', line))
+        else:
+            proxied = to_proxy(stripped)
+            if proxied is None:
+                while lines and lines[-1].strip().startswith(URI_TAG_PREFIXES):
+                    lines.pop()
+                continue
+            lines.append(proxied)
+    return "\n".join(lines) + "\n"
+
+
+class JellyfinHlsService:
+    """Jellyfin HLS 리버스 프록시 서비스"""
+
+    def __init__(self):
+        self.host = settings.JELLYFIN_HOST.rstrip("/")
+        self.cache = DiskCache(
+            settings.JELLYFIN_HLS_CACHE_PATH, settings.JELLYFIN_HLS_CACHE_MAX_BYTES
+        )
+        self._client: httpx.AsyncClient | None = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """업스트림 HTTP 클라이언트 (커넥션 풀 공유)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.host,
+                headers={"Authorization": settings.JELLYFIN_AUTH_HEADER},
+                timeout=httpx.Timeout(settings.JELLYFIN_HLS_TIMEOUT_SEC, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=settings.JELLYFIN_HLS_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.JELLYFIN_HLS_MAX_CONNECTIONS,
+                ),
+            )
+        return self._client
+
+    async def close(self):
+        """클라이언트 종료"""
+        if self._client and not self._client.is_closed:
+            await self._client.aclose()
+
+    # =========================================================================
+    # URLs
+    # =========================================================================
+
+    @staticmethod
+    def get_proxy_base(item_id: str) -> str:
+        """아이템 프록시 경로"""
+        return f"{settings.API_V1_PREFIX}/jellyfin/stream/{item_id}"
+
+    def get_playlist_url(self, item_id: str) -> str:
+        """클라이언트용 HLS 진입 URL (api_key 없음)"""
+        return f"{self.get_proxy_base(item_id)}/stream.m3u8"
+
+    def get_direct_url(self, item_id: str) -> str:
+        """클라이언트용 Direct Stream URL (api_key 없음)"""
+        return f"{self.get_proxy_base(item_id)}/stream"
+
+    def _upstream_prefix(self, item_id: str) -> str:
+        return f"{urlsplit(self.host).path}/Videos/{item_id}/"
+
+    def _upstream_params(
+        self,
+        item_id: str,
+        path: str,
+        params: list[tuple[str, str]],
+        viewer: str | None = None,
+    ) -> list[tuple[str, str]]:
+        """업스트림 쿼리 (진입 요청이면 기본 재생 파라미터 추가)"""
+        params = strip_secrets(params)
+        if params or path not in ("stream.m3u8", *DIRECT_PATHS):
+            return params
+
+        defaults = [("Static", "true"), ("mediaSourceId", item_id)]
+        if path.endswith(PLAYLIST_SUFFIX):
+            # 시청자별 세션 (탐색 시 재시작되는 트랜스코딩이 다른 시청자에 영향 없음)
+            session = f"wsoptv-{item_id}-{viewer}" if viewer else f"wsoptv-{item_id}"
+            defaults.append(("PlaySessionId", session))
+        return defaults
+
+    @staticmethod
+    def cache_key(item_id: str, path: str, params: list[tuple[str, str]]) -> str:
+        """세그먼트 캐시 키 (파라미터 순서, 재생 세션 무관)"""
+        params = [(k, v) for k, v in strip_secrets(params) if k.lower() not in SESSION_PARAMS]
+        return f"{item_id}/{path}?{urlencode(sorted(params))}"
+
+    @staticmethod
+    def is_playlist(path: str) -> bool:
+        return path.endswith(PLAYLIST_SUFFIX)
+
+    @staticmethod
+    def get_segment_media_type(path: str) -> str | None:
+        """세그먼트 MIME 타입 (세그먼트가 아니면 None)"""
+        return SEGMENT_MEDIA_TYPES.get(Path(path).suffix)
+
+    @staticmethod
+    def is_direct(path: str) -> bool:
+        return path in DIRECT_PATHS
+
+    # =========================================================================
+    # Proxy
+    # =========================================================================
+
+    async def _get(self, item_id: str, path: str, params: list[tuple[str, str]]) -> httpx.Response:
+        client = await self._get_client()
+        try:
+            # list는 불변(invariant)이라 httpx 파라미터 타입과 맞지 않으므로 tuple로 전달
+            return await client.get(f"/Videos/{item_id}/{path}", params=tuple(params))
+        except RequestError as e:
+            raise JellyfinError(f"Connection error: {str(e)}")
+
+    async def get_playlist(
+        self,
+        item_id: str,
+        path: str,
+        params: list[tuple[str, str]],
+        viewer: str | None = None,
+    ) -> str | None:
+        """
+        재작성된 플레이리스트
+
+        Args:
+            viewer: 시청자 식별자 (진입 플레이리스트의 PlaySessionId에 사용)
+
+        Returns:
+            m3u8 텍스트 (업스트림에 없으면 None)
+        """
+        params = self._upstream_params(item_id, path, params, viewer)
+        response = await self._get(item_id, path, params)
+        if response.status_code == 404:
+            return None
+        if response.is_error:
+            raise JellyfinError(
+                f"Jellyfin HLS error: {response.status_code}",
+                status_code=response.status_code,
+            )
+
+        upstream_url = str(response.request.url)
+        return rewrite_playlist(
+            response.text,
+            upstream_url,
+            self._upstream_prefix(item_id),
+            self.get_proxy_base(item_id),
+        )
+
+    async def get_segment(
+        self, item_id: str, path: str, params: list[tuple[str, str]]
+    ) -> Path | None:
+        """
+        캐시된 세그먼트 경로 (없으면 업스트림에서 한 번만 받아 저장)
+
+        Returns:
+            세그먼트 파일 경로 (업스트림에 없으면 None)
+        """
+        params = strip_secrets(params)
+
+        async def _fetch() -> bytes | None:
+            response = await self._get(item_id, path, params)
+            if response.status_code == 404:
+                return None
+            if response.is_error:
+                raise JellyfinError(
+                    f"Jellyfin HLS error: {response.status_code}",
+                    status_code=response.status_code,
+                )
+            return response.content
+
+        return await self.cache.get_or_fetch(self.cache_key(item_id, path, params), _fetch)
+
+    async def open_direct(
+        self,
+        item_id: str,
+        path: str,
+        params: list[tuple[str, str]],
+        range_header: str | None = None,
+    ) -> tuple[httpx.Response, dict[str, Any]]:
+        """
+        Direct Stream 업스트림 응답 (스트리밍, 호출자가 aclose 필요)
+
+        Returns:
+            (업스트림 응답, 전달할 헤더)
+        """
+        client = await self._get_client()
+        request = client.build_request(
+            "GET",
+            f"/Videos/{item_id}/{path}",
+            params=tuple(self._upstream_params(item_id, path, params)),
+            headers={"Range": range_header} if range_header else None,
+        )
+        try:
+            response = await client.send(request, stream=True)
+        except RequestError as e:
+            raise JellyfinError(f"Connection error: {str(e)}")
+
+        if response.is_error:
+            await response.aclose()
+            raise JellyfinError(
+                f"Jellyfin stream error: {response.status_code}",
+                status_code=response.status_code,
+            )
+
+        headers = {
+            name: response.headers[name]
+            for name in PASSTHROUGH_HEADERS
+            if name in response.headers
+        }
+        return response, headers
+
+    def stats(self) -> dict[str, int]:
+        """세그먼트 캐시 지표"""
+        return self.cache.stats()
+
+
+# Singleton instance
+jellyfin_hls_service = JellyfinHlsService()
@@ -0,0 +1,313 @@
+"""
+Jellyfin Mirror Service
+
+Jellyfin 카탈로그 로컬 미러 (Postgres)
+
+라이브러리별로 DateLastSaved 기준 증분 동기화해 jellyfin_items 테이블에
+아이템(이름, 경로, 미디어 소스, 이미지 태그 등)을 upsert하고, 원격 건수와
+로컬 건수가 다르면 ID 목록을 비교해 삭제된 아이템을 정리한다.
+목록/정렬/페이징은 미러에서 인덱스 쿼리로 처리하고, Jellyfin은 재생에만 쓴다.
+JELLYFIN_SEARCH_INDEX_ENABLED면 같은 변경분을 MeiliSearch contents 인덱스에도 반영한다.
+
+실행: python -m src.services.jellyfin_mirror [--full] [--loop]
+"""
+
+import asyncio
+import sys
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..models.jellyfin_item import JellyfinItemRecord
+from ..schemas.jellyfin import (
+    JellyfinContentListResponse,
+    JellyfinContentResponse,
+    JellyfinLibrary,
+    parse_jellyfin_date,
+)
+from .jellyfin import JellyfinService, jellyfin_service
+from .jellyfin_search import JellyfinSearchIndexer
+from .thumbnail_cache import ThumbnailCacheService
+
+SYNC_ITEM_TYPES = "Movie,Episode,Video"
+SYNC_FIELDS = "Path,Overview,DateCreated,DateLastSaved,SortName,MediaSources"
+
+
+def item_to_row(item: dict[str, Any], library: JellyfinLibrary) -> dict[str, Any]:
+    """Jellyfin BaseItemDto → jellyfin_items 행"""
+    return {
+        "id": item["Id"],
+        "library_id": library.id,
+        "library_name": library.name,
+        "name": item.get("Name") or "",
+        "sort_name": item.get("SortName"),
+        "type": item.get("Type") or "Video",
+        "path": item.get("Path"),
+        "series_name": item.get("SeriesName"),
+        "production_year": item.get("ProductionYear"),
+        "run_time_ticks": item.get("RunTimeTicks"),
+        "date_created": parse_jellyfin_date(item.get("DateCreated")),
+        "date_last_saved": parse_jellyfin_date(item.get("DateLastSaved")),
+        "data": item,
+    }
+
+
+class JellyfinMirrorService:
+    """Jellyfin 카탈로그 미러 서비스"""
+
+    def __init__(
+        self,
+        jellyfin: JellyfinService | None = None,
+        page_size: int | None = None,
+    ):
+        self.jellyfin = jellyfin or jellyfin_service
+        self.page_size = page_size or settings.JELLYFIN_SYNC_PAGE_SIZE
+        # 동기화된 아이템의 목록용 썸네일 (item_id, Primary 태그)
+        self._thumbnails: list[tuple[str, str | None]] = []
+        self.search_indexer = (
+            JellyfinSearchIndexer(self.jellyfin) if settings.JELLYFIN_SEARCH_INDEX_ENABLED else None
+        )
+
+    # =========================================================================
+    # Sync
+    # =========================================================================
+
+    def _library_params(self, library: JellyfinLibrary) -> dict[str, Any]:
+        return {
+            "ParentId": library.id,
+            "Recursive": "true",
+            "IncludeItemTypes": SYNC_ITEM_TYPES,
+        }
+
+    async def _last_saved(self, db: AsyncSession, library_id: str) -> datetime | None:
+        result = await db.execute(
+            select(func.max(JellyfinItemRecord.date_last_saved))
+            .where(JellyfinItemRecord.library_id == library_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def _upsert(self, db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+        stmt = insert(JellyfinItemRecord).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JellyfinItemRecord.id],
+            set_={
+                column: stmt.excluded[column]
+                for column in rows[0]
+                if column != "id"
+            } | {"synced_at": func.now()},
+        )
+        await db.execute(stmt)
+
+    async def sync_library(
+        self, db: AsyncSession, library: JellyfinLibrary, full: bool = False
+    ) -> dict[str, int]:
+        """라이브러리 증분 동기화 (DateLastSaved 이후 변경분만)"""
+        params = self._library_params(library) | {
+            "Fields": SYNC_FIELDS,
+            "SortBy": "DateCreated,SortName",
+            "SortOrder": "Ascending",
+            "Limit": self.page_size,
+        }
+
+        last_saved = None if full else await self._last_saved(db, library.id)
+        if last_saved:
+            params["MinDateLastSaved"] = last_saved.isoformat()
+
+        upserted = 0
+        start_index = 0
+        while True:
+            data = await self.jellyfin.get_raw_items(params | {"StartIndex": start_index})
+            items = data.get("Items", [])
+            if items:
+                await self._upsert(db, [item_to_row(item, library) for item in items])
+                await db.commit()
+                upserted += len(items)
+                if self.search_indexer:
+                    await self.search_indexer.index_items(items, library)
+                self._thumbnails.extend(
+                    (item["Id"], item["ImageTags"]["Primary"])
+                    for item in items
+                    if (item.get("ImageTags") or {}).get("Primary")
+                )
+
+            start_index += len(items)
+            if not items or start_index >= data.get("TotalRecordCount", 0):
+                break
+
+        deleted = await self.reconcile_library(db, library)
+        return {"upserted": upserted, "deleted": deleted}
+
+    async def reconcile_library(self, db: AsyncSession, library: JellyfinLibrary) -> int:
+        """
+        삭제된 아이템 정리
+
+        원격 건수와 로컬 건수가 같으면 ID 목록 비교를 생략한다.
+        """
+        remote = await self.jellyfin.get_raw_items(self._library_params(library) | {"Limit": 0})
+        remote_total = remote.get("TotalRecordCount", 0)
+
+        result = await db.execute(
+            select(JellyfinItemRecord.id)
+            .where(JellyfinItemRecord.library_id == library.id)
+        )
+        local_ids = set(result.scalars().all())
+        if len(local_ids) == remote_total:
+            return 0
+
+        remote_ids: set[str] = set()
+        params = self._library_params(library) | {
+            "EnableImages": "false",
+            "EnableUserData": "false",
+            "Limit": self.page_size * 10,
+        }
+        start_index = 0
+        while True:
+            data = await self.jellyfin.get_raw_items(params | {"StartIndex": start_index})
+            items = data.get("Items", [])
+            remote_ids.update(item["Id"] for item in items)
+            start_index += len(items)
+            if not items or start_index >= data.get("TotalRecordCount", 0):
+                break
+
+        stale = list(local_ids - remote_ids)
+        for start in range(0, len(stale), 1000):
+            await db.execute(
+                delete(JellyfinItemRecord)
+                .where(JellyfinItemRecord.id.in_(stale[start:start + 1000]))
+            )
+        await db.commit()
+        if self.search_indexer:
+            await self.search_indexer.delete_items(stale)
+        return len(stale)
+
+    async def sync(self, db: AsyncSession, full: bool = False) -> dict[str, int]:
+        """
+        전체 라이브러리 동기화
+
+        Args:
+            db: DB 세션
+            full: True면 DateLastSaved와 무관하게 모든 아이템 재동기화
+        """
+        libraries = await self.jellyfin.get_libraries()
+        stats = {"libraries": len(libraries), "upserted": 0, "deleted": 0}
+        self._thumbnails = []
+        if self.search_indexer:
+            await self.search_indexer.search_service.create_indexes()
+
+        for library in libraries:
+            library_stats = await self.sync_library(db, library, full=full)
+            stats["upserted"] += library_stats["upserted"]
+            stats["deleted"] += library_stats["deleted"]
+
+        # 사라진 라이브러리의 아이템 정리 (목록이 비면 설정 오류일 수 있으므로 유지)
+        if libraries:
+            result = await db.execute(
+                delete(JellyfinItemRecord)
+                .where(JellyfinItemRecord.library_id.not_in([lib.id for lib in libraries]))
+            )
+            stats["deleted"] += result.rowcount or 0
+            await db.commit()
+            if self.search_indexer:
+                await self.search_indexer.prune_libraries([lib.id for lib in libraries])
+
+        # 신규/변경 아이템의 목록용 썸네일 미리 생성
+        stats["thumbnails"] = await ThumbnailCacheService(self.jellyfin).prewarm(self._thumbnails)
+        return stats
+
+    # =========================================================================
+    # Query
+    # =========================================================================
+
+    def _to_content(self, record: JellyfinItemRecord) -> JellyfinContentResponse:
+        return JellyfinContentResponse.from_jellyfin_data(
+            record.data,
+            jellyfin_host=self.jellyfin.host,
+            api_key=self.jellyfin.api_key,
+        )
+
+    async def get_contents(
+        self,
+        db: AsyncSession,
+        library_name: str | None = None,
+        page: int = 1,
+        limit: int = 20,
+        search_term: str | None = None,
+    ) -> JellyfinContentListResponse:
+        """미러 기반 콘텐츠 목록 (JellyfinService.get_contents와 같은 형식)"""
+        conditions = []
+        if library_name:
+            conditions.append(func.lower(JellyfinItemRecord.library_name) == library_name.lower())
+        if search_term:
+            conditions.append(JellyfinItemRecord.name.ilike(f"%{search_term}%"))
+
+        total = (await db.execute(
+            select(func.count()).select_from(JellyfinItemRecord).where(*conditions)
+        )).scalar_one()
+
+        offset = (page - 1) * limit
+        result = await db.execute(
+            select(JellyfinItemRecord)
+            .where(*conditions)
+            .order_by(JellyfinItemRecord.date_created.desc().nulls_last(), JellyfinItemRecord.id)
+            .offset(offset)
+            .limit(limit)
+        )
+
+        return JellyfinContentListResponse.model_construct(
+            items=[self._to_content(record) for record in result.scalars().all()],
+            total=total,
+            page=page,
+            limit=limit,
+            has_next=(offset + limit) < total,
+        )
+
+    async def get_content(
+        self, db: AsyncSession, item_id: str
+    ) -> JellyfinContentResponse | None:
+        """미러 기반 단일 콘텐츠 (미동기화 아이템이면 None)"""
+        record = await db.get(JellyfinItemRecord, item_id)
+        return self._to_content(record) if record else None
+
+    async def get_contents_by_ids(
+        self, db: AsyncSession, item_ids: list[str]
+    ) -> dict[str, JellyfinContentResponse]:
+        """미러 기반 여러 콘텐츠 (id → 콘텐츠, 미동기화 아이템 제외)"""
+        result = await db.execute(
+            select(JellyfinItemRecord).where(JellyfinItemRecord.id.in_(item_ids))
+        )
+        return {record.id: self._to_content(record) for record in result.scalars().all()}
+
+
+async def run_sync(full: bool = False, loop: bool = False):
+    """Jellyfin 미러 동기화 실행"""
+    from ..core.database import async_session_maker, engine, init_db
+
+    print(f"[JellyfinSync] Syncing {settings.JELLYFIN_HOST} (full={full}, loop={loop})...")
+    try:
+        await init_db()
+        while True:
+            async with async_session_maker() as session:
+                results = await JellyfinMirrorService().sync(session, full=full)
+
+            for key, value in results.items():
+                print(f"  {key}: {value}")
+            print("[JellyfinSync] Completed successfully!")
+
+            if not loop:
+                break
+            full = False
+            await asyncio.sleep(settings.JELLYFIN_SYNC_INTERVAL_SEC)
+    except Exception as e:
+        print(f"[JellyfinSync] ERROR: {e}")
+        sys.exit(1)
+    finally:
+        await jellyfin_service.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_sync(full="--full" in sys.argv, loop="--loop" in sys.argv))
@@ -0,0 +1,259 @@
+"""
+Jellyfin Search Indexer
+
+Jellyfin 아이템을 MeiliSearch contents 인덱스에 네이티브 콘텐츠와 함께 색인
+
+- 문서 id: jellyfin-{item_id}, source="jellyfin" (네이티브 문서는 source 없음 또는 "native")
+- library / library_id로 필터, created_at으로 정렬
+- /jellyfin/search는 Jellyfin SearchTerm 스캔 대신 이 인덱스에서 조회
+
+미러 동기화(JELLYFIN_MIRROR_ENABLED)가 켜져 있으면 변경분만 색인하고,
+미러 없이 쓸 때는 아래 실행기로 전체 재색인한다.
+
+실행: python -m src.services.jellyfin_search [--loop]
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime
+from typing import Any
+
+from meilisearch.errors import MeilisearchError
+
+from ..core.config import settings
+from ..schemas.jellyfin import (
+    JellyfinContentListResponse,
+    JellyfinContentResponse,
+    JellyfinLibrary,
+    parse_jellyfin_date,
+)
+from .jellyfin import (
+    CONTENT_FIELDS,
+    CONTENT_ITEM_TYPES,
+    LEAN_ITEM_PARAMS,
+    JellyfinService,
+    jellyfin_service,
+)
+from .search import SearchService, quote_filter_value, search_service
+
+SOURCE = "jellyfin"
+DOCUMENT_PREFIX = "jellyfin-"
+
+
+def item_to_document(
+    item: dict[str, Any], library: JellyfinLibrary, indexed_at: int
+) -> dict[str, Any]:
+    """Jellyfin BaseItemDto → contents 인덱스 문서"""
+    content = JellyfinContentResponse.from_jellyfin_data(item, "", "")
+    created = parse_jellyfin_date(item.get("DateCreated"))
+    return {
+        "id": f"{DOCUMENT_PREFIX}{item['Id']}",
+        "source": SOURCE,
+        "jellyfin_id": item["Id"],
+        "title": content.title,
+        "description": content.description,
+        "thumbnail_url": content.thumbnail_url,
+        "duration_sec": content.duration_sec,
+        "library": library.name,
+        "library_id": library.id,
+        "series_title": item.get("SeriesName") or library.name,
+        "series_name": item.get("SeriesName"),
+        "path": content.path,
+        "year": content.year,
+        "media_type": content.media_type,
+        "image_tag": (item.get("ImageTags") or {}).get("Primary"),
+        "date_created": item.get("DateCreated"),
+        "created_at": int(created.timestamp()) if created else 0,
+        "indexed_at": indexed_at,
+    }
+
+
+def document_to_content(
+    document: dict[str, Any], jellyfin_host: str, api_key: str
+) -> JellyfinContentResponse:
+    """contents 인덱스 문서 → WSOPTV Jellyfin 콘텐츠 응답"""
+    return JellyfinContentResponse.from_jellyfin_data(
+        {
+            "Id": document["jellyfin_id"],
+            "Name": document.get("title"),
+            "Overview": document.get("description"),
+            "RunTimeTicks": (document.get("duration_sec") or 0) * 10_000_000,
+            "ImageTags": {"Primary": document.get("image_tag")},
+            "SeriesName": document.get("series_name"),
+            "Path": document.get("path"),
+            "ProductionYear": document.get("year"),
+            "DateCreated": document.get("date_created"),
+            "Type": document.get("media_type"),
+        },
+        jellyfin_host,
+        api_key,
+    )
+
+
+class JellyfinSearchIndexer:
+    """Jellyfin → MeiliSearch 색인 서비스"""
+
+    def __init__(
+        self,
+        jellyfin: JellyfinService | None = None,
+        search: SearchService | None = None,
+    ):
+        self.jellyfin = jellyfin or jellyfin_service
+        self.search_service = search or search_service
+
+    @property
+    def index(self):
+        return self.search_service.client.index(self.search_service._indexes["contents"])
+
+    # =========================================================================
+    # Indexing
+    # =========================================================================
+
+    async def index_items(
+        self,
+        items: list[dict[str, Any]],
+        library: JellyfinLibrary,
+        indexed_at: int | None = None,
+    ) -> int:
+        """아이템 색인 (upsert). 실패 시 0 (검색 장애가 동기화를 막지 않도록)"""
+        if not items:
+            return 0
+        indexed_at = indexed_at or int(time.time())
+        documents = [item_to_document(item, library, indexed_at) for item in items]
+        try:
+            await asyncio.to_thread(self.index.add_documents, documents, "id")
+        except MeilisearchError:
+            return 0
+        return len(documents)
+
+    async def delete_items(self, item_ids: list[str]) -> int:
+        """삭제된 아이템 문서 제거"""
+        if not item_ids:
+            return 0
+        try:
+            await asyncio.to_thread(
+                self.index.delete_documents, [f"{DOCUMENT_PREFIX}{i}" for i in item_ids]
+            )
+        except MeilisearchError:
+            return 0
+        return len(item_ids)
+
+    async def _delete_where(self, condition: str) -> None:
+        try:
+            await asyncio.to_thread(
+                self.index.delete_documents,
+                filter=f"source = {quote_filter_value(SOURCE)} AND {condition}",
+            )
+        except MeilisearchError:
+            pass
+
+    async def prune_libraries(self, library_ids: list[str]) -> None:
+        """사라진 라이브러리의 문서 제거 (목록이 비면 설정 오류일 수 있으므로 유지)"""
+        if library_ids:
+            await self._delete_where(
+                f"library_id NOT IN [{', '.join(quote_filter_value(i) for i in library_ids)}]"
+            )
+
+    async def reindex(self) -> dict[str, int]:
+        """
+        전체 재색인 (미러 없이 사용할 때)
+
+        모든 라이브러리를 페이지 단위로 색인한 뒤, 이번 실행에서 갱신되지 않은
+        문서(Jellyfin에서 삭제된 아이템)를 제거한다.
+        """
+        started = int(time.time())
+        await self.search_service.create_indexes()
+
+        libraries = await self.jellyfin.get_libraries()
+        stats = {"libraries": len(libraries), "indexed": 0}
+        for library in libraries:
+            params = {
+                "ParentId": library.id,
+                "Recursive": "true",
+                "IncludeItemTypes": ",".join(CONTENT_ITEM_TYPES),
+                "Fields": ",".join(CONTENT_FIELDS),
+                "Limit": settings.JELLYFIN_SYNC_PAGE_SIZE,
+            } | LEAN_ITEM_PARAMS
+
+            start_index = 0
+            while True:
+                data = await self.jellyfin.get_raw_items(params | {"StartIndex": start_index})
+                items = data.get("Items", [])
+                stats["indexed"] += await self.index_items(items, library, started)
+                start_index += len(items)
+                if not items or start_index >= data.get("TotalRecordCount", 0):
+                    break
+
+        if libraries:
+            await self._delete_where(f"indexed_at < {started}")
+        return stats
+
+    # =========================================================================
+    # Search
+    # =========================================================================
+
+    async def search(
+        self,
+        query: str,
+        library: str | None = None,
+        page: int = 1,
+        limit: int = 20,
+    ) -> JellyfinContentListResponse:
+        """
+        인덱스 기반 Jellyfin 콘텐츠 검색 (JellyfinService.search_contents와 같은 형식)
+
+        Raises:
+            MeilisearchError: 인덱스 조회 실패 (호출자가 Jellyfin 검색으로 대체)
+        """
+        conditions = [f"source = {quote_filter_value(SOURCE)}"]
+        if library:
+            conditions.append(f"library = {quote_filter_value(library)}")
+
+        offset = (page - 1) * limit
+        result = await asyncio.to_thread(
+            self.index.search,
+            query,
+            {"filter": " AND ".join(conditions), "offset": offset, "limit": limit},
+        )
+        total = result.get("estimatedTotalHits", 0)
+
+        return JellyfinContentListResponse.model_construct(
+            items=[
+                document_to_content(hit, self.jellyfin.host, self.jellyfin.api_key)
+                for hit in result["hits"]
+            ],
+            total=total,
+            page=page,
+            limit=limit,
+            has_next=offset + limit < total,
+        )
+
+
+async def run_reindex(loop: bool = False):
+    """Jellyfin 검색 인덱스 전체 재색인 실행"""
+    print(f"[JellyfinSearch] Indexing {settings.JELLYFIN_HOST} into {settings.MEILI_HOST} (loop={loop})...")
+    try:
+        while True:
+            started = datetime.now()
+            results = await JellyfinSearchIndexer().reindex()
+            for key, value in results.items():
+                print(f"  {key}: {value}")
+            print(f"[JellyfinSearch] Completed in {(datetime.now() - started).total_seconds():.1f}s")
+
+            if not loop:
+                break
+            await asyncio.sleep(settings.JELLYFIN_SYNC_INTERVAL_SEC)
+    except Exception as e:
+        print(f"[JellyfinSearch] ERROR: {e}")
+        sys.exit(1)
+    finally:
+        await jellyfin_service.close()
+
+
+# Singleton instance
+jellyfin_search_indexer = JellyfinSearchIndexer()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_reindex(loop="--loop" in sys.argv))
@@ -0,0 +1,100 @@
+"""
+Media Probe Service
+
+ffprobe 기반 미디어 메타데이터 조회
+"""
+
+import asyncio
+import json
+from typing import Any
+
+from ..core.config import settings
+
+
+def parse_probe_output(data: dict[str, Any]) -> dict[str, Any]:
+    """ffprobe JSON 출력을 files 테이블 컬럼 형식으로 변환"""
+    fmt = data.get("format", {})
+    video: dict[str, Any] = next(
+        (s for s in data.get("streams", []) if s.get("codec_type") == "video"),
+        {},
+    )
+
+    duration = float(fmt.get("duration") or video.get("duration") or 0)
+
+    fps = None
+    rate = video.get("avg_frame_rate") or video.get("r_frame_rate")
+    if rate and rate != "0/0":
+        num, _, den = rate.partition("/")
+        fps = round(float(num) / float(den or 1), 3)
+
+    bitrate = fmt.get("bit_rate") or video.get("bit_rate")
+
+    return {
+        "duration": duration,
+        "duration_sec": int(round(duration)),
+        "resolution": (
+            f"{video['width']}x{video['height']}"
+            if video.get("width") and video.get("height") else None
+        ),
+        "codec": video.get("codec_name"),
+        "fps": fps,
+        "bitrate_kbps": int(bitrate) // 1000 if bitrate else None,
+        "size_bytes": int(fmt["size"]) if fmt.get("size") else None,
+        # 스트림 복사 호환성 판단용 (files 테이블에는 저장하지 않음)
+        "profile": video.get("profile"),
+        "pix_fmt": video.get("pix_fmt"),
+        "level": video.get("level"),
+        "has_audio": any(
+            s.get("codec_type") == "audio" for s in data.get("streams", [])
+        ),
+    }
+
+
+async def probe_media(path: str, timeout: float | None = None) -> dict[str, Any] | None:
+    """
+    단일 파일 메타데이터 조회
+
+    Returns:
+        duration_sec, resolution, codec, fps, bitrate_kbps 등 (실패 시 None)
+    """
+    process = await asyncio.create_subprocess_exec(
+        "ffprobe",
+        "-v", "error",
+        "-print_format", "json",
+        "-show_format",
+        "-show_streams",
+        path,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(
+            process.communicate(),
+            timeout=timeout or settings.PROBE_TIMEOUT_SEC,
+        )
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return None
+
+    if process.returncode != 0:
+        return None
+
+    try:
+        return parse_probe_output(json.loads(stdout))
+    except (ValueError, KeyError, ZeroDivisionError):
+        return None
+
+
+async def probe_many(
+    paths: list[str],
+    concurrency: int | None = None,
+) -> dict[str, dict[str, Any] | None]:
+    """NAS 부하를 고려해 동시 실행 수를 제한한 일괄 조회"""
+    semaphore = asyncio.Semaphore(concurrency or settings.PROBE_CONCURRENCY)
+
+    async def _probe(path: str) -> tuple[str, dict[str, Any] | None]:
+        async with semaphore:
+            return path, await probe_media(path)
+
+    return dict(await asyncio.gather(*(_probe(p) for p in paths)))
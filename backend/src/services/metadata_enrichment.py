@@ -0,0 +1,166 @@
+"""
+Metadata Enrichment Service
+
+기존 files 행의 ffprobe 메타데이터 일괄 보강
+
+아직 프로브하지 않은(probed_at이 NULL인) 행 중 resolution/codec/bitrate_kbps가
+비어 있거나 duration_sec가 0인 파일을 병렬로 프로브해 일괄 갱신하고,
+DB 길이(files/contents)와 실제 미디어 길이가 다른 항목을 보고한다.
+프로브에 성공한 파일은 필드가 여전히 비어 있어도(오디오 전용 등) probed_at을
+기록해 다음 실행에서 다시 고르지 않는다. 실패한 파일은 다음 실행에서 재시도한다.
+
+실행: python -m src.services.metadata_enrichment [--all]
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..models.content import Content
+from ..models.file import File
+from .media_probe import probe_many
+
+
+class MetadataEnrichmentService:
+    """ffprobe 메타데이터 보강 서비스"""
+
+    def __init__(
+        self,
+        batch_size: int | None = None,
+        tolerance_sec: int | None = None,
+    ):
+        self.batch_size = batch_size or settings.ENRICH_BATCH_SIZE
+        self.tolerance_sec = tolerance_sec or settings.ENRICH_DURATION_TOLERANCE_SEC
+
+    async def _load_targets(self, db: AsyncSession, all_files: bool) -> list[File]:
+        query = select(File).order_by(File.id)
+        if not all_files:
+            query = query.where(
+                File.probed_at.is_(None),
+                or_(
+                    File.resolution.is_(None),
+                    File.codec.is_(None),
+                    File.bitrate_kbps.is_(None),
+                    File.duration_sec == 0,
+                ),
+            )
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+    async def _content_durations(
+        self, db: AsyncSession, file_ids: list[str]
+    ) -> dict[str, list[tuple[int, int]]]:
+        """file_id -> [(content_id, duration_sec)]"""
+        result = await db.execute(
+            select(Content.file_id, Content.id, Content.duration_sec)
+            .where(Content.file_id.in_(file_ids))
+        )
+        durations: dict[str, list[tuple[int, int]]] = {}
+        for file_id, content_id, duration in result.all():
+            durations.setdefault(file_id, []).append((content_id, duration))
+        return durations
+
+    async def enrich(
+        self, db: AsyncSession, all_files: bool = False
+    ) -> dict[str, Any]:
+        """
+        메타데이터 보강 실행
+
+        Args:
+            db: DB 세션
+            all_files: True면 메타데이터가 채워진 파일도 재검증
+
+        Returns:
+            처리 통계 및 길이 불일치 목록
+        """
+        files = await self._load_targets(db, all_files)
+        stats: dict[str, Any] = {"targets": len(files), "updated": 0, "failed": 0}
+        mismatches: list[dict[str, Any]] = []
+
+        for start in range(0, len(files), self.batch_size):
+            batch = files[start:start + self.batch_size]
+            paths = {f.id: settings.convert_nas_path(f.nas_path) for f in batch}
+            probes = await probe_many(list(paths.values()))
+            contents = await self._content_durations(db, [f.id for f in batch])
+            probed_at = datetime.now(timezone.utc)
+
+            rows = []
+            for file in batch:
+                probe = probes.get(paths[file.id])
+                if not probe:
+                    stats["failed"] += 1
+                    continue
+
+                actual = probe["duration_sec"]
+                if file.duration_sec and abs(file.duration_sec - actual) > self.tolerance_sec:
+                    mismatches.append({
+                        "file_id": file.id,
+                        "content_id": None,
+                        "db_duration_sec": file.duration_sec,
+                        "actual_duration_sec": actual,
+                    })
+                for content_id, duration in contents.get(file.id, []):
+                    if abs(duration - actual) > self.tolerance_sec:
+                        mismatches.append({
+                            "file_id": file.id,
+                            "content_id": content_id,
+                            "db_duration_sec": duration,
+                            "actual_duration_sec": actual,
+                        })
+
+                rows.append({
+                    "id": file.id,
+                    "duration_sec": actual or file.duration_sec,
+                    "resolution": probe["resolution"] or file.resolution,
+                    "codec": probe["codec"] or file.codec,
+                    "fps": probe["fps"] or file.fps,
+                    "bitrate_kbps": probe["bitrate_kbps"] or file.bitrate_kbps,
+                    "probed_at": probed_at,
+                })
+
+            # 배치 단위 bulk UPDATE (primary key 기준)
+            if rows:
+                await db.execute(update(File), rows)
+                await db.commit()
+                stats["updated"] += len(rows)
+
+        stats["mismatches"] = mismatches
+        return stats
+
+
+async def run_enrichment(all_files: bool = False):
+    """메타데이터 보강 실행"""
+    from ..core.database import async_session_maker, engine, init_db
+
+    print(f"[Enrich] Probing files (all={all_files})...")
+    try:
+        await init_db()
+        async with async_session_maker() as session:
+            results = await MetadataEnrichmentService().enrich(session, all_files=all_files)
+
+        mismatches = results.pop("mismatches")
+        for key, value in results.items():
+            print(f"  {key}: {value}")
+
+        print(f"[Enrich] Duration mismatches: {len(mismatches)}")
+        for m in mismatches:
+            target = f"content {m['content_id']}" if m["content_id"] else "file"
+            print(
+                f"  {m['file_id']} ({target}): "
+                f"db={m['db_duration_sec']}s actual={m['actual_duration_sec']}s"
+            )
+        print("[Enrich] Completed successfully!")
+    except Exception as e:
+        print(f"[Enrich] ERROR: {e}")
+        sys.exit(1)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_enrichment(all_files="--all" in sys.argv))
@@ -0,0 +1,107 @@
+"""
+Mezzanine Proxy Service
+
+저해상도 중간 파일(프록시) 생성 및 관리
+
+360p/480p 세그먼트와 썸네일성 작업은 원본 고해상도 NAS 파일 대신
+로컬에 만든 키프레임 밀집 저해상도 프록시를 디코딩해 CPU와
+NAS 읽기 대역폭을 줄인다.
+"""
+
+import asyncio
+from pathlib import Path
+
+from ..core.config import settings
+from .admission import admission_controller
+from .transcode_queue import make_tmp_path, transcode_queue
+
+
+class MezzanineService:
+    """저해상도 프록시 서비스"""
+
+    def __init__(self):
+        self.proxy_path = Path(settings.MEZZANINE_PATH)
+        self._semaphore = asyncio.Semaphore(settings.MEZZANINE_CONCURRENCY)
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return settings.MEZZANINE_ENABLED
+
+    def get_proxy_path(self, file_id: str) -> Path:
+        """파일별 프록시 경로"""
+        return self.proxy_path / f"{file_id}_{settings.MEZZANINE_HEIGHT}p.mp4"
+
+    def get_source(self, file_id: str | None, nas_path: str, quality: str) -> str:
+        """
+        트랜스코딩 입력 경로 결정
+
+        프록시 대상 품질이면 준비된 프록시를, 아직 없으면 원본을 반환하고
+        프록시 생성을 백그라운드로 예약한다.
+        """
+        if not self.enabled or not file_id or quality not in settings.MEZZANINE_QUALITIES:
+            return nas_path
+
+        proxy = self.get_proxy_path(file_id)
+        if proxy.exists():
+            return str(proxy)
+
+        self.schedule(file_id, nas_path)
+        return nas_path
+
+    def schedule(self, file_id: str, nas_path: str) -> None:
+        """프록시 생성 예약 (파일당 한 번)"""
+        if file_id in self._tasks:
+            return
+
+        task = asyncio.create_task(self.create_proxy(file_id, nas_path))
+        self._tasks[file_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(file_id, None))
+
+    def build_proxy_command(self, nas_path: str, output_path: Path) -> list[str]:
+        """프록시 인코딩용 FFmpeg 명령 생성"""
+        interval = settings.MEZZANINE_KEYFRAME_INTERVAL
+        return [
+            "ffmpeg",
+            "-i", nas_path,
+            "-vf", f"scale=-2:{settings.MEZZANINE_HEIGHT}",
+            "-c:v", "libx264",
+            "-preset", "veryfast",
+            "-crf", "18",
+            "-force_key_frames", f"expr:gte(t,n_forced*{interval})",
+            "-c:a", "aac",
+            "-b:a", "128k",
+            "-movflags", "+faststart",
+            "-f", "mp4",
+            "-y",
+            str(output_path),
+        ]
+
+    async def create_proxy(self, file_id: str, nas_path: str) -> Path | None:
+        """프록시 생성 (임시 파일에 인코딩 후 원자적 교체)"""
+        output_path = self.get_proxy_path(file_id)
+        if output_path.exists():
+            return output_path
+
+        tmp_path = make_tmp_path(output_path)
+
+        async with self._semaphore:
+            # 시청자 트랜스코딩이 밀려 있으면 프록시 생성을 미룸
+            await admission_controller.wait_until_normal()
+
+            created = await transcode_queue.run(
+                "proxy",
+                self.build_proxy_command(nas_path, tmp_path),
+                tmp_path,
+                output_path,
+            )
+
+        return output_path if created else None
+
+    async def clear(self, file_id: str) -> None:
+        """프록시 삭제"""
+        self.get_proxy_path(file_id).unlink(missing_ok=True)
+
+
+# Singleton instance
+mezzanine_service = MezzanineService()
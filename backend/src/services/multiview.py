@@ -0,0 +1,208 @@
+"""
+Multiview Service
+
+여러 테이블을 하나의 모자이크 렌디션으로 합성
+
+클라이언트가 콘텐츠 4개의 HLS 래더를 각각 받아 디코딩하는 대신,
+서버에서 ffmpeg xstack으로 최대 4개 타일을 합성한 단일 스트림을
+세그먼트 단위로 만들어 일반 세그먼트처럼 캐시한다.
+오디오는 선택한 타일 하나만 포함한다.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import AsyncGenerator, Sequence
+
+from ..core.config import settings
+from .admission import admission_controller
+from .mezzanine import mezzanine_service
+from .source_cache import source_cache_service
+from .streaming import AUDIO_SETTINGS, streaming_service
+from .transcode_queue import make_tmp_path, transcode_queue
+
+# 모자이크 타일 입력은 저해상도면 충분하므로 프록시 대상 품질로 취급
+TILE_SOURCE_QUALITY = "480p"
+
+
+class MultiviewService:
+    """멀티뷰 모자이크 서비스"""
+
+    def __init__(self):
+        self.segment_duration = settings.HLS_SEGMENT_DURATION
+
+    @property
+    def cache_path(self) -> Path:
+        return streaming_service.cache_path / "multiview"
+
+    def get_tile_size(self) -> tuple[int, int]:
+        width, _, height = settings.MULTIVIEW_TILE_SIZE.partition("x")
+        return int(width), int(height)
+
+    def get_layout(self, count: int) -> tuple[list[str], tuple[int, int]]:
+        """
+        xstack 타일 배치 및 출력 크기
+
+        2개는 가로 1x2, 3~4개는 2x2 격자 (빈 칸은 검은 타일)
+        """
+        width, height = self.get_tile_size()
+        if count == 1:
+            return ["0_0"], (width, height)
+        if count == 2:
+            return ["0_0", f"{width}_0"], (width * 2, height)
+        return (
+            ["0_0", f"{width}_0", f"0_{height}", f"{width}_{height}"],
+            (width * 2, height * 2),
+        )
+
+    def get_key(self, file_ids: Sequence[str], audio_index: int) -> str:
+        """
+        모자이크 캐시 키
+
+        타일 순서, 오디오 선택, 인코딩 파라미터가 같으면 같은 캐시를 공유한다.
+        """
+        params = "|".join([
+            ",".join(file_ids),
+            str(audio_index),
+            settings.MULTIVIEW_TILE_SIZE,
+            settings.MULTIVIEW_VIDEO_SETTINGS,
+            AUDIO_SETTINGS,
+            str(self.segment_duration),
+        ])
+        return hashlib.sha1(params.encode()).hexdigest()[:16]
+
+    def get_segment_path(self, key: str, segment_index: int) -> Path:
+        """모자이크 세그먼트 경로"""
+        return self.cache_path / key / f"segment_{segment_index:05d}.ts"
+
+    def segment_count(self, duration_sec: int) -> int:
+        """매니페스트의 세그먼트 수"""
+        return (duration_sec + self.segment_duration - 1) // self.segment_duration
+
+    def generate_manifest(self, duration_sec: int, query: str) -> str:
+        """
+        모자이크 HLS 매니페스트 생성
+
+        세그먼트 URI에 타일/오디오 쿼리를 그대로 붙여 같은 모자이크를 가리키게 한다.
+        """
+        num_segments = self.segment_count(duration_sec)
+
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            f"#EXT-X-TARGETDURATION:{self.segment_duration}",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+            "#EXT-X-PLAYLIST-TYPE:VOD",
+        ]
+
+        for i in range(num_segments):
+            if i == num_segments - 1:
+                seg_duration = duration_sec - (i * self.segment_duration)
+            else:
+                seg_duration = self.segment_duration
+
+            lines.extend([
+                f"#EXTINF:{seg_duration:.3f},",
+                f"segment_{i:05d}.ts?{query}",
+            ])
+
+        lines.append("#EXT-X-ENDLIST")
+
+        return "\n".join(lines)
+
+    def build_command(
+        self,
+        sources: Sequence[str],
+        segment_index: int,
+        audio_index: int,
+        output_path: Path,
+    ) -> list[str]:
+        """모자이크 세그먼트 인코딩용 FFmpeg 명령 생성"""
+        start_time = segment_index * self.segment_duration
+        width, height = self.get_tile_size()
+        layout, _ = self.get_layout(len(sources))
+
+        cmd = ["ffmpeg"]
+        for source in sources:
+            cmd.extend([
+                "-ss", str(start_time),
+                "-t", str(self.segment_duration),
+                "-i", source,
+            ])
+
+        filters = [
+            f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps=30[v{i}]"
+            for i in range(len(sources))
+        ]
+        tiles = [f"[v{i}]" for i in range(len(sources))]
+
+        if len(layout) > len(sources):
+            filters.append(
+                f"color=c=black:s={width}x{height}:r=30:d={self.segment_duration}[blank]"
+            )
+            tiles.append("[blank]")
+
+        if len(tiles) == 1:
+            filters.append("[v0]null[out]")
+        else:
+            filters.append(
+                f"{''.join(tiles)}xstack=inputs={len(tiles)}:layout={'|'.join(layout)}[out]"
+            )
+
+        return [
+            *cmd,
+            "-filter_complex", ";".join(filters),
+            "-map", "[out]",
+            "-map", f"{audio_index}:a:0?",
+            "-c:v", "libx264",
+            "-preset", admission_controller.choose_preset(settings.HLS_SEGMENT_PRESET),
+            *settings.MULTIVIEW_VIDEO_SETTINGS.split(),
+            *AUDIO_SETTINGS.split(),
+            "-output_ts_offset", str(start_time),
+            "-f", "mpegts",
+            "-y",
+            str(output_path),
+        ]
+
+    async def get_segment(
+        self,
+        tiles: Sequence[tuple[str, str]],
+        segment_index: int,
+        audio_index: int = 0,
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        모자이크 세그먼트 스트리밍
+
+        Args:
+            tiles: (file_id, NAS 경로) 목록 (화면 배치 순서)
+            segment_index: 세그먼트 인덱스
+            audio_index: 오디오를 사용할 타일 인덱스
+
+        Yields:
+            세그먼트 바이트 청크
+        """
+        key = self.get_key([file_id for file_id, _ in tiles], audio_index)
+        segment_path = self.get_segment_path(key, segment_index)
+
+        if not segment_path.exists():
+            segment_path.parent.mkdir(parents=True, exist_ok=True)
+            sources = [
+                await source_cache_service.resolve(
+                    mezzanine_service.get_source(file_id, nas_path, TILE_SOURCE_QUALITY)
+                )
+                for file_id, nas_path in tiles
+            ]
+
+            async with admission_controller.slot():
+                if not segment_path.exists():
+                    tmp_path = make_tmp_path(segment_path)
+                    cmd = self.build_command(sources, segment_index, audio_index, tmp_path)
+                    await transcode_queue.run("multiview", cmd, tmp_path, segment_path)
+
+        if segment_path.exists():
+            async for chunk in streaming_service._read_file_chunks(segment_path):
+                yield chunk
+
+
+# Singleton instance
+multiview_service = MultiviewService()
@@ -0,0 +1,258 @@
+"""
+NAS Scanner Service
+
+NAS 증분 스캔 및 신규 미디어 등록
+
+NAS_MOUNT_PATH를 병렬로 순회하며 디렉터리 mtime과 파일 크기/mtime을
+상태 파일에 기억한다. mtime이 바뀌지 않은 디렉터리는 목록을 다시 읽지
+않고, 새로 생기거나 바뀐 파일만 files 테이블에 등록한 뒤 ffprobe로
+메타데이터를 채운다.
+
+파일에 쓰는 중에는 디렉터리 mtime이 바뀌지 않으므로, mtime이
+NAS_SCAN_SETTLE_SEC 이내인(복사/녹화 중일 수 있는) 파일은 pending으로
+기억해 두고 디렉터리가 그대로여도 매 스캔마다 다시 stat한다.
+크기/mtime이 바뀌었으면 다시 등록(재-probe)한다.
+
+실행: python -m src.services.nas_scanner
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..models.file import File
+from .media_probe import probe_many
+
+MEDIA_EXTENSIONS = {".mp4", ".mov", ".mkv", ".mxf", ".ts", ".m2ts", ".avi"}
+
+
+class NasScanner:
+    """NAS 증분 스캐너"""
+
+    def __init__(
+        self,
+        root: str | None = None,
+        state_path: str | None = None,
+        concurrency: int | None = None,
+    ):
+        self.root = root or settings.NAS_MOUNT_PATH
+        self.state_path = Path(state_path or settings.NAS_SCAN_STATE_PATH)
+        self._semaphore = asyncio.Semaphore(concurrency or settings.NAS_SCAN_CONCURRENCY)
+        self.settle_sec = settings.NAS_SCAN_SETTLE_SEC
+        # dir path -> {"mtime": float, "subdirs": [...], "files": {name: [size, mtime]},
+        #              "pending": [아직 쓰는 중일 수 있는 파일 이름]}
+        self.state: dict[str, dict[str, Any]] = {}
+
+    # =========================================================================
+    # State
+    # =========================================================================
+
+    def load_state(self) -> None:
+        if self.state_path.exists():
+            self.state = json.loads(self.state_path.read_text()).get("dirs", {})
+
+    def save_state(self) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"dirs": self.state}))
+        os.replace(tmp_path, self.state_path)
+
+    # =========================================================================
+    # Walk
+    # =========================================================================
+
+    @staticmethod
+    def _list_dir(path: str) -> tuple[list[str], dict[str, list[float]]]:
+        """하위 디렉터리와 미디어 파일(크기, mtime) 목록"""
+        subdirs: list[str] = []
+        files: dict[str, list[float]] = {}
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif Path(entry.name).suffix.lower() in MEDIA_EXTENSIONS:
+                    st = entry.stat()
+                    files[entry.name] = [st.st_size, st.st_mtime]
+        return subdirs, files
+
+    def _unsettled(self, files: dict[str, list[float]]) -> list[str]:
+        """mtime이 settle 창 이내인 파일"""
+        now = time.time()
+        return [name for name, (_, mtime) in files.items() if now - mtime < self.settle_sec]
+
+    def _recheck_pending(self, path: str, cached: dict[str, Any]) -> list[str]:
+        """pending 파일 재확인 → 크기/mtime이 바뀐 파일 이름 (state 갱신)"""
+        files = cached["files"]
+        modified = []
+        for name in cached.get("pending", []):
+            try:
+                st = os.stat(os.path.join(path, name))
+            except OSError:
+                continue
+            meta = [st.st_size, st.st_mtime]
+            if files.get(name) != meta:
+                files[name] = meta
+                modified.append(name)
+        cached["pending"] = self._unsettled(
+            {name: files[name] for name in cached.get("pending", []) if name in files}
+        )
+        return modified
+
+    async def _scan_dir(self, path: str, changed: list[str], stats: dict[str, int]) -> None:
+        async with self._semaphore:
+            try:
+                mtime = (await asyncio.to_thread(os.stat, path)).st_mtime
+            except OSError:
+                self.state.pop(path, None)
+                return
+
+            cached = self.state.get(path)
+            if cached and cached["mtime"] == mtime:
+                # 디렉터리 항목이 바뀌지 않음 → 목록 재조회 생략
+                subdirs = cached["subdirs"]
+                stats["dirs_skipped"] += 1
+                if cached.get("pending"):
+                    modified = await asyncio.to_thread(self._recheck_pending, path, cached)
+                    changed.extend(os.path.join(path, name) for name in modified)
+            else:
+                try:
+                    subdirs, files = await asyncio.to_thread(self._list_dir, path)
+                except OSError:
+                    return
+
+                old_files = cached["files"] if cached else {}
+                for name, meta in files.items():
+                    if old_files.get(name) != meta:
+                        changed.append(os.path.join(path, name))
+
+                self.state[path] = {
+                    "mtime": mtime,
+                    "subdirs": subdirs,
+                    "files": files,
+                    "pending": self._unsettled(files),
+                }
+                stats["dirs_listed"] += 1
+
+        await asyncio.gather(*(
+            self._scan_dir(os.path.join(path, name), changed, stats)
+            for name in subdirs
+        ))
+
+    async def find_changed(self) -> tuple[list[str], dict[str, int]]:
+        """신규/변경 미디어 파일 경로 목록"""
+        changed: list[str] = []
+        stats = {"dirs_listed": 0, "dirs_skipped": 0}
+        await self._scan_dir(self.root, changed, stats)
+        return changed, stats
+
+    # =========================================================================
+    # Register
+    # =========================================================================
+
+    async def register(self, db: AsyncSession, paths: list[str]) -> int:
+        """files 테이블 등록 및 ffprobe 메타데이터 반영"""
+        if not paths:
+            return 0
+
+        probes = await probe_many(paths)
+        probed_at = datetime.now(timezone.utc)
+
+        rows = []
+        for path in paths:
+            db_path = settings.to_db_nas_path(path)
+            probe = probes.get(path) or {}
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+
+            rows.append({
+                "id": hashlib.md5(db_path.encode()).hexdigest()[:16],
+                "nas_path": db_path,
+                "filename": Path(path).name,
+                "size_bytes": size,
+                # probe 실패 시 NULL → 기존 값 유지 (신규 행은 0)
+                "duration_sec": probe.get("duration_sec"),
+                "resolution": probe.get("resolution"),
+                "codec": probe.get("codec"),
+                "fps": probe.get("fps"),
+                "bitrate_kbps": probe.get("bitrate_kbps"),
+                "probed_at": probed_at if probe else None,
+            })
+
+        if rows:
+            await db.execute(
+                text("""
+                    INSERT INTO files (id, nas_path, filename, size_bytes, duration_sec,
+                                       resolution, codec, fps, bitrate_kbps, probed_at)
+                    VALUES (:id, :nas_path, :filename, :size_bytes, COALESCE(:duration_sec, 0),
+                            :resolution, :codec, :fps, :bitrate_kbps, :probed_at)
+                    ON CONFLICT (nas_path) DO UPDATE SET
+                        size_bytes = EXCLUDED.size_bytes,
+                        duration_sec = COALESCE(:duration_sec, files.duration_sec),
+                        resolution = COALESCE(EXCLUDED.resolution, files.resolution),
+                        codec = COALESCE(EXCLUDED.codec, files.codec),
+                        fps = COALESCE(EXCLUDED.fps, files.fps),
+                        bitrate_kbps = COALESCE(EXCLUDED.bitrate_kbps, files.bitrate_kbps),
+                        probed_at = EXCLUDED.probed_at,
+                        content_hash = NULL,
+                        duplicate_of = NULL
+                """),
+                rows,
+            )
+            # 바뀐 파일을 대표로 가리키던 중복도 해제 (다음 중복 탐지에서 다시 묶음)
+            await db.execute(
+                update(File)
+                .where(File.duplicate_of.in_([row["id"] for row in rows]))
+                .values(duplicate_of=None)
+            )
+            await db.commit()
+
+        return len(rows)
+
+    async def scan(self, db: AsyncSession) -> dict[str, int]:
+        """증분 스캔 실행"""
+        started = time.monotonic()
+        self.load_state()
+
+        changed, stats = await self.find_changed()
+        stats["changed_files"] = len(changed)
+        stats["registered"] = await self.register(db, changed)
+
+        self.save_state()
+        stats["elapsed_ms"] = int((time.monotonic() - started) * 1000)
+        return stats
+
+
+async def run_scan():
+    """NAS 스캔 실행"""
+    from ..core.database import async_session_maker, engine, init_db
+
+    print(f"[Scanner] Scanning {settings.NAS_MOUNT_PATH}...")
+    try:
+        await init_db()
+        async with async_session_maker() as session:
+            results = await NasScanner().scan(session)
+
+        for key, value in results.items():
+            print(f"  {key}: {value}")
+        print("[Scanner] Completed successfully!")
+    except Exception as e:
+        print(f"[Scanner] ERROR: {e}")
+        sys.exit(1)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_scan())
@@ -0,0 +1,205 @@
+"""
+Response Cache
+
+TTL + stale-while-revalidate 응답 캐시 (프로세스 메모리 + Redis 2단계)
+
+- fresh: TTL 이내면 그대로 반환
+- stale: TTL이 지났지만 stale 허용 구간이면 이전 값을 즉시 반환하고
+  백그라운드에서 한 번만 갱신
+- miss: 원본 조회 후 두 계층에 저장
+
+프로세스 계층에는 파싱된 객체를, Redis 계층에는 원본 JSON을 저장해
+같은 프로세스에서는 파싱 비용도 다시 들지 않는다.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, TypeVar
+
+from redis.exceptions import RedisError
+
+from ..core import jsonlib
+from ..core.redis import get_redis
+
+T = TypeVar("T")
+
+
+class CacheEntry:
+    """캐시 항목 (원본 데이터 + 파싱된 값)"""
+
+    __slots__ = ("data", "value", "fetched_at")
+
+    def __init__(self, data: Any, value: Any, fetched_at: float):
+        self.data = data
+        self.value = value
+        self.fetched_at = fetched_at
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class ResponseCache:
+    """2단계 stale-while-revalidate 캐시"""
+
+    def __init__(
+        self,
+        namespace: str,
+        stale_sec: int,
+        max_entries: int = 1000,
+        use_redis: bool = True,
+    ):
+        self.namespace = namespace
+        self.stale_sec = stale_sec
+        self.max_entries = max_entries
+        self.use_redis = use_redis
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    # =========================================================================
+    # Tiers
+    # =========================================================================
+
+    def _get_local(self, key: str) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _set_local(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def peek(self, key: str) -> CacheEntry | None:
+        """신선도와 무관하게 프로세스 계층 값 조회 (원본 장애 시 fallback용)"""
+        return self._entries.get(key)
+
+    async def _get_shared(self, key: str) -> tuple[Any, float] | None:
+        if not self.use_redis:
+            return None
+        try:
+            raw = await get_redis().get(self._redis_key(key))
+        except RedisError:
+            return None
+        if raw is None:
+            return None
+        payload = jsonlib.loads(raw)
+        return payload["data"], payload["fetched_at"]
+
+    async def _set_shared(self, key: str, data: Any, fetched_at: float, ttl: int) -> None:
+        if not self.use_redis:
+            return
+        try:
+            await get_redis().set(
+                self._redis_key(key),
+                jsonlib.dumps({"data": data, "fetched_at": fetched_at}),
+                ex=ttl + self.stale_sec,
+            )
+        except RedisError:
+            pass  # 공유 계층 장애 시 프로세스 캐시만 사용
+
+    # =========================================================================
+    # Lookup
+    # =========================================================================
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        ttl: int,
+        fetch: Callable[[], Awaitable[Any]],
+        parse: Callable[[Any], T],
+    ) -> T:
+        """
+        캐시 조회 (없거나 만료 시 원본 조회)
+
+        Args:
+            key: 캐시 키
+            ttl: 신선도 유지 시간 (초)
+            fetch: 원본 JSON 조회 함수
+            parse: JSON → 반환 객체 변환 함수
+        """
+        entry = self._get_local(key)
+
+        if entry is None:
+            shared = await self._get_shared(key)
+            if shared is not None:
+                data, fetched_at = shared
+                entry = CacheEntry(data, parse(data), fetched_at)
+                self._set_local(key, entry)
+
+        if entry is not None:
+            age = entry.age()
+            if age < ttl:
+                self.hits += 1
+                return entry.value
+            if age < ttl + self.stale_sec:
+                self.stale_hits += 1
+                self._schedule_refresh(key, ttl, fetch, parse)
+                return entry.value
+
+        self.misses += 1
+        return await self._refresh(key, ttl, fetch, parse)
+
+    async def _refresh(
+        self,
+        key: str,
+        ttl: int,
+        fetch: Callable[[], Awaitable[Any]],
+        parse: Callable[[Any], T],
+    ) -> T:
+        data = await fetch()
+        value = parse(data)
+        fetched_at = time.time()
+        self._set_local(key, CacheEntry(data, value, fetched_at))
+        await self._set_shared(key, data, fetched_at, ttl)
+        return value
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        ttl: int,
+        fetch: Callable[[], Awaitable[Any]],
+        parse: Callable[[Any], Any],
+    ) -> None:
+        """백그라운드 갱신 (키당 한 번)"""
+        if key in self._refreshing:
+            return
+
+        async def _run():
+            try:
+                await self._refresh(key, ttl, fetch, parse)
+            except Exception:
+                pass  # 갱신 실패 시 stale 값 유지
+
+        task = asyncio.create_task(_run())
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def invalidate(self) -> None:
+        """전체 캐시 삭제"""
+        self._entries.clear()
+        if not self.use_redis:
+            return
+        try:
+            redis = get_redis()
+            async for redis_key in redis.scan_iter(match=f"{self.namespace}:*"):
+                await redis.delete(redis_key)
+        except RedisError:
+            pass
+
+    def stats(self) -> dict[str, int]:
+        """캐시 지표"""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
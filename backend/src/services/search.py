@@ -4,6 +4,7 @@ Search Service
 MeiliSearch 통합 검색 서비스
 """
 
+import asyncio
 from typing import Any
 
 import meilisearch
@@ -12,6 +13,11 @@ from meilisearch.errors import MeilisearchError
 from ..core.config import settings
 
 
+def quote_filter_value(value: str) -> str:
+    """MeiliSearch 필터 문자열 값 (따옴표, 역슬래시 이스케이프)"""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
 class SearchService:
     """MeiliSearch 검색 서비스"""
 
@@ -53,7 +59,7 @@ class SearchService:
             index = self.client.index(self._indexes[index_name])
 
             # Build filter string
-            filter_str = self._build_filter(filters) if filters else None
+            filter_str = self._build_filter(filters or {})
 
             # Build sort
             sort_list = self._build_sort(sort)
@@ -148,17 +154,30 @@ class SearchService:
         conditions = []
 
         if filters.get("catalog_id"):
-            conditions.append(f'catalog_id = "{filters["catalog_id"]}"')
+            conditions.append(f"catalog_id = {quote_filter_value(filters['catalog_id'])}")
 
         if filters.get("player_id"):
             conditions.append(f"player_ids = {filters['player_id']}")
 
         if filters.get("hand_grade"):
-            conditions.append(f'grade = "{filters["hand_grade"]}"')
+            conditions.append(f"grade = {quote_filter_value(filters['hand_grade'])}")
 
         if filters.get("year"):
             conditions.append(f"year = {filters['year']}")
 
+        # source는 Jellyfin 색인 시에만 기본 적용 (색인 전에는 필터 속성이 없을 수 있음)
+        # 네이티브 문서는 source가 없을 수 있으므로 "jellyfin"이 아닌 것으로 구분
+        source = filters.get("source")
+        if source is None and settings.JELLYFIN_SEARCH_INDEX_ENABLED:
+            source = "native"
+        if source == "native":
+            conditions.append('source != "jellyfin"')
+        elif source == "jellyfin":
+            conditions.append('source = "jellyfin"')
+
+        if filters.get("library"):
+            conditions.append(f"library = {quote_filter_value(filters['library'])}")
+
         return " AND ".join(conditions) if conditions else None
 
     def _build_sort(self, sort: str) -> list[str] | None:
@@ -187,55 +206,71 @@ class SearchService:
             pass
 
     async def create_indexes(self) -> None:
-        """인덱스 생성 및 설정"""
+        """인덱스 생성 및 설정 (앱 시작 시 적용)"""
         try:
-            # Contents index
-            contents_index = self.client.index(self._indexes["contents"])
-            contents_index.update_settings({
-                "searchableAttributes": [
-                    "title",
-                    "description",
-                    "player_names",
-                ],
-                "filterableAttributes": [
-                    "catalog_id",
-                    "player_ids",
-                    "grade",
-                    "year",
-                ],
-                "sortableAttributes": [
-                    "created_at",
-                    "view_count",
-                ],
-                "displayedAttributes": [
-                    "id",
-                    "title",
-                    "description",
-                    "thumbnail_url",
-                    "duration_sec",
-                    "view_count",
-                    "catalog_id",
-                    "series_title",
-                    "hands_count",
-                ],
-            })
-
-            # Players index
-            players_index = self.client.index(self._indexes["players"])
-            players_index.update_settings({
-                "searchableAttributes": [
-                    "name",
-                    "display_name",
-                ],
-                "sortableAttributes": [
-                    "total_hands",
-                    "total_wins",
-                ],
-            })
-
+            await asyncio.to_thread(self._apply_index_settings)
         except MeilisearchError:
             pass
 
+    def _apply_index_settings(self) -> None:
+        # Contents index
+        contents_index = self.client.index(self._indexes["contents"])
+        contents_index.update_settings({
+            "searchableAttributes": [
+                "title",
+                "description",
+                "player_names",
+            ],
+            "filterableAttributes": [
+                "catalog_id",
+                "player_ids",
+                "grade",
+                "year",
+                "source",
+                "library",
+                "library_id",
+                "indexed_at",
+            ],
+            "sortableAttributes": [
+                "created_at",
+                "view_count",
+            ],
+            "displayedAttributes": [
+                "id",
+                "title",
+                "description",
+                "thumbnail_url",
+                "duration_sec",
+                "view_count",
+                "catalog_id",
+                "series_title",
+                "hands_count",
+                # Jellyfin 문서
+                "source",
+                "jellyfin_id",
+                "library",
+                "series_name",
+                "path",
+                "year",
+                "media_type",
+                "image_tag",
+                "date_created",
+            ],
+        })
+
+        # Players index
+        players_index = self.client.index(self._indexes["players"])
+        players_index.update_settings({
+            "searchableAttributes": [
+                "name",
+                "display_name",
+            ],
+            "sortableAttributes": [
+                "total_hands",
+                "total_wins",
+            ],
+        })
+
 
 # Singleton instance
 search_service = SearchService()
@@ -0,0 +1,252 @@
+"""
+Source Cache Service
+
+NAS 원본 미디어 로컬 SSD 스테이징 캐시
+
+자주 재생되는(hot) 원본 파일을 로컬 디스크로 복사해 두고
+이후 인코딩은 로컬 사본을 읽는다. 용량 한도를 넘으면 가장 오래
+사용하지 않은 사본부터 제거한다.
+
+hot 판정은 세그먼트 요청이 아니라 재생 시작(마스터 매니페스트) 기준으로,
+시간 창 안의 서로 다른 시청자 수를 센다. 한 시청자의 연속 세그먼트
+요청만으로 전체 파일 복사가 시작되지 않도록 하기 위함이다.
+
+NAS/디스크 stat은 모두 스레드에서 수행하고, 사본 유효성(원본 크기 비교)은
+SOURCE_CACHE_FRESH_TTL_SEC 동안 재사용해 느린 NAS가 이벤트 루프를 막지 않게 한다.
+"""
+
+import asyncio
+import hashlib
+import os
+import shutil
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+from ..core.config import settings
+
+
+class SourceCacheService:
+    """NAS 원본 read-through 캐시"""
+
+    def __init__(self):
+        self.cache_path = Path(settings.SOURCE_CACHE_PATH)
+        self.max_bytes = settings.SOURCE_CACHE_MAX_BYTES
+        self.hot_threshold = settings.SOURCE_CACHE_HOT_THRESHOLD
+        self.hot_window_sec = settings.SOURCE_CACHE_HOT_WINDOW_SEC
+        self.max_tracked = settings.SOURCE_CACHE_MAX_TRACKED
+        self.chunk_size = settings.SOURCE_CACHE_CHUNK_SIZE
+        self.fresh_ttl_sec = settings.SOURCE_CACHE_FRESH_TTL_SEC
+
+        # local path -> size (LRU 순서)
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        # local path -> 마지막 유효성 확인 시각
+        self._verified_at: dict[str, float] = {}
+        # nas path -> {viewer: 마지막 재생 시작 시각} (LRU 순서, 최대 max_tracked)
+        self._playbacks: OrderedDict[str, dict[str, float]] = OrderedDict()
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._semaphore = asyncio.Semaphore(settings.SOURCE_CACHE_CONCURRENCY)
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_staged = 0
+        self.staging_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.SOURCE_CACHE_ENABLED
+
+    @property
+    def bytes_used(self) -> int:
+        return sum(self._entries.values())
+
+    def get_local_path(self, nas_path: str) -> Path:
+        """원본 경로별 로컬 사본 경로"""
+        digest = hashlib.sha1(nas_path.encode()).hexdigest()
+        return self.cache_path / digest[:2] / f"{digest}{Path(nas_path).suffix}"
+
+    def _scan_index(self) -> list[tuple[str, int]]:
+        """기존 사본 (접근 시각 순)"""
+        if not self.cache_path.exists():
+            return []
+
+        files = [p for p in self.cache_path.glob("*/*") if not p.name.startswith(".")]
+        stats = [(p, p.stat()) for p in files]
+        stats.sort(key=lambda item: item[1].st_atime)
+        return [(str(p), st.st_size) for p, st in stats]
+
+    async def _ensure_loaded(self) -> None:
+        """기존 사본을 LRU에 등록 (최초 한 번, 스레드에서 디렉터리 스캔)"""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            for key, size in await asyncio.to_thread(self._scan_index):
+                self._entries.setdefault(key, size)
+            self._loaded = True
+
+    async def resolve(self, nas_path: str) -> str:
+        """
+        트랜스코딩 입력 경로 결정
+
+        로컬 사본이 있으면 사본을, 없으면 원본을 반환한다.
+        스테이징 여부는 record_playback이 결정한다.
+        """
+        if not self.enabled or not nas_path.startswith(settings.NAS_MOUNT_PATH):
+            return nas_path
+
+        await self._ensure_loaded()
+
+        local_path = self.get_local_path(nas_path)
+        key = str(local_path)
+        if key in self._entries and await self._is_fresh(nas_path, local_path):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return key
+
+        self.misses += 1
+        return nas_path
+
+    async def record_playback(self, nas_path: str, viewer: str) -> None:
+        """
+        재생 시작 기록
+
+        hot_window_sec 안에 서로 다른 시청자가 hot_threshold명 이상이면
+        백그라운드로 스테이징한다.
+        """
+        if not self.enabled or not nas_path.startswith(settings.NAS_MOUNT_PATH):
+            return
+
+        await self._ensure_loaded()
+        if str(self.get_local_path(nas_path)) in self._entries:
+            return
+
+        now = time.monotonic()
+        viewers = self._playbacks.pop(nas_path, {})
+        viewers = {v: t for v, t in viewers.items() if now - t < self.hot_window_sec}
+        viewers[viewer] = now
+        self._playbacks[nas_path] = viewers
+        while len(self._playbacks) > self.max_tracked:
+            self._playbacks.popitem(last=False)
+
+        if len(viewers) >= self.hot_threshold:
+            self.schedule(nas_path)
+
+    @staticmethod
+    def _same_size(nas_path: str, local_path: Path) -> bool:
+        try:
+            return os.stat(nas_path).st_size == local_path.stat().st_size
+        except OSError:
+            return False
+
+    async def _is_fresh(self, nas_path: str, local_path: Path) -> bool:
+        """원본이 바뀌었으면(크기 변경) 사본 폐기 (확인 결과는 fresh_ttl_sec 동안 재사용)"""
+        key = str(local_path)
+        now = time.monotonic()
+        if now - self._verified_at.get(key, float("-inf")) < self.fresh_ttl_sec:
+            return True
+
+        if await asyncio.to_thread(self._same_size, nas_path, local_path):
+            self._verified_at[key] = now
+            return True
+        self._evict(key)
+        return False
+
+    def schedule(self, nas_path: str) -> None:
+        """스테이징 예약 (원본당 한 번)"""
+        if nas_path in self._tasks:
+            return
+
+        task = asyncio.create_task(self.stage(nas_path))
+        self._tasks[nas_path] = task
+        task.add_done_callback(lambda _: self._tasks.pop(nas_path, None))
+
+    async def stage(self, nas_path: str) -> Path | None:
+        """원본을 로컬로 복사"""
+        async with self._semaphore:
+            try:
+                size = await asyncio.to_thread(os.path.getsize, nas_path)
+            except OSError:
+                return None
+
+            if size > self.max_bytes:
+                return None
+
+            self._make_room(size)
+            local_path = self.get_local_path(nas_path)
+
+            started = time.monotonic()
+            try:
+                copied = await asyncio.to_thread(self._copy, nas_path, local_path)
+            except OSError:
+                return None
+
+            self.staging_seconds += time.monotonic() - started
+            self.bytes_staged += copied
+            self._entries[str(local_path)] = copied
+            self._verified_at[str(local_path)] = time.monotonic()
+            self._playbacks.pop(nas_path, None)
+            return local_path
+
+    def _copy(self, src: str, dst: Path) -> int:
+        """청크 단위 복사 (임시 파일 후 원자적 교체)"""
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dst.with_name(f".{dst.name}.{uuid.uuid4().hex[:8]}.tmp")
+        copied = 0
+        try:
+            with open(src, "rb") as fin, open(tmp_path, "wb") as fout:
+                while chunk := fin.read(self.chunk_size):
+                    fout.write(chunk)
+                    copied += len(chunk)
+            os.replace(tmp_path, dst)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return copied
+
+    def _make_room(self, size: int) -> None:
+        """용량 한도 내로 LRU 제거"""
+        while self._entries and self.bytes_used + size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._evict(oldest)
+
+    def _evict(self, key: str) -> None:
+        self._verified_at.pop(key, None)
+        if self._entries.pop(key, None) is not None:
+            self.evictions += 1
+        Path(key).unlink(missing_ok=True)
+
+    async def clear(self) -> None:
+        """전체 캐시 삭제"""
+        self._entries.clear()
+        self._verified_at.clear()
+        self._playbacks.clear()
+        if self.cache_path.exists():
+            shutil.rmtree(self.cache_path)
+
+    def stats(self) -> dict[str, float | int]:
+        """캐시 지표"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes_used": self.bytes_used,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "evictions": self.evictions,
+            "bytes_staged": self.bytes_staged,
+            "staging_mbps": (
+                round(self.bytes_staged * 8 / self.staging_seconds / 1_000_000, 1)
+                if self.staging_seconds else 0.0
+            ),
+        }
+
+
+# Singleton instance
+source_cache_service = SourceCacheService()
@@ -7,10 +7,46 @@ HLS 스트리밍 및 트랜스코딩 서비스
 import asyncio
 import hashlib
 import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Sequence
 
 from ..core.config import settings
+from .admission import LOAD_DEGRADED, admission_controller
+from .media_probe import probe_media
+from .mezzanine import mezzanine_service
+from .source_cache import source_cache_service
+from .transcode_queue import make_tmp_path, transcode_queue
+
+if TYPE_CHECKING:
+    from ..models.hand import Hand
+
+
+def _format_hls_date(value: datetime) -> str:
+    """ISO 8601 (밀리초, UTC) 형식"""
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def _quote_attr(value: str) -> str:
+    """HLS quoted-string에 허용되지 않는 문자 제거"""
+    return value.replace('"', "'").replace("\r", " ").replace("\n", " ")
+
+
+# Quality settings
+QUALITY_VIDEO_SETTINGS = {
+    "360p": "-vf scale=640:360 -b:v 800k -maxrate 856k -bufsize 1200k",
+    "480p": "-vf scale=854:480 -b:v 1400k -maxrate 1498k -bufsize 2100k",
+    "720p": "-vf scale=1280:720 -b:v 2800k -maxrate 2996k -bufsize 4200k",
+    "1080p": "-vf scale=1920:1080 -b:v 5000k -maxrate 5350k -bufsize 7500k",
+}
+AUDIO_SETTINGS = "-c:a aac -b:a 128k"
+
+# 오디오 전용 렌디션 (모든 비디오 렌디션이 EXT-X-MEDIA 그룹으로 공유)
+AUDIO_RENDITION = "audio"
+AUDIO_GROUP_ID = "aac"
+AUDIO_BANDWIDTH = 136000
 
 
 class StreamingService:
@@ -20,26 +56,80 @@ class StreamingService:
         self.cache_path = Path(settings.HLS_CACHE_PATH)
         self.cache_path.mkdir(parents=True, exist_ok=True)
         self.segment_duration = settings.HLS_SEGMENT_DURATION
+        self._upgrade_semaphore = asyncio.Semaphore(settings.HLS_FAST_START_UPGRADE_CONCURRENCY)
+        self._upgrade_tasks: set[asyncio.Task] = set()
+        self._pending_upgrades: set[tuple[str, str, int]] = set()
+        # 녹화 중 파일: nas_path -> (크기, 미디어 길이, 녹화 중 여부, 프로브 시각) (LRU)
+        self._live_sources: OrderedDict[str, tuple[int, float, bool, float]] = OrderedDict()
+        # 파일별 진행 중 길이 프로브 (시청자 수와 무관하게 한 번만 실행)
+        self._live_probes: dict[str, asyncio.Task] = {}
+        # 오디오 트랙 유무: nas_path -> bool (LRU)
+        self._audio_tracks: OrderedDict[str, bool] = OrderedDict()
+
+    def get_rendition_key(self, quality: str = "720p") -> str:
+        """
+        렌디션 키 (품질 + 인코딩 파라미터 해시)
+
+        인코딩 파라미터가 바뀌면 키가 달라져 이전 캐시와 섞이지 않는다.
+        비디오 렌디션은 오디오 없이(demuxed) 인코딩한다.
+        """
+        if quality == AUDIO_RENDITION:
+            params = "|".join([AUDIO_SETTINGS, str(self.segment_duration)])
+        else:
+            params = "|".join([
+                QUALITY_VIDEO_SETTINGS.get(quality, quality),
+                str(self.segment_duration),
+                "-an",
+            ])
+        digest = hashlib.sha1(params.encode()).hexdigest()[:8]
+        return f"{quality}-{digest}"
+
+    def get_file_cache_path(self, file_id: str, quality: str = "720p") -> Path:
+        """
+        미디어 파일별 캐시 경로
 
-    def get_content_cache_path(self, content_id: int, quality: str = "720p") -> Path:
-        """콘텐츠별 캐시 경로"""
-        return self.cache_path / f"{content_id}" / quality
+        같은 파일을 가리키는 여러 콘텐츠가 하나의 캐시를 공유하도록
+        content_id가 아닌 File.id + 렌디션 파라미터로 구분한다.
+        """
+        return self.cache_path / "files" / file_id / self.get_rendition_key(quality)
 
-    def get_manifest_path(self, content_id: int, quality: str = "720p") -> Path:
+    def get_manifest_path(self, file_id: str, quality: str = "720p") -> Path:
         """HLS 매니페스트 파일 경로"""
-        return self.get_content_cache_path(content_id, quality) / "manifest.m3u8"
+        return self.get_file_cache_path(file_id, quality) / "manifest.m3u8"
 
     def get_segment_path(
-        self, content_id: int, segment_index: int, quality: str = "720p"
+        self, file_id: str, segment_index: int, quality: str = "720p"
     ) -> Path:
         """HLS 세그먼트 파일 경로"""
-        return self.get_content_cache_path(content_id, quality) / f"segment_{segment_index:05d}.ts"
+        return self.get_file_cache_path(file_id, quality) / f"segment_{segment_index:05d}.ts"
+
+    async def has_audio(self, nas_path: str) -> bool:
+        """
+        원본 오디오 트랙 유무 (파일별 캐시)
+
+        프로브에 실패하면 오디오가 있다고 본다 (기존 동작 유지).
+        """
+        cached = self._audio_tracks.get(nas_path)
+        if cached is not None:
+            self._audio_tracks.move_to_end(nas_path)
+            return cached
+
+        probe = await probe_media(nas_path)
+        if probe is None:
+            return True
+
+        self._audio_tracks[nas_path] = probe["has_audio"]
+        while len(self._audio_tracks) > settings.HLS_AUDIO_PROBE_CACHE_SIZE:
+            self._audio_tracks.popitem(last=False)
+        return probe["has_audio"]
 
     async def generate_master_manifest(
         self,
         content_id: int,
         duration_sec: int,
         available_qualities: list[str] | None = None,
+        with_hands: bool = False,
+        with_audio: bool = True,
     ) -> str:
         """
         마스터 HLS 매니페스트 생성
@@ -48,32 +138,62 @@ class StreamingService:
             content_id: 콘텐츠 ID
             duration_sec: 총 길이 (초)
             available_qualities: 사용 가능한 품질 목록
+            with_hands: 품질별 플레이리스트에 핸드 마커 포함 여부
+            with_audio: False면 (오디오 없는 원본) 오디오 그룹/variant 생략
 
         Returns:
             M3U8 매니페스트 문자열
         """
         qualities = available_qualities or ["360p", "480p", "720p", "1080p"]
+        qualities = admission_controller.filter_qualities(qualities)
 
         # Quality to bandwidth mapping
-        quality_config = {
-            "360p": {"bandwidth": 800000, "resolution": "640x360"},
-            "480p": {"bandwidth": 1400000, "resolution": "854x480"},
-            "720p": {"bandwidth": 2800000, "resolution": "1280x720"},
-            "1080p": {"bandwidth": 5000000, "resolution": "1920x1080"},
+        quality_config: dict[str, dict[str, Any]] = {
+            "360p": {"bandwidth": 800000, "resolution": "640x360", "codec": "avc1.64001e"},
+            "480p": {"bandwidth": 1400000, "resolution": "854x480", "codec": "avc1.64001e"},
+            "720p": {"bandwidth": 2800000, "resolution": "1280x720", "codec": "avc1.64001f"},
+            "1080p": {"bandwidth": 5000000, "resolution": "1920x1080", "codec": "avc1.640028"},
         }
 
+        query = "?hands=true" if with_hands else ""
+        audio_uri = f"playlist_{AUDIO_RENDITION}.m3u8{query}"
+
+        if not with_audio:
+            # 오디오 없는 원본: 비디오 렌디션만 (세그먼트는 원래 -an)
+            lines = ["#EXTM3U", "#EXT-X-VERSION:4"]
+            for quality in qualities:
+                config = quality_config.get(quality, quality_config["720p"])
+                lines.extend([
+                    f'#EXT-X-STREAM-INF:BANDWIDTH={config["bandwidth"]},'
+                    f'RESOLUTION={config["resolution"]},CODECS="{config["codec"]}"',
+                    f"playlist_{quality}.m3u8{query}",
+                ])
+            return "\n".join(lines)
+
+        # 오디오는 한 번만 인코딩해 모든 비디오 렌디션이 공유
         lines = [
             "#EXTM3U",
-            "#EXT-X-VERSION:3",
+            "#EXT-X-VERSION:4",
+            f'#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="{AUDIO_GROUP_ID}",NAME="Commentary",'
+            f'DEFAULT=YES,AUTOSELECT=YES,URI="{audio_uri}"',
         ]
 
         for quality in qualities:
             config = quality_config.get(quality, quality_config["720p"])
             lines.extend([
-                f'#EXT-X-STREAM-INF:BANDWIDTH={config["bandwidth"]},RESOLUTION={config["resolution"]}',
-                f"playlist_{quality}.m3u8",
+                f'#EXT-X-STREAM-INF:BANDWIDTH={config["bandwidth"] + AUDIO_BANDWIDTH},'
+                f'RESOLUTION={config["resolution"]},'
+                f'CODECS="{config["codec"]},mp4a.40.2",AUDIO="{AUDIO_GROUP_ID}"',
+                f"playlist_{quality}.m3u8{query}",
             ])
 
+        # 백그라운드 청취용 오디오 전용 variant
+        lines.extend([
+            f'#EXT-X-STREAM-INF:BANDWIDTH={AUDIO_BANDWIDTH},'
+            f'CODECS="mp4a.40.2",AUDIO="{AUDIO_GROUP_ID}"',
+            audio_uri,
+        ])
+
         return "\n".join(lines)
 
     async def generate_quality_manifest(
@@ -81,6 +201,8 @@ class StreamingService:
         content_id: int,
         duration_sec: int,
         quality: str = "720p",
+        hands: Sequence["Hand"] | None = None,
+        program_start: datetime | None = None,
     ) -> str:
         """
         품질별 HLS 매니페스트 생성
@@ -88,7 +210,9 @@ class StreamingService:
         Args:
             content_id: 콘텐츠 ID
             duration_sec: 총 길이 (초)
-            quality: 품질
+            quality: 품질 (오디오 전용은 "audio")
+            hands: 핸드 목록 (지정 시 EXT-X-DATERANGE 마커 포함)
+            program_start: 마커 기준 시각 (EXT-X-PROGRAM-DATE-TIME)
 
         Returns:
             M3U8 매니페스트 문자열
@@ -103,8 +227,78 @@ class StreamingService:
             "#EXT-X-PLAYLIST-TYPE:VOD",
         ]
 
+        if hands is not None:
+            # 콘텐츠별로 고정된 기준 시각을 써야 매니페스트가 캐시 가능
+            anchor = program_start or datetime(1970, 1, 1, tzinfo=timezone.utc)
+            lines.extend(self._build_hand_dateranges(hands, anchor))
+            lines.append(f"#EXT-X-PROGRAM-DATE-TIME:{_format_hls_date(anchor)}")
+
+        lines.extend(self._build_segment_lines(num_segments, duration_sec, quality))
+        lines.append("#EXT-X-ENDLIST")
+
+        return "\n".join(lines)
+
+    async def generate_event_manifest(
+        self,
+        content_id: int,
+        media_sec: float,
+        quality: str = "720p",
+        growing: bool = True,
+        hands: Sequence["Hand"] | None = None,
+        program_start: datetime | None = None,
+    ) -> str:
+        """
+        녹화 중 파일용 EVENT HLS 매니페스트 생성
+
+        인코딩 가능한 세그먼트까지만 나열하고, 녹화가 끝나면
+        남은 구간과 #EXT-X-ENDLIST를 붙인다.
+
+        Args:
+            content_id: 콘텐츠 ID
+            media_sec: 현재까지 기록된 길이 (초)
+            quality: 품질
+            growing: 녹화 중 여부
+            hands: 핸드 목록 (지정 시 EXT-X-DATERANGE 마커 포함)
+            program_start: 마커 기준 시각 (EXT-X-PROGRAM-DATE-TIME)
+
+        Returns:
+            M3U8 매니페스트 문자열
+        """
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:6",
+            f"#EXT-X-TARGETDURATION:{self.segment_duration}",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+            "#EXT-X-PLAYLIST-TYPE:EVENT",
+        ]
+        if growing:
+            lines.append(
+                f"#EXT-X-SERVER-CONTROL:CAN-BLOCK-RELOAD=YES,"
+                f"HOLD-BACK={self.segment_duration * 3:.1f}"
+            )
+
+        if hands is not None:
+            anchor = program_start or datetime(1970, 1, 1, tzinfo=timezone.utc)
+            lines.extend(self._build_hand_dateranges(hands, anchor))
+            lines.append(f"#EXT-X-PROGRAM-DATE-TIME:{_format_hls_date(anchor)}")
+
+        num_segments = self.count_ready_segments(media_sec, growing)
+        if growing:
+            lines.extend(self._build_segment_lines(
+                num_segments, num_segments * self.segment_duration, quality
+            ))
+        else:
+            lines.extend(self._build_segment_lines(num_segments, media_sec, quality))
+            lines.append("#EXT-X-ENDLIST")
+
+        return "\n".join(lines)
+
+    def _build_segment_lines(
+        self, num_segments: int, duration_sec: float, quality: str
+    ) -> list[str]:
+        """#EXTINF + 세그먼트 URI (마지막 세그먼트는 짧을 수 있음)"""
+        lines = []
         for i in range(num_segments):
-            # Calculate actual segment duration (last segment may be shorter)
             if i == num_segments - 1:
                 seg_duration = duration_sec - (i * self.segment_duration)
             else:
@@ -112,16 +306,147 @@ class StreamingService:
 
             lines.extend([
                 f"#EXTINF:{seg_duration:.3f},",
-                f"segment_{i:05d}.ts",
+                f"segment_{i:05d}.ts?quality={quality}",
             ])
+        return lines
 
-        lines.append("#EXT-X-ENDLIST")
+    # =========================================================================
+    # Live (growing file)
+    # =========================================================================
 
-        return "\n".join(lines)
+    async def get_live_status(
+        self, nas_path: str, bitrate_kbps: int | None = None
+    ) -> tuple[float, bool] | None:
+        """
+        녹화 중 파일 상태
+
+        mtime이 HLS_LIVE_GROWTH_WINDOW_SEC 안에 갱신된 파일을 녹화 중으로 본다.
+        녹화가 끝난 뒤에도 같은 파일은 EVENT 플레이리스트를 유지해야 하므로
+        한 번 녹화 중으로 확인된 파일은 계속 추적한다 (최대 HLS_LIVE_MAX_SOURCES개).
+
+        플레이리스트/세그먼트 요청마다 호출되므로, 녹화 중 파일의 길이는
+        HLS_LIVE_PROBE_INTERVAL_SEC마다 한 번만 다시 프로브하고 동시 요청은
+        진행 중인 프로브 하나를 공유한다. 녹화가 끝나면 즉시 다시 프로브한다.
+
+        Returns:
+            (현재 미디어 길이, 녹화 중 여부) - 녹화와 무관한 파일이면 None
+        """
+        try:
+            st = await asyncio.to_thread(os.stat, nas_path)
+        except OSError:
+            return None
+
+        growing = time.time() - st.st_mtime < settings.HLS_LIVE_GROWTH_WINDOW_SEC
+        cached = self._live_sources.get(nas_path)
+        if cached is None and not growing:
+            return None
+
+        if cached and cached[2] == growing:
+            size, media_sec, _, probed_at = cached
+            fresh = time.monotonic() - probed_at < settings.HLS_LIVE_PROBE_INTERVAL_SEC
+            if size == st.st_size or (growing and fresh):
+                self._live_sources.move_to_end(nas_path)
+                return media_sec, growing
+
+        media_sec = await self._probe_shared(nas_path, st.st_size, bitrate_kbps)
+        cached = self._live_sources.get(nas_path)
+        if cached and media_sec < cached[1]:
+            media_sec = cached[1]  # 프로브 실패/오차로 길이가 줄어들지 않도록
+
+        self._live_sources[nas_path] = (st.st_size, media_sec, growing, time.monotonic())
+        self._live_sources.move_to_end(nas_path)
+        while len(self._live_sources) > settings.HLS_LIVE_MAX_SOURCES:
+            self._live_sources.popitem(last=False)
+        return media_sec, growing
+
+    async def _probe_shared(
+        self, nas_path: str, size_bytes: int, bitrate_kbps: int | None
+    ) -> float:
+        """파일별 single-flight 길이 프로브"""
+        task = self._live_probes.get(nas_path)
+        if task is None:
+            task = asyncio.create_task(
+                self._probe_live_duration(nas_path, size_bytes, bitrate_kbps)
+            )
+            self._live_probes[nas_path] = task
+            task.add_done_callback(lambda _: self._live_probes.pop(nas_path, None))
+        # 한 요청이 취소되어도 다른 대기자는 결과를 받도록
+        return await asyncio.shield(task)
+
+    async def _probe_live_duration(
+        self, nas_path: str, size_bytes: int, bitrate_kbps: int | None
+    ) -> float:
+        """현재까지 기록된 미디어 길이 (프로브 실패 시 비트레이트로 추정)"""
+        probe = await probe_media(nas_path, timeout=settings.HLS_LIVE_PROBE_TIMEOUT_SEC)
+        if probe and probe["duration"]:
+            return probe["duration"]
+        if bitrate_kbps:
+            return size_bytes * 8 / (bitrate_kbps * 1000)
+        return 0.0
+
+    def count_ready_segments(self, media_sec: float, growing: bool) -> int:
+        """
+        인코딩 가능한 세그먼트 수
+
+        녹화 중이면 쓰기 중인 끝부분을 피하도록 완전한 세그먼트에서
+        HLS_LIVE_SAFETY_SEGMENTS개를 제외한다.
+        """
+        if not growing:
+            return int(-(-media_sec // self.segment_duration))
+        complete = int(media_sec // self.segment_duration)
+        return max(0, complete - settings.HLS_LIVE_SAFETY_SEGMENTS)
+
+    async def wait_for_segment(
+        self,
+        nas_path: str,
+        msn: int,
+        bitrate_kbps: int | None = None,
+        timeout: float | None = None,
+    ) -> tuple[float, bool] | None:
+        """
+        Blocking playlist reload (_HLS_msn)
+
+        msn 세그먼트가 인코딩 가능해지거나 녹화가 끝날 때까지 대기한다.
+        타임아웃 시 현재 상태를 그대로 반환한다.
+        """
+        deadline = time.monotonic() + (timeout or settings.HLS_BLOCKING_RELOAD_TIMEOUT_SEC)
+        while True:
+            status = await self.get_live_status(nas_path, bitrate_kbps)
+            if status is None:
+                return None
+            media_sec, growing = status
+            if not growing or self.count_ready_segments(media_sec, growing) > msn:
+                return status
+            if time.monotonic() >= deadline:
+                return status
+            await asyncio.sleep(settings.HLS_LIVE_POLL_INTERVAL_SEC)
+
+    def _build_hand_dateranges(
+        self, hands: Sequence["Hand"], anchor: datetime
+    ) -> list[str]:
+        """핸드별 EXT-X-DATERANGE 태그 (등급, 플레이어, 팟 크기)"""
+        lines = []
+        for hand in hands:
+            attrs = [
+                f'ID="hand-{hand.id}"',
+                'CLASS="com.wsoptv.hand"',
+                f'START-DATE="{_format_hls_date(anchor + timedelta(seconds=hand.start_sec))}"',
+                f"DURATION={max(hand.end_sec - hand.start_sec, 0):.3f}",
+                f'X-GRADE="{hand.grade}"',
+                f'X-PLAYERS="{_quote_attr(",".join(hand.player_names))}"',
+            ]
+            if hand.hand_number is not None:
+                attrs.append(f"X-HAND-NUMBER={hand.hand_number}")
+            if hand.pot_size_bb is not None:
+                attrs.append(f"X-POT-BB={hand.pot_size_bb:g}")
+            if hand.is_all_in:
+                attrs.append('X-ALL-IN="YES"')
+            lines.append(f"#EXT-X-DATERANGE:{','.join(attrs)}")
+        return lines
 
     async def get_segment(
         self,
-        content_id: int,
+        file_id: str,
         segment_index: int,
         nas_path: str,
         quality: str = "720p",
@@ -130,7 +455,7 @@ class StreamingService:
         HLS 세그먼트 스트리밍 (On-demand 트랜스먹싱)
 
         Args:
-            content_id: 콘텐츠 ID
+            file_id: 미디어 파일 ID (캐시 키)
             segment_index: 세그먼트 인덱스
             nas_path: NAS 파일 경로
             quality: 품질
@@ -138,10 +463,13 @@ class StreamingService:
         Yields:
             세그먼트 바이트 청크
         """
-        segment_path = self.get_segment_path(content_id, segment_index, quality)
+        segment_path = self.get_segment_path(file_id, segment_index, quality)
 
         # Check cache first
         if segment_path.exists():
+            # 재시작 등으로 누락된 품질 교체 작업 재예약
+            if self._get_fast_marker_path(segment_path).exists():
+                self._schedule_upgrade(file_id, segment_index, nas_path, quality)
             async for chunk in self._read_file_chunks(segment_path):
                 yield chunk
             return
@@ -149,46 +477,178 @@ class StreamingService:
         # Generate segment on-demand
         segment_path.parent.mkdir(parents=True, exist_ok=True)
 
-        start_time = segment_index * self.segment_duration
+        # 저화질은 원본 대신 저해상도 프록시를, 자주 쓰는 원본은 로컬 사본을 디코딩
+        nas_path = mezzanine_service.get_source(file_id, nas_path, quality)
+        nas_path = await source_cache_service.resolve(nas_path)
+
+        # 과부하 시 이미 캐시된 저화질 세그먼트로 대체
+        if admission_controller.level >= LOAD_DEGRADED:
+            for lower in admission_controller.lower_qualities(quality):
+                fallback_path = self.get_segment_path(file_id, segment_index, lower)
+                if fallback_path.exists():
+                    async for chunk in self._read_file_chunks(fallback_path):
+                        yield chunk
+                    return
+
+        # 탐색 직후 구간은 빠른 프리셋으로 먼저 응답하고 백그라운드에서 교체
+        fast_start = self._should_fast_start(file_id, segment_index, quality)
+        preset = settings.HLS_FAST_START_PRESET if fast_start else settings.HLS_SEGMENT_PRESET
+
+        async with admission_controller.slot():
+            # 대기 중 다른 요청이 같은 세그먼트를 만들었을 수 있음
+            if not segment_path.exists():
+                degraded_preset = admission_controller.choose_preset(preset)
+                if quality != AUDIO_RENDITION:
+                    fast_start = fast_start or degraded_preset != preset
+                await self._encode_segment(
+                    nas_path=nas_path,
+                    segment_index=segment_index,
+                    quality=quality,
+                    output_path=segment_path,
+                    preset=degraded_preset,
+                )
+
+        if fast_start and segment_path.exists():
+            self._get_fast_marker_path(segment_path).touch()
+            self._schedule_upgrade(file_id, segment_index, nas_path, quality)
 
-        # Quality settings
-        quality_settings = {
-            "360p": "-vf scale=640:360 -b:v 800k -maxrate 856k -bufsize 1200k",
-            "480p": "-vf scale=854:480 -b:v 1400k -maxrate 1498k -bufsize 2100k",
-            "720p": "-vf scale=1280:720 -b:v 2800k -maxrate 2996k -bufsize 4200k",
-            "1080p": "-vf scale=1920:1080 -b:v 5000k -maxrate 5350k -bufsize 7500k",
-        }
+        # Stream the generated segment
+        if segment_path.exists():
+            async for chunk in self._read_file_chunks(segment_path):
+                yield chunk
 
-        video_settings = quality_settings.get(quality, quality_settings["720p"])
+    def build_segment_command(
+        self,
+        nas_path: str,
+        segment_index: int,
+        quality: str,
+        output_path: Path,
+        preset: str,
+    ) -> list[str]:
+        """
+        세그먼트 인코딩용 FFmpeg 명령 생성
 
-        # FFmpeg command for HLS segment
-        ffmpeg_cmd = [
+        비디오와 오디오는 별도 렌디션으로 인코딩하므로 타임스탬프를
+        원본 위치 기준으로 맞춰(-output_ts_offset) 플레이어가 동기화하게 한다.
+        """
+        start_time = segment_index * self.segment_duration
+
+        if quality == AUDIO_RENDITION:
+            return [
+                "ffmpeg",
+                "-ss", str(start_time),
+                "-i", nas_path,
+                "-t", str(self.segment_duration),
+                "-map", "0:a:0",
+                *AUDIO_SETTINGS.split(),
+                "-output_ts_offset", str(start_time),
+                "-f", "mpegts",
+                "-y",
+                str(output_path),
+            ]
+
+        video_settings = QUALITY_VIDEO_SETTINGS.get(quality, QUALITY_VIDEO_SETTINGS["720p"])
+
+        # 빠른 시작 인코딩은 lookahead/B-frame 없이 복잡도를 낮춤
+        tune = ["-tune", "zerolatency"] if preset == settings.HLS_FAST_START_PRESET else []
+
+        return [
             "ffmpeg",
             "-ss", str(start_time),
             "-i", nas_path,
             "-t", str(self.segment_duration),
             "-c:v", "libx264",
-            "-preset", "fast",
+            "-preset", preset,
+            *tune,
             *video_settings.split(),
-            "-c:a", "aac",
-            "-b:a", "128k",
+            "-an",
+            "-output_ts_offset", str(start_time),
             "-f", "mpegts",
             "-y",
-            str(segment_path),
+            str(output_path),
         ]
 
-        # Run FFmpeg
-        process = await asyncio.create_subprocess_exec(
-            *ffmpeg_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+    async def _encode_segment(
+        self,
+        nas_path: str,
+        segment_index: int,
+        quality: str,
+        output_path: Path,
+        preset: str,
+    ) -> bool:
+        """
+        세그먼트 인코딩
+
+        임시 파일에 쓴 뒤 원자적으로 교체하므로 다른 요청이
+        인코딩 중인 불완전한 세그먼트를 읽지 않는다.
+        """
+        tmp_path = make_tmp_path(output_path)
+        ffmpeg_cmd = self.build_segment_command(
+            nas_path, segment_index, quality, tmp_path, preset
         )
-        await process.wait()
 
-        # Stream the generated segment
-        if segment_path.exists():
-            async for chunk in self._read_file_chunks(segment_path):
-                yield chunk
+        # 인코딩은 작업 큐(로컬 실행 또는 전용 워커)에서 수행
+        return await transcode_queue.run("segment", ffmpeg_cmd, tmp_path, output_path)
+
+    # =========================================================================
+    # Fast-start (저지연 첫 세그먼트 + 백그라운드 품질 교체)
+    # =========================================================================
+
+    def _get_fast_marker_path(self, segment_path: Path) -> Path:
+        """빠른 프리셋으로 인코딩된 세그먼트 표시 파일 경로"""
+        return segment_path.with_name(f"{segment_path.name}.fast")
+
+    def _should_fast_start(self, file_id: str, segment_index: int, quality: str) -> bool:
+        """
+        빠른 시작 인코딩 여부
+
+        직전 N개 세그먼트가 모두 캐시되어 있지 않으면 탐색(또는 재생 시작)
+        직후로 간주한다.
+        """
+        window = settings.HLS_FAST_START_SEGMENTS
+        if not settings.HLS_FAST_START_ENABLED or window <= 0 or quality == AUDIO_RENDITION:
+            return False
+
+        cached = sum(
+            1
+            for i in range(max(0, segment_index - window), segment_index)
+            if self.get_segment_path(file_id, i, quality).exists()
+        )
+        return cached < window
+
+    def _schedule_upgrade(
+        self, file_id: str, segment_index: int, nas_path: str, quality: str
+    ) -> None:
+        """정상 프리셋 재인코딩 예약"""
+        key = (file_id, quality, segment_index)
+        if key in self._pending_upgrades:
+            return
+
+        self._pending_upgrades.add(key)
+        task = asyncio.create_task(
+            self._upgrade_segment(file_id, segment_index, nas_path, quality)
+        )
+        self._upgrade_tasks.add(task)
+        task.add_done_callback(self._upgrade_tasks.discard)
+        task.add_done_callback(lambda _: self._pending_upgrades.discard(key))
+
+    async def _upgrade_segment(
+        self, file_id: str, segment_index: int, nas_path: str, quality: str
+    ) -> None:
+        """빠른 프리셋 세그먼트를 정상 품질로 교체"""
+        segment_path = self.get_segment_path(file_id, segment_index, quality)
+        async with self._upgrade_semaphore:
+            # 과부하 중에는 교체 인코딩을 미룸
+            await admission_controller.wait_until_normal()
+            upgraded = await self._encode_segment(
+                nas_path=nas_path,
+                segment_index=segment_index,
+                quality=quality,
+                output_path=segment_path,
+                preset=settings.HLS_SEGMENT_PRESET,
+            )
+        if upgraded:
+            self._get_fast_marker_path(segment_path).unlink(missing_ok=True)
 
     async def _read_file_chunks(
         self, file_path: Path, chunk_size: int = 65536
@@ -198,13 +658,13 @@ class StreamingService:
             while chunk := f.read(chunk_size):
                 yield chunk
 
-    def get_cache_key(self, content_id: int, quality: str, segment: int) -> str:
+    def get_cache_key(self, file_id: str, quality: str, segment: int) -> str:
         """Redis 캐시 키 생성"""
-        return f"hls:{content_id}:{quality}:seg:{segment}"
+        return f"hls:{file_id}:{quality}:seg:{segment}"
 
-    async def clear_cache(self, content_id: int) -> None:
-        """콘텐츠 캐시 삭제"""
-        cache_dir = self.cache_path / str(content_id)
+    async def clear_cache(self, file_id: str) -> None:
+        """미디어 파일 캐시 삭제"""
+        cache_dir = self.cache_path / "files" / file_id
         if cache_dir.exists():
             import shutil
             shutil.rmtree(cache_dir)
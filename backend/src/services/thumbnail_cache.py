@@ -0,0 +1,177 @@
+"""
+Thumbnail Cache Service
+
+Jellyfin 썸네일 프록시용 로컬 디스크 캐시
+
+(아이템, 이미지 타입, 너비, 높이, 태그)별로 Jellyfin 리사이즈 결과를 한 번만
+받아 저장하고 이후에는 로컬 파일을 그대로 응답한다. 용량 한도를 넘으면
+가장 오래 사용하지 않은 이미지부터 제거한다. 미러 동기화 시 자주 쓰는
+크기를 미리 만들어 둔다.
+
+요청 크기는 허용 목록(THUMBNAIL_ALLOWED_WIDTHS/HEIGHTS)으로 올림해서
+임의 크기 요청이 Jellyfin 조회와 캐시 항목을 늘리지 않게 한다.
+"""
+
+import asyncio
+from pathlib import Path
+
+from ..core.config import settings
+from .disk_cache import DiskCache
+from .jellyfin import JellyfinService, jellyfin_service
+
+
+def sniff_media_type(head: bytes) -> str:
+    """파일 시그니처로 이미지 MIME 타입 판별"""
+    if head.startswith(b"\x89PNG"):
+        return "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head.startswith(b"GIF8"):
+        return "image/gif"
+    return "image/jpeg"
+
+
+def snap_size(value: int | None, allowed: list[int]) -> int | None:
+    """요청 크기 → 허용 목록 중 같거나 큰 가장 작은 값 (없으면 최댓값)"""
+    if value is None or not allowed:
+        return value
+    return min((size for size in allowed if size >= value), default=max(allowed))
+
+
+def read_media_type(path: Path) -> str:
+    """캐시 파일 앞부분으로 MIME 타입 판별 (읽기 실패 시 JPEG)"""
+    try:
+        with open(path, "rb") as f:
+            return sniff_media_type(f.read(12))
+    except OSError:
+        return "image/jpeg"
+
+
+class ThumbnailCacheService:
+    """썸네일 read-through 디스크 캐시"""
+
+    def __init__(self, jellyfin: JellyfinService | None = None):
+        self.jellyfin = jellyfin or jellyfin_service
+        self.cache = DiskCache(settings.THUMBNAIL_CACHE_PATH, settings.THUMBNAIL_CACHE_MAX_BYTES)
+        self._semaphore = asyncio.Semaphore(settings.THUMBNAIL_FETCH_CONCURRENCY)
+
+    @staticmethod
+    def _key(
+        item_id: str,
+        image_type: str,
+        width: int | None,
+        height: int | None,
+        tag: str | None,
+    ) -> str:
+        return f"{item_id}|{image_type}|{width or 0}|{height or 0}|{tag or ''}"
+
+    def get_path(
+        self,
+        item_id: str,
+        image_type: str = "Primary",
+        width: int | None = None,
+        height: int | None = None,
+        tag: str | None = None,
+    ) -> Path:
+        """요청 파라미터별 캐시 파일 경로"""
+        width = snap_size(width, settings.THUMBNAIL_ALLOWED_WIDTHS)
+        height = snap_size(height, settings.THUMBNAIL_ALLOWED_HEIGHTS)
+        return self.cache.get_path(self._key(item_id, image_type, width, height, tag))
+
+    @staticmethod
+    def get_etag(path: Path) -> str:
+        """
+        Strong ETag
+
+        캐시 파일은 한 번 쓰면 바뀌지 않으므로 경로 + 크기 + mtime으로 충분하다.
+        """
+        st = path.stat()
+        return f'"{path.name[:16]}-{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+    async def get(
+        self,
+        item_id: str,
+        image_type: str = "Primary",
+        width: int | None = None,
+        height: int | None = None,
+        tag: str | None = None,
+    ) -> Path | None:
+        """
+        캐시된 썸네일 경로 (없으면 Jellyfin에서 받아 저장)
+
+        Returns:
+            이미지 파일 경로 (Jellyfin에 이미지가 없으면 None)
+        """
+        width = snap_size(width, settings.THUMBNAIL_ALLOWED_WIDTHS)
+        height = snap_size(height, settings.THUMBNAIL_ALLOWED_HEIGHTS)
+
+        async def _fetch() -> bytes | None:
+            async with self._semaphore:
+                return await self.jellyfin.get_image(
+                    item_id, image_type, max_width=width, max_height=height, tag=tag
+                )
+
+        return await self.cache.get_or_fetch(
+            self._key(item_id, image_type, width, height, tag), _fetch
+        )
+
+    async def load(
+        self,
+        item_id: str,
+        image_type: str = "Primary",
+        width: int | None = None,
+        height: int | None = None,
+        tag: str | None = None,
+    ) -> tuple[Path, str] | None:
+        """
+        캐시된 썸네일 경로 + ETag (stat만 스레드에서 수행, 본문은 읽지 않음)
+
+        stat 직전 LRU 제거로 파일이 사라졌으면 미스로 보고 한 번 다시 받는다.
+
+        Returns:
+            (이미지 파일 경로, ETag) (Jellyfin에 이미지가 없으면 None)
+        """
+        for _ in range(2):
+            path = await self.get(item_id, image_type, width, height, tag)
+            if path is None:
+                return None
+            try:
+                etag = await asyncio.to_thread(self.get_etag, path)
+            except FileNotFoundError:
+                self.cache.discard(path)
+                continue
+            return path, etag
+        return None
+
+    async def prewarm(self, items: list[tuple[str, str | None]]) -> int:
+        """
+        자주 쓰는 크기 미리 생성
+
+        Args:
+            items: (item_id, Primary 이미지 태그) 목록
+
+        Returns:
+            새로 받은 이미지 수
+        """
+        before = self.cache.misses
+
+        async def _warm(item_id: str, tag: str | None, width: int) -> None:
+            try:
+                await self.get(item_id, "Primary", width=width, tag=tag)
+            except Exception:
+                pass  # 개별 이미지 실패는 요청 시 다시 시도
+
+        await asyncio.gather(*(
+            _warm(item_id, tag, width)
+            for item_id, tag in items
+            for width in settings.THUMBNAIL_PREWARM_WIDTHS
+        ))
+        return self.cache.misses - before
+
+    def stats(self) -> dict[str, int]:
+        """캐시 지표"""
+        return self.cache.stats()
+
+
+# Singleton instance
+thumbnail_cache_service = ThumbnailCacheService()
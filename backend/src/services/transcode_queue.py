@@ -0,0 +1,191 @@
+"""
+Transcode Queue Service
+
+트랜스코딩 작업 큐
+
+세그먼트/프록시 인코딩(FFmpeg)을 작업 큐로 넘겨 API 프로세스와 분리한다.
+- local: API 프로세스 안에서 바로 실행 (단일 노드/개발용)
+- redis: Redis 리스트에 작업을 넣고 별도 워커(transcode_worker)가 처리,
+  API는 결과 키 또는 캐시 파일 생성을 기다린다.
+
+전체 파일 인코딩(proxy)은 별도 background 큐와 전용 워커 슬롯, 긴 타임아웃을 쓴다.
+시청 중인 세그먼트 작업이 긴 작업 뒤에 밀리지 않게 하고, 대기 타임아웃 뒤
+같은 출력의 중복 작업이 들어가지 않도록 출력 경로별 in-flight 키로 막는다.
+
+워커는 꺼낸 작업을 워커별 processing 리스트로 옮겨 두고(BLMOVE) 완료 후 제거한다.
+워커가 죽으면 재시작 시 남은 작업을 큐로 되돌린다. 되돌리기 전까지 호출자는
+타임아웃까지 기다린다.
+"""
+
+import asyncio
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Any
+
+from ..core.config import settings
+from ..core.redis import get_redis
+
+# 전체 파일 인코딩 (background 큐, 긴 타임아웃)
+BACKGROUND_KINDS = {"proxy"}
+
+
+def make_tmp_path(output_path: Path) -> Path:
+    """원자적 교체용 임시 파일 경로"""
+    return output_path.with_name(f".{output_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+
+
+async def execute_job(job: dict[str, Any]) -> bool:
+    """
+    작업 실행 (FFmpeg 실행 후 결과 파일을 원자적으로 교체)
+
+    API 프로세스(local)와 워커 프로세스(redis) 모두 이 함수로 실행한다.
+    """
+    cmd: list[str] = job["cmd"]
+    if not cmd or cmd[0] != "ffmpeg":
+        return False
+
+    tmp_path = Path(job["tmp_path"])
+    output_path = Path(job["output_path"])
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    await process.communicate()
+
+    if process.returncode != 0 or not tmp_path.exists():
+        tmp_path.unlink(missing_ok=True)
+        return False
+
+    os.replace(tmp_path, output_path)
+    return True
+
+
+class TranscodeQueue:
+    """트랜스코딩 작업 큐"""
+
+    def __init__(self):
+        self.backend = settings.TRANSCODE_QUEUE_BACKEND
+        self.queue_key = settings.TRANSCODE_QUEUE_KEY
+        self.background_key = f"{self.queue_key}:background"
+        self.timeout = settings.TRANSCODE_JOB_TIMEOUT_SEC
+        self.background_timeout = settings.TRANSCODE_BACKGROUND_JOB_TIMEOUT_SEC
+
+    def result_key(self, job_id: str) -> str:
+        """작업 결과 키"""
+        return f"{self.queue_key}:result:{job_id}"
+
+    def inflight_key(self, output_path: Path) -> str:
+        """출력 경로별 진행 중 작업 키 (background 작업 중복 방지)"""
+        return f"{self.queue_key}:inflight:{output_path}"
+
+    def processing_key(self, worker_id: str) -> str:
+        """워커별 처리 중 작업 리스트"""
+        return f"{self.queue_key}:processing:{worker_id}"
+
+    def get_timeout(self, kind: str) -> int:
+        """작업 종류별 대기 타임아웃"""
+        return self.background_timeout if kind in BACKGROUND_KINDS else self.timeout
+
+    async def run(
+        self,
+        kind: str,
+        cmd: list[str],
+        tmp_path: Path,
+        output_path: Path,
+    ) -> bool:
+        """
+        작업 제출 후 완료 대기
+
+        Args:
+            kind: 작업 종류 (segment, proxy 등)
+            cmd: FFmpeg 명령 (출력은 tmp_path)
+            tmp_path: 임시 출력 경로
+            output_path: 최종 출력 경로
+
+        Returns:
+            결과 파일 생성 여부 (같은 출력의 background 작업이 진행 중이면 False)
+        """
+        job: dict[str, Any] = {
+            "id": uuid.uuid4().hex,
+            "kind": kind,
+            "cmd": cmd,
+            "tmp_path": str(tmp_path),
+            "output_path": str(output_path),
+        }
+
+        if self.backend != "redis":
+            return await execute_job(job)
+
+        redis = get_redis()
+        timeout = self.get_timeout(kind)
+        queue_key = self.queue_key
+        if kind in BACKGROUND_KINDS:
+            queue_key = self.background_key
+            acquired = await redis.set(
+                self.inflight_key(output_path), job["id"], nx=True, ex=timeout
+            )
+            if not acquired:
+                return output_path.exists()
+
+        await redis.lpush(queue_key, json.dumps(job))
+
+        result = await redis.blpop([self.result_key(job["id"])], timeout=timeout)
+        if result is not None:
+            return result[1] == "ok"
+
+        # 결과 알림을 놓쳤더라도 캐시 파일이 생겼으면 성공으로 간주
+        return output_path.exists()
+
+    async def requeue_orphans(self, worker_id: str) -> int:
+        """이전 실행에서 완료하지 못한 작업을 큐로 되돌림"""
+        redis = get_redis()
+        processing_key = self.processing_key(worker_id)
+        requeued = 0
+        while (raw := await redis.rpop(processing_key)) is not None:
+            job = json.loads(raw)
+            await redis.rpush(
+                self.background_key if job.get("kind") in BACKGROUND_KINDS else self.queue_key,
+                raw,
+            )
+            requeued += 1
+        return requeued
+
+    async def consume(self, worker_id: str, background: bool = False) -> None:
+        """
+        워커 루프: 작업을 꺼내 실행하고 결과를 기록
+
+        Args:
+            worker_id: 워커 슬롯 ID (재시작해도 같은 값이어야 남은 작업을 되돌림)
+            background: True면 background 큐(proxy)만 처리
+        """
+        redis = get_redis()
+        queue_key = self.background_key if background else self.queue_key
+        processing_key = self.processing_key(worker_id)
+        await self.requeue_orphans(worker_id)
+
+        while True:
+            raw = await redis.blmove(queue_key, processing_key, 5, "RIGHT", "LEFT")
+            if raw is None:
+                continue
+
+            job = json.loads(raw)
+            try:
+                ok = await execute_job(job)
+            except OSError:
+                ok = False
+
+            result_key = self.result_key(job["id"])
+            await redis.lpush(result_key, "ok" if ok else "error")
+            await redis.expire(result_key, self.get_timeout(job["kind"]))
+            if job["kind"] in BACKGROUND_KINDS:
+                await redis.delete(self.inflight_key(Path(job["output_path"])))
+            await redis.lrem(processing_key, 1, raw)
+
+
+# Singleton instance
+transcode_queue = TranscodeQueue()
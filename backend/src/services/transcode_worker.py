@@ -0,0 +1,49 @@
+"""
+Transcode Worker
+
+Redis 작업 큐를 소비하는 전용 트랜스코딩 워커
+
+API 레플리카와 별개로 노드별 워커 수를 늘려 트랜스코딩을 확장한다.
+세그먼트 슬롯(TRANSCODE_WORKER_CONCURRENCY)과 프록시 등 긴 작업 슬롯
+(TRANSCODE_BACKGROUND_WORKER_CONCURRENCY)을 따로 둔다.
+"""
+
+import asyncio
+import socket
+import sys
+
+from ..core.config import settings
+from ..core.redis import close_redis, get_redis
+from .transcode_queue import transcode_queue
+
+
+async def run_worker():
+    """워커 실행"""
+    concurrency = settings.TRANSCODE_WORKER_CONCURRENCY
+    background = settings.TRANSCODE_BACKGROUND_WORKER_CONCURRENCY
+    # 재시작 후에도 같은 슬롯 ID를 써야 처리 중이던 작업을 되돌릴 수 있음
+    worker_id = socket.gethostname()
+
+    print(f"[Transcoder] Worker {worker_id} connecting to Redis at {settings.REDIS_URL}")
+    print(f"[Transcoder] Queue: {transcode_queue.queue_key}, concurrency: {concurrency}, "
+          f"background: {background}")
+
+    try:
+        await get_redis().ping()
+        print("[Transcoder] Waiting for jobs...")
+        await asyncio.gather(
+            *(transcode_queue.consume(f"{worker_id}:{i}") for i in range(concurrency)),
+            *(
+                transcode_queue.consume(f"{worker_id}:bg{i}", background=True)
+                for i in range(background)
+            ),
+        )
+    except Exception as e:
+        print(f"[Transcoder] ERROR: {e}")
+        sys.exit(1)
+    finally:
+        await close_redis()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
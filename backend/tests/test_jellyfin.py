@@ -0,0 +1,706 @@
+"""
+Jellyfin Service Tests
+
+Jellyfin 서버 없이 검증 가능한 JellyfinService 단위 테스트
+
+Run with: pytest tests/test_jellyfin.py -v
+"""
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+
+from src.core.config import settings
+from src.schemas.jellyfin import JellyfinLibrary
+from src.services.jellyfin import JellyfinService
+from src.services.jellyfin_mirror import item_to_row
+
+ITEMS_RESPONSE = {
+    "Items": [{"Id": "a1", "Name": "WSOP Main Event Day 1", "Type": "Video"}],
+    "TotalRecordCount": 1,
+}
+
+
+@pytest.fixture
+def service(monkeypatch: pytest.MonkeyPatch) -> JellyfinService:
+    """Redis 계층 없이 가짜 업스트림을 쓰는 JellyfinService"""
+    monkeypatch.setattr(settings, "JELLYFIN_CACHE_REDIS_ENABLED", False)
+    service = JellyfinService()
+    service.calls = []
+
+    async def fake_request(
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        json_data: dict[str, Any] | None = None,
+        timeout: float | None = None,
+    ) -> dict[str, Any]:
+        service.calls.append((method, endpoint, params))
+        await asyncio.sleep(0)
+        return ITEMS_RESPONSE
+
+    monkeypatch.setattr(service, "_request", fake_request)
+    return service
+
+
+def _age_entries(service: JellyfinService, seconds: float) -> None:
+    for entry in service.cache._entries.values():
+        entry.fetched_at = time.time() - seconds
+
+
+class TestResponseCache:
+    """[JELLYFIN] TTL + stale-while-revalidate 캐시"""
+
+    @pytest.mark.asyncio
+    async def test_fresh_hit_skips_upstream(self, service: JellyfinService):
+        first = await service.get_items(parent_id="lib", limit=20)
+        second = await service.get_items(parent_id="lib", limit=20)
+
+        assert first is second
+        assert len(service.calls) == 1
+        assert first.items[0].name == "WSOP Main Event Day 1"
+
+    @pytest.mark.asyncio
+    async def test_params_are_part_of_key(self, service: JellyfinService):
+        await service.get_items(parent_id="lib", limit=20)
+        await service.get_items(parent_id="lib", limit=40)
+        assert len(service.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_refreshing(self, service: JellyfinService):
+        first = await service.get_items(parent_id="lib")
+        _age_entries(service, settings.JELLYFIN_CACHE_TTL_ITEMS + 1)
+
+        stale = await service.get_items(parent_id="lib")
+        assert stale is first
+        await asyncio.sleep(0.01)  # 백그라운드 갱신 완료 대기
+
+        assert len(service.calls) == 2
+        assert service.cache.stats()["stale_hits"] == 1
+        refreshed = await service.get_items(parent_id="lib")
+        assert refreshed is not first
+
+    @pytest.mark.asyncio
+    async def test_expired_value_is_refetched(self, service: JellyfinService):
+        await service.get_items(parent_id="lib")
+        _age_entries(
+            service, settings.JELLYFIN_CACHE_TTL_ITEMS + settings.JELLYFIN_CACHE_STALE_SEC + 1
+        )
+
+        await service.get_items(parent_id="lib")
+        assert len(service.calls) == 2
+        assert service.cache.stats()["misses"] == 2
+
+
+class TestRequestCoalescing:
+    """[JELLYFIN] 동시 동일 요청 single-flight"""
+
+    @pytest.fixture
+    def upstream(self, monkeypatch: pytest.MonkeyPatch) -> JellyfinService:
+        service = JellyfinService()
+        service.calls = []
+
+        async def fake_send(method, endpoint, params=None, json_data=None, timeout=None):
+            service.calls.append((method, endpoint, params))
+            await asyncio.sleep(0.01)
+            return ITEMS_RESPONSE
+
+        monkeypatch.setattr(service, "_send", fake_send)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_share_upstream(self, upstream: JellyfinService):
+        results = await asyncio.gather(*(
+            upstream._request("GET", "/Items", params={"ParentId": "lib", "Limit": 20})
+            for _ in range(50)
+        ))
+        assert len(upstream.calls) == 1
+        assert all(r is results[0] for r in results)
+
+    @pytest.mark.asyncio
+    async def test_param_order_is_normalized(self, upstream: JellyfinService):
+        await asyncio.gather(
+            upstream._request("GET", "/Items", params={"ParentId": "lib", "Limit": 20}),
+            upstream._request("GET", "/Items", params={"limit": "20", "parentId": "lib"}),
+        )
+        assert len(upstream.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_sequential_and_different_requests_are_not_merged(
+        self, upstream: JellyfinService
+    ):
+        await upstream._request("GET", "/Items", params={"Limit": 20})
+        await upstream._request("GET", "/Items", params={"Limit": 20})
+        await asyncio.gather(
+            upstream._request("GET", "/Items", params={"Limit": 20}),
+            upstream._request("GET", "/Items", params={"Limit": 40}),
+        )
+        assert len(upstream.calls) == 4
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self, upstream: JellyfinService):
+        first = asyncio.create_task(upstream._request("GET", "/Library/MediaFolders"))
+        second = asyncio.create_task(upstream._request("GET", "/Library/MediaFolders"))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == ITEMS_RESPONSE
+        assert len(upstream.calls) == 1
+
+
+class TestCatalogMirror:
+    """[JELLYFIN] 카탈로그 미러 행 변환"""
+
+    def test_item_to_row_keeps_raw_item(self):
+        library = JellyfinLibrary(id="lib1", name="WSOP")
+        item = {
+            "Id": "a1",
+            "Name": "Main Event Day 1",
+            "SortName": "main event day 1",
+            "Type": "Video",
+            "Path": "/media/wsop/2024/day1.mp4",
+            "RunTimeTicks": 36_000_000_000,
+            "DateCreated": "2024-07-01T12:00:00.1234567Z",
+            "DateLastSaved": "2024-07-02T08:30:00Z",
+            "ImageTags": {"Primary": "abc"},
+            "MediaSources": [{"Id": "a1", "Container": "mp4"}],
+        }
+
+        row = item_to_row(item, library)
+
+        assert row["library_id"] == "lib1"
+        assert row["library_name"] == "WSOP"
+        assert row["date_created"].year == 2024
+        assert row["date_last_saved"].tzinfo is not None
+        assert row["data"]["MediaSources"][0]["Container"] == "mp4"
+
+    def test_missing_dates_are_null(self):
+        row = item_to_row({"Id": "b2", "Name": "Clip"}, JellyfinLibrary(id="l", name="HCL"))
+        assert row["date_created"] is None
+        assert row["type"] == "Video"
+
+
+class TestThumbnailCache:
+    """[JELLYFIN] 썸네일 프록시 디스크 캐시"""
+
+    @pytest.fixture
+    def thumbnails(self, tmp_path, monkeypatch: pytest.MonkeyPatch):
+        from src.services.thumbnail_cache import ThumbnailCacheService
+
+        monkeypatch.setattr(settings, "THUMBNAIL_CACHE_PATH", str(tmp_path / "thumbs"))
+        monkeypatch.setattr(settings, "THUMBNAIL_CACHE_MAX_BYTES", 2500)
+
+        class FakeJellyfin:
+            calls: list = []
+
+            async def get_image(self, item_id, image_type, max_width=None, max_height=None, tag=None):
+                self.calls.append((item_id, max_width, tag))
+                await asyncio.sleep(0)
+                return None if item_id == "missing" else b"\x89PNG" + b"\0" * 996
+
+        return ThumbnailCacheService(FakeJellyfin())
+
+    @pytest.mark.asyncio
+    async def test_fetches_once_per_size(self, thumbnails):
+        paths = await asyncio.gather(*(thumbnails.get("a1", width=480, tag="t1") for _ in range(5)))
+        await thumbnails.get("a1", width=480, tag="t1")
+        await thumbnails.get("a1", width=240, tag="t1")
+
+        assert len(thumbnails.jellyfin.calls) == 2
+        assert all(p == paths[0] for p in paths)
+        assert thumbnails.get_etag(paths[0]).startswith('"')
+
+    @pytest.mark.asyncio
+    async def test_size_bound_evicts_least_recent(self, thumbnails):
+        first = await thumbnails.get("a1", width=480)
+        await thumbnails.get("a2", width=480)
+        await thumbnails.get("a1", width=480)  # a1 최근 사용
+        await thumbnails.get("a3", width=480)
+
+        assert first.exists()
+        assert not thumbnails.get_path("a2", width=480).exists()
+        assert thumbnails.stats()["bytes_used"] <= 2500
+
+    @pytest.mark.asyncio
+    async def test_sizes_snap_to_allowed_set(self, thumbnails):
+        first = await thumbnails.get("a1", width=470)
+        second = await thumbnails.get("a1", width=480)
+        await thumbnails.get("a1", width=5000)
+
+        assert first == second
+        assert [width for _, width, _ in thumbnails.jellyfin.calls] == [480, 1920]
+
+    @pytest.mark.asyncio
+    async def test_file_written_by_other_process_is_hit(self, thumbnails):
+        from src.services.thumbnail_cache import ThumbnailCacheService
+
+        await thumbnails.get("a1", width=480)
+        other = ThumbnailCacheService(thumbnails.jellyfin)
+        other.cache._loaded = True  # 인덱스 로드 이후에 다른 프로세스가 쓴 상황
+        await thumbnails.get("a2", width=480)
+
+        assert await other.get("a2", width=480) == thumbnails.get_path("a2", width=480)
+        assert len(thumbnails.jellyfin.calls) == 2
+        assert other.stats()["hits"] == 1
+        assert other.stats()["bytes_used"] == 1000
+
+    @pytest.mark.asyncio
+    async def test_load_refetches_evicted_file(self, thumbnails):
+        path = await thumbnails.get("a1", width=480)
+        path.unlink()
+
+        loaded, etag = await thumbnails.load("a1", width=480)
+
+        assert loaded == path and path.stat().st_size == 1000
+        assert etag == thumbnails.get_etag(path)
+        assert len(thumbnails.jellyfin.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_endpoint_sends_file_and_304_without_reading(
+        self, thumbnails, monkeypatch: pytest.MonkeyPatch
+    ):
+        from fastapi.responses import FileResponse
+        from starlette.requests import Request
+
+        from src.api.v1 import jellyfin as jellyfin_api
+        from src.services.thumbnail_cache import read_media_type
+
+        reads = []
+
+        def counting_read(path):
+            reads.append(path)
+            return read_media_type(path)
+
+        monkeypatch.setattr(jellyfin_api, "thumbnail_cache_service", thumbnails)
+        monkeypatch.setattr(jellyfin_api, "read_media_type", counting_read)
+
+        def request(headers: dict[str, str]) -> Request:
+            raw = [(k.encode(), v.encode()) for k, v in headers.items()]
+            return Request({"type": "http", "method": "GET", "headers": raw})
+
+        async def fetch(headers: dict[str, str]):
+            return await jellyfin_api.get_thumbnail(
+                "a1", request(headers), width=480, height=None, image_type="Primary", tag=None
+            )
+
+        response = await fetch({})
+        assert isinstance(response, FileResponse)
+        assert response.media_type == "image/png"
+
+        cached = await fetch({"if-none-match": response.headers["etag"]})
+        assert cached.status_code == 304
+        assert len(reads) == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_image_is_none(self, thumbnails):
+        assert await thumbnails.get("missing") is None
+        assert await thumbnails.load("missing") is None
+
+    def test_sniff_media_type(self):
+        from src.services.thumbnail_cache import sniff_media_type
+
+        assert sniff_media_type(b"\x89PNG\r\n\x1a\n") == "image/png"
+        assert sniff_media_type(b"RIFF\0\0\0\0WEBP") == "image/webp"
+        assert sniff_media_type(b"\xff\xd8\xff\xe0") == "image/jpeg"
+
+
+class TestHlsProxy:
+    """[JELLYFIN] HLS 리버스 프록시"""
+
+    UPSTREAM = "http://jellyfin:8096/Videos/a1/main.m3u8?PlaySessionId=s1&api_key=secret"
+
+    def test_rewrite_strips_key_and_proxies_uris(self):
+        from src.services.jellyfin_hls import rewrite_playlist
+
+        text = "\n".join([
+            "#EXTM3U",
+            '#EXT-X-MAP:URI="hls1/main/-1.mp4?PlaySessionId=s1&api_key=secret"',
+            "#EXTINF:6.0,",
+            "hls1/main/0.ts?PlaySessionId=s1&api_key=secret",
+            "#EXT-X-ENDLIST",
+        ])
+
+        result = rewrite_playlist(
+            text, self.UPSTREAM, "/Videos/a1/", "/api/v1/jellyfin/stream/a1"
+        )
+
+        assert "secret" not in result
+        assert '#EXT-X-MAP:URI="/api/v1/jellyfin/stream/a1/hls1/main/-1.mp4?PlaySessionId=s1"' in result
+        assert "/api/v1/jellyfin/stream/a1/hls1/main/0.ts?PlaySessionId=s1" in result.splitlines()
+
+    def test_out_of_scope_uris_are_dropped(self):
+        from src.services.jellyfin_hls import rewrite_playlist
+
+        text = "\n".join([
+            "#EXTM3U",
+            '#EXT-X-MEDIA:TYPE=SUBTITLES,URI="/Videos/b2/subs.m3u8?api_key=secret"',
+            "#EXT-X-STREAM-INF:BANDWIDTH=1000",
+            "/Videos/b2/main.m3u8?api_key=secret",
+            "#EXT-X-STREAM-INF:BANDWIDTH=2000",
+            "main.m3u8?PlaySessionId=s1",
+        ])
+
+        result = rewrite_playlist(text, self.UPSTREAM, "/Videos/a1/", "/p/a1")
+
+        assert "jellyfin:8096" not in result and "b2" not in result
+        assert result.splitlines() == [
+            "#EXTM3U",
+            "#EXT-X-STREAM-INF:BANDWIDTH=2000",
+            "/p/a1/main.m3u8?PlaySessionId=s1",
+        ]
+
+    def test_play_session_is_per_viewer_and_segments_shared(self):
+        from src.services.jellyfin_hls import JellyfinHlsService
+
+        hls = JellyfinHlsService()
+        assert ("PlaySessionId", "wsoptv-a1-7") in hls._upstream_params("a1", "stream.m3u8", [], "7")
+        assert ("PlaySessionId", "wsoptv-a1-8") in hls._upstream_params("a1", "stream.m3u8", [], "8")
+        assert JellyfinHlsService.cache_key("a1", "0.ts", [("b", "2"), ("a", "1")]) == \
+            JellyfinHlsService.cache_key("a1", "0.ts", [("a", "1"), ("api_key", "x"), ("b", "2")])
+        assert JellyfinHlsService.cache_key("a1", "0.ts", [("PlaySessionId", "wsoptv-a1-7")]) == \
+            JellyfinHlsService.cache_key("a1", "0.ts", [("PlaySessionId", "wsoptv-a1-8")])
+
+    @pytest.mark.asyncio
+    async def test_segment_is_fetched_once(self, tmp_path, monkeypatch: pytest.MonkeyPatch):
+        import httpx
+        from src.services.jellyfin_hls import JellyfinHlsService
+
+        monkeypatch.setattr(settings, "JELLYFIN_HLS_CACHE_PATH", str(tmp_path))
+        hls = JellyfinHlsService()
+        calls = []
+
+        async def fake_get(item_id, path, params):
+            calls.append(path)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, content=b"\x47" * 188)
+
+        monkeypatch.setattr(hls, "_get", fake_get)
+        paths = await asyncio.gather(*(
+            hls.get_segment("a1", "hls1/main/0.ts", [("PlaySessionId", "s1")])
+            for _ in range(10)
+        ))
+        await hls.get_segment("a1", "hls1/main/0.ts", [("PlaySessionId", "s1")])
+
+        assert calls == ["hls1/main/0.ts"]
+        assert paths[0].read_bytes()[:1] == b"\x47"
+
+
+class TestClientResilience:
+    """[JELLYFIN] GET 재시도 + 서킷 브레이커"""
+
+    @pytest.fixture
+    def flaky(self, monkeypatch: pytest.MonkeyPatch) -> JellyfinService:
+        """응답 상태 코드 목록을 차례로 돌려주는 가짜 Jellyfin"""
+        import httpx
+
+        monkeypatch.setattr(settings, "JELLYFIN_CACHE_REDIS_ENABLED", False)
+        monkeypatch.setattr(settings, "JELLYFIN_RETRY_BACKOFF_SEC", 0)
+        service = JellyfinService()
+        service.statuses = []
+        service.calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            service.calls += 1
+            code = service.statuses.pop(0) if service.statuses else 200
+            if code == 0:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(code, json=ITEMS_RESPONSE)
+
+        service._client = httpx.AsyncClient(
+            base_url="http://jellyfin", transport=httpx.MockTransport(handler)
+        )
+        return service
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_retried(self, flaky: JellyfinService):
+        flaky.statuses = [503, 0]
+        data = await flaky._request("GET", "/Items")
+        assert data == ITEMS_RESPONSE
+        assert flaky.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, flaky: JellyfinService):
+        from src.services.jellyfin import JellyfinError
+
+        flaky.statuses = [404]
+        with pytest.raises(JellyfinError):
+            await flaky._request("GET", "/Items")
+        assert flaky.calls == 1
+        assert flaky.breaker.failures == 0
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self, flaky: JellyfinService):
+        from src.services.jellyfin import JellyfinError
+
+        flaky.breaker.failure_threshold = 2
+        flaky.statuses = [503] * 10
+        with pytest.raises(JellyfinError):
+            await flaky._request("GET", "/Items")
+        assert flaky.breaker.state == "open"
+        assert flaky.calls == 2  # 회로가 열리면 남은 재시도 생략
+
+        with pytest.raises(JellyfinError) as exc:
+            await flaky._request("GET", "/Items")
+        assert exc.value.status_code == 503
+        assert flaky.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_outage_serves_expired_cache(self, flaky: JellyfinService):
+        first = await flaky.get_items(parent_id="lib")
+        _age_entries(
+            flaky, settings.JELLYFIN_CACHE_TTL_ITEMS + settings.JELLYFIN_CACHE_STALE_SEC + 1
+        )
+        flaky.statuses = [0] * 10
+
+        assert await flaky.get_items(parent_id="lib") is first
+
+    def test_half_open_allows_single_probe(self):
+        from src.services.circuit_breaker import CircuitBreaker
+
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        assert breaker.state == "half_open"
+        assert breaker.allow() is True
+        breaker.reset_timeout = 60
+        assert breaker.allow() is False
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+
+class TestLeanDecoding:
+    """[JELLYFIN] 목록 fast path (필요 필드만 요청, 단일 변환)"""
+
+    ITEM = {
+        "Id": "a1",
+        "Name": "Main Event Day 1",
+        "Type": "Video",
+        "Overview": "Final table",
+        "Path": "/media/wsop/day1.mp4",
+        "SeriesName": "WSOP 2024",
+        "ProductionYear": 2024,
+        "DateCreated": "2024-07-01T12:00:00.1234567Z",
+        "RunTimeTicks": 36_000_000_000,
+        "ImageTags": {"Primary": "abc"},
+    }
+
+    def test_matches_validated_conversion(self):
+        from src.schemas.jellyfin import JellyfinContentResponse, JellyfinItem
+
+        validated = JellyfinContentResponse.from_jellyfin_item(
+            JellyfinItem(**self.ITEM), "http://jellyfin", "key"
+        )
+        lean = JellyfinContentResponse.from_jellyfin_data(self.ITEM, "http://jellyfin", "key")
+
+        assert lean.model_dump(by_alias=True) == validated.model_dump(by_alias=True)
+
+    @pytest.mark.asyncio
+    async def test_contents_request_only_needed_fields(self, service: JellyfinService):
+        result = await service.get_contents(page=1, limit=20)
+
+        _, endpoint, params = service.calls[0]
+        assert endpoint == "/Items"
+        assert "MediaSources" not in params["Fields"]
+        assert params["EnableUserData"] == "false"
+        assert result.items[0].jellyfin_id == "a1"
+        assert result.total == 1 and result.has_next is False
+
+
+class TestBatchLookup:
+    """[JELLYFIN] /Items?Ids= 배치 조회"""
+
+    @pytest.fixture
+    def catalog(self, monkeypatch: pytest.MonkeyPatch) -> JellyfinService:
+        monkeypatch.setattr(settings, "JELLYFIN_CACHE_REDIS_ENABLED", False)
+        service = JellyfinService()
+        service.calls = []
+
+        async def fake_request(method, endpoint, params=None, json_data=None, timeout=None):
+            service.calls.append(params)
+            await asyncio.sleep(0)
+            ids = [i for i in params["Ids"].split(",") if i != "missing"]
+            return {"Items": [{"Id": i, "Name": f"Item {i}", "Type": "Video"} for i in ids]}
+
+        monkeypatch.setattr(service, "_request", fake_request)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_request(self, catalog: JellyfinService):
+        contents = await catalog.get_contents_by_ids(["a1", "b2", "missing", "c3"])
+
+        assert [c.jellyfin_id for c in contents] == ["a1", "b2", "c3"]
+        assert len(catalog.calls) == 1
+        assert catalog.calls[0]["Ids"] == "a1,b2,missing,c3"
+
+    @pytest.mark.asyncio
+    async def test_batch_results_feed_per_item_cache(self, catalog: JellyfinService):
+        await catalog.get_contents_by_ids(["a1", "b2"])
+        content = await catalog.get_content("b2")
+
+        assert content.title == "Item b2"
+        assert len(catalog.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_endpoint_normalizes_requested_ids(
+        self, catalog: JellyfinService, monkeypatch: pytest.MonkeyPatch
+    ):
+        from src.api.v1 import jellyfin as jellyfin_api
+
+        monkeypatch.setattr(settings, "JELLYFIN_MIRROR_ENABLED", False)
+        monkeypatch.setattr(jellyfin_api, "get_jellyfin_service", lambda: catalog)
+
+        response = await jellyfin_api.get_contents_batch(
+            None, None, ids="A1-B2, c3,a1b2,missing"
+        )
+
+        assert [c.jellyfin_id for c in response.data] == ["a1b2", "c3"]
+        assert catalog.calls[0]["Ids"] == "a1b2,c3,missing"
+
+    @pytest.mark.asyncio
+    async def test_missing_item_is_404(self, catalog: JellyfinService):
+        from src.services.jellyfin import JellyfinError
+
+        with pytest.raises(JellyfinError) as exc:
+            await catalog.get_content("missing")
+        assert exc.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_loader_splits_at_max_batch(self):
+        from src.services.batch_loader import BatchLoader
+
+        batches = []
+
+        async def batch_fn(keys):
+            batches.append(keys)
+            return {k: k * 2 for k in keys}
+
+        loader = BatchLoader(batch_fn, window_sec=0.01, max_batch=3)
+        results = await loader.load_many([1, 2, 3, 4, 2])
+
+        assert results == [2, 4, 6, 8, 4]
+        assert batches == [[1, 2, 3], [4, 2]]
+
+
+class TestFakeJellyfin:
+    """[JELLYFIN] benchmarks.fake_jellyfin 대역 서버 연동"""
+
+    @pytest.mark.asyncio
+    async def test_service_against_fake_server(self, monkeypatch: pytest.MonkeyPatch):
+        import httpx
+        from benchmarks.fake_jellyfin import create_app
+
+        monkeypatch.setattr(settings, "JELLYFIN_CACHE_REDIS_ENABLED", False)
+        fake = create_app(items=50, libraries=2, latency_ms=0, jitter_ms=0)
+        service = JellyfinService()
+        service._client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=fake), base_url="http://fake-jellyfin"
+        )
+
+        libraries = await service.get_libraries()
+        contents = await service.get_contents(library_name=libraries[0].name, limit=10)
+        ids = [content.jellyfin_id for content in contents.items[:3]]
+        batch = await service.get_contents_by_ids(ids + ["0" * 32])
+        image = await service.get_image(ids[0], max_width=64)
+        await service.close()
+
+        assert contents.total == 25 and len(contents.items) == 10
+        assert [content.jellyfin_id for content in batch] == ids
+        assert image.startswith(b"\x89PNG")
+        assert fake.state.requests["/Items"] == 2
+
+
+class TestSearchIndex:
+    """[JELLYFIN] MeiliSearch contents 인덱스 색인/검색"""
+
+    ITEM = {
+        "Id": "b2",
+        "Name": "HCL 2024 Cash Game",
+        "Overview": "High stakes",
+        "RunTimeTicks": 7200 * 10_000_000,
+        "ImageTags": {"Primary": "tag1"},
+        "SeriesName": "HCL 2024",
+        "Path": "/media/hcl/2024.mp4",
+        "ProductionYear": 2024,
+        "DateCreated": "2024-07-01T12:00:00.0000000Z",
+        "Type": "Video",
+    }
+
+    def test_document_round_trip(self):
+        from src.schemas.jellyfin import JellyfinContentResponse
+        from src.services.jellyfin_search import document_to_content, item_to_document
+
+        library = JellyfinLibrary(Id="lib1", Name="HCL")
+        document = item_to_document(self.ITEM, library, indexed_at=100)
+
+        assert document["id"] == "jellyfin-b2"
+        assert document["source"] == "jellyfin"
+        assert document["library"] == "HCL" and document["library_id"] == "lib1"
+        assert document["created_at"] == 1719835200
+
+        expected = JellyfinContentResponse.from_jellyfin_data(self.ITEM, "http://jf", "key")
+        assert document_to_content(document, "http://jf", "key") == expected
+
+    def test_source_filter(self, monkeypatch: pytest.MonkeyPatch):
+        from src.services.search import SearchService
+
+        build = SearchService._build_filter
+        assert build(None, {"source": "native"}) == 'source != "jellyfin"'
+        assert build(None, {"source": "jellyfin", "library": 'WS"OP'}) == (
+            'source = "jellyfin" AND library = "WS\\"OP"'
+        )
+
+        # 색인이 꺼져 있으면 source를 지정하지 않은 검색에 source 조건 없음
+        monkeypatch.setattr(settings, "JELLYFIN_SEARCH_INDEX_ENABLED", False)
+        assert build(None, {"year": 2024}) == "year = 2024"
+        assert build(None, {}) is None
+
+        monkeypatch.setattr(settings, "JELLYFIN_SEARCH_INDEX_ENABLED", True)
+        assert build(None, {"year": 2024}) == 'year = 2024 AND source != "jellyfin"'
+        assert build(None, {"source": "all"}) is None
+
+    @pytest.mark.asyncio
+    async def test_fallback_search_keeps_library_and_page(
+        self, service: JellyfinService, monkeypatch: pytest.MonkeyPatch
+    ):
+        from src.api.v1 import jellyfin as jellyfin_api
+
+        monkeypatch.setattr(settings, "JELLYFIN_SEARCH_INDEX_ENABLED", False)
+        monkeypatch.setattr(jellyfin_api, "get_jellyfin_service", lambda: service)
+
+        response = await jellyfin_api.search_contents(
+            None, q="cash", library="wsop main event day 1", page=3, limit=10
+        )
+
+        (_, endpoint, params), = [c for c in service.calls if c[1] == "/Items"]
+        assert params["ParentId"] == "a1" and params["StartIndex"] == 20
+        assert params["SearchTerm"] == "cash" and params["Limit"] == 10
+        assert response.data.page == 3
+
+    @pytest.mark.asyncio
+    async def test_search_from_index(self, service: JellyfinService):
+        from src.services.jellyfin_search import JellyfinSearchIndexer, item_to_document
+
+        document = item_to_document(self.ITEM, JellyfinLibrary(Id="lib1", Name="HCL"), 100)
+        searches = []
+
+        class FakeIndex:
+            def search(self, query, options):
+                searches.append((query, options))
+                return {"hits": [document], "estimatedTotalHits": 21}
+
+        class FakeSearch:
+            _indexes = {"contents": "contents"}
+            client = type("Client", (), {"index": lambda self, name: FakeIndex()})()
+
+        indexer = JellyfinSearchIndexer(service, FakeSearch())
+        result = await indexer.search("cash", library='HC"L', page=2, limit=10)
+
+        assert [item.jellyfin_id for item in result.items] == ["b2"]
+        assert result.total == 21 and result.has_next
+        assert searches == [("cash", {
+            "filter": 'source = "jellyfin" AND library = "HC\\"L"',
+            "offset": 10,
+            "limit": 10,
+        })]
+        assert service.calls == []
@@ -0,0 +1,292 @@
+"""
+Media Library Tests
+
+NAS 미디어 파일 처리(중복 탐지 등) 단위 테스트
+
+Run with: pytest tests/test_media.py -v
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.core.config import settings
+from src.models.file import File
+from src.services import dedup, metadata_enrichment
+from src.services.dedup import DedupService, compute_fingerprint
+from src.services.media_probe import parse_probe_output
+from src.services.metadata_enrichment import MetadataEnrichmentService
+from src.services.nas_scanner import NasScanner
+
+
+class TestDedupFingerprint:
+    """[MEDIA] 샘플 블록 fingerprint"""
+
+    def test_copies_share_fingerprint(self, tmp_path: Path):
+        data = bytes(range(256)) * 4096  # 1 MiB
+        a, b = tmp_path / "a" / "x.mp4", tmp_path / "b" / "x.mp4"
+        for path in (a, b):
+            path.parent.mkdir()
+            path.write_bytes(data)
+
+        assert compute_fingerprint(str(a), 8, 4096) == compute_fingerprint(str(b), 8, 4096)
+
+    def test_size_or_sampled_bytes_differ(self, tmp_path: Path):
+        data = bytearray(bytes(range(256)) * 4096)
+        a, b, c = tmp_path / "a.mp4", tmp_path / "b.mp4", tmp_path / "c.mp4"
+        a.write_bytes(data)
+        b.write_bytes(data + b"\0")
+        data[0] ^= 0xFF  # 첫 블록은 항상 샘플링됨
+        c.write_bytes(data)
+
+        fp = compute_fingerprint(str(a), 8, 4096)
+        assert fp != compute_fingerprint(str(b), 8, 4096)
+        assert fp != compute_fingerprint(str(c), 8, 4096)
+
+
+class TestDedupScan:
+    """[MEDIA] 중복 그룹/대표 파일 선정"""
+
+    @staticmethod
+    def make_file(file_id: str, size: int, **fields: Any) -> SimpleNamespace:
+        return SimpleNamespace(
+            id=file_id,
+            nas_path=f"{settings.NAS_MOUNT_PATH}/{file_id}.mp4",
+            size_bytes=size,
+            content_hash=fields.get("content_hash"),
+            duplicate_of=fields.get("duplicate_of"),
+        )
+
+    @pytest.fixture
+    def fingerprints(self, monkeypatch: pytest.MonkeyPatch) -> dict[str, str]:
+        """파일 ID → fingerprint (NAS 읽기 대신)"""
+        fingerprints: dict[str, str] = {}
+
+        def fake_fingerprint(path: str) -> str:
+            return fingerprints[Path(path).stem]
+
+        monkeypatch.setattr(dedup, "compute_fingerprint", fake_fingerprint)
+        return fingerprints
+
+    @pytest.mark.asyncio
+    async def test_groups_and_canonical_selection(self, fingerprints: dict[str, str]):
+        files = [
+            self.make_file("c", 100),
+            self.make_file("b", 100, duplicate_of="a"),
+            self.make_file("a", 100),
+            self.make_file("d", 100),
+            self.make_file("e", 200),
+        ]
+        fingerprints.update(a="h1", b="h1", c="h1", d="h2")
+        db = FakeSession(files, [])
+
+        stats = await DedupService().scan(db)
+
+        assert stats["candidates"] == 4 and stats["duplicates"] == 2
+        assert {f.id: f.duplicate_of for f in files} == {
+            "a": None, "b": "a", "c": "a", "d": None, "e": None,
+        }
+        assert files[4].content_hash is None  # 크기가 유일하면 해시하지 않음
+        assert not any(stmt.is_dml for stmt in db.statements)
+
+    @pytest.mark.asyncio
+    async def test_changed_file_is_unflagged(self, fingerprints: dict[str, str]):
+        # b는 내용이 바뀌어 content_hash가 초기화됨 (duplicate_of는 이전 스캔 결과)
+        files = [
+            self.make_file("a", 100, content_hash="h1"),
+            self.make_file("b", 100, duplicate_of="a"),
+            self.make_file("c", 300, duplicate_of="a"),
+        ]
+        fingerprints.update(b="h2")
+
+        stats = await DedupService().scan(FakeSession(files, []))
+
+        assert [f.duplicate_of for f in files] == [None, None, None]
+        assert stats["duplicates"] == 0 and stats["unflagged"] == 2
+
+    @pytest.mark.asyncio
+    async def test_merge_repoints_contents_and_hands(self, fingerprints: dict[str, str]):
+        files = [self.make_file("a", 100), self.make_file("b", 100)]
+        fingerprints.update(a="h1", b="h1")
+        db = FakeSession(files, [])
+
+        await DedupService().scan(db, merge=True)
+
+        dialect = postgresql.dialect()
+        updates = [stmt.compile(dialect=dialect) for stmt in db.statements if stmt.is_dml]
+        assert [u.statement.table.name for u in updates] == ["contents", "hands"]
+        assert all(u.params == {"file_id": "a", "file_id_1": "b"} for u in updates)
+
+
+class TestProbeParsing:
+    """[MEDIA] ffprobe 출력 변환"""
+
+    def test_parse_probe_output(self):
+        result = parse_probe_output({
+            "format": {"duration": "3601.48", "bit_rate": "8000000", "size": "123"},
+            "streams": [
+                {"codec_type": "audio", "codec_name": "aac"},
+                {
+                    "codec_type": "video",
+                    "codec_name": "h264",
+                    "width": 1920,
+                    "height": 1080,
+                    "avg_frame_rate": "30000/1001",
+                },
+            ],
+        })
+        assert result["duration_sec"] == 3601
+        assert result["resolution"] == "1920x1080"
+        assert result["codec"] == "h264"
+        assert result["fps"] == 29.97
+        assert result["bitrate_kbps"] == 8000
+
+
+class TestNasScanner:
+    """[MEDIA] NAS 증분 스캔"""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_tree_is_skipped(self, tmp_path: Path):
+        root = tmp_path / "nas"
+        (root / "WSOP" / "2024").mkdir(parents=True)
+        (root / "WSOP" / "2024" / "day1.mp4").write_bytes(b"x")
+        (root / "WSOP" / "notes.txt").write_text("ignored")
+        state = tmp_path / "state.json"
+
+        scanner = NasScanner(root=str(root), state_path=str(state))
+        changed, _ = await scanner.find_changed()
+        assert changed == [str(root / "WSOP" / "2024" / "day1.mp4")]
+        scanner.save_state()
+
+        rescan = NasScanner(root=str(root), state_path=str(state))
+        rescan.load_state()
+        changed, stats = await rescan.find_changed()
+        assert changed == []
+        assert stats["dirs_listed"] == 0
+        assert stats["dirs_skipped"] == 3
+
+        (root / "WSOP" / "2024" / "day2.mp4").write_bytes(b"y")
+        changed, stats = await rescan.find_changed()
+        assert changed == [str(root / "WSOP" / "2024" / "day2.mp4")]
+        assert stats["dirs_listed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_growing_file_is_rechecked(self, tmp_path: Path):
+        root = tmp_path / "nas"
+        root.mkdir()
+        recording = root / "final_table.mp4"
+        recording.write_bytes(b"x")
+
+        scanner = NasScanner(root=str(root), state_path=str(tmp_path / "state.json"))
+        changed, _ = await scanner.find_changed()
+        assert changed == [str(recording)]
+
+        # 디렉터리 mtime은 그대로지만 쓰는 중인 파일은 다시 stat
+        with recording.open("ab") as f:
+            f.write(b"more")
+        changed, stats = await scanner.find_changed()
+        assert changed == [str(recording)]
+        assert stats["dirs_listed"] == 0
+
+        scanner.settle_sec = 0
+        changed, _ = await scanner.find_changed()
+        assert changed == []
+        assert scanner.state[str(root)]["pending"] == []
+
+
+class FakeSession:
+    """execute 호출을 기록하는 AsyncSession 대역"""
+
+    def __init__(self, files: list[Any], contents: list[tuple[str, int, int]]):
+        self.files = files
+        self.contents = contents
+        self.statements: list[Any] = []
+        self.updates: list[list[dict[str, Any]]] = []
+
+    async def execute(self, statement, params=None):
+        if params is not None:
+            self.updates.append(params)
+            return None
+
+        self.statements.append(statement)
+        if statement.is_dml:
+            return None
+        columns = statement.column_descriptions
+        if len(columns) == 1 and columns[0]["entity"] is File:
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: self.files))
+        return SimpleNamespace(all=lambda: self.contents)
+
+    async def commit(self):
+        pass
+
+
+class TestMetadataEnrichment:
+    """[MEDIA] ffprobe 메타데이터 일괄 보강"""
+
+    @staticmethod
+    def make_file(file_id: str, duration_sec: int, **fields: Any) -> SimpleNamespace:
+        return SimpleNamespace(
+            id=file_id,
+            nas_path=f"{settings.NAS_MOUNT_PATH}/{file_id}.mp4",
+            duration_sec=duration_sec,
+            resolution=fields.get("resolution"),
+            codec=fields.get("codec"),
+            fps=fields.get("fps"),
+            bitrate_kbps=fields.get("bitrate_kbps"),
+        )
+
+    @pytest.mark.asyncio
+    async def test_load_targets_skips_probed_files(self):
+        db = FakeSession([], [])
+        service = MetadataEnrichmentService()
+
+        await service._load_targets(db, all_files=False)
+        await service._load_targets(db, all_files=True)
+
+        dialect = postgresql.dialect()
+        missing, every = (str(stmt.compile(dialect=dialect)) for stmt in db.statements)
+        assert "files.probed_at IS NULL" in missing
+        assert "files.codec IS NULL" in missing
+        assert "WHERE" not in every
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_and_duration_mismatches(self, monkeypatch: pytest.MonkeyPatch):
+        files = [
+            self.make_file("f1", 3600, codec="h264"),
+            self.make_file("f2", 0),
+            self.make_file("f3", 100),
+        ]
+        probes = {
+            settings.convert_nas_path(files[0].nas_path): {
+                "duration_sec": 3000, "resolution": "1920x1080", "codec": "h264",
+                "fps": 29.97, "bitrate_kbps": 8000,
+            },
+            settings.convert_nas_path(files[1].nas_path): {
+                "duration_sec": 1200, "resolution": None, "codec": None,
+                "fps": None, "bitrate_kbps": None,
+            },
+        }
+
+        async def fake_probe_many(paths):
+            return {path: probes.get(path) for path in paths}
+
+        monkeypatch.setattr(metadata_enrichment, "probe_many", fake_probe_many)
+        db = FakeSession(files, [("f1", 10, 3600), ("f2", 11, 1195)])
+
+        stats = await MetadataEnrichmentService(tolerance_sec=10).enrich(db)
+
+        assert stats["targets"] == 3 and stats["updated"] == 2 and stats["failed"] == 1
+        # 배치당 한 번의 primary key 기준 bulk UPDATE, 프로브 성공 파일은 probed_at 기록
+        (rows,) = db.updates
+        assert [row["id"] for row in rows] == ["f1", "f2"]
+        assert rows[0]["duration_sec"] == 3000 and rows[0]["resolution"] == "1920x1080"
+        assert rows[1]["duration_sec"] == 1200 and rows[1]["codec"] is None
+        assert all(row["probed_at"] is not None for row in rows)
+
+        assert stats["mismatches"] == [
+            {"file_id": "f1", "content_id": None, "db_duration_sec": 3600, "actual_duration_sec": 3000},
+            {"file_id": "f1", "content_id": 10, "db_duration_sec": 3600, "actual_duration_sec": 3000},
+        ]
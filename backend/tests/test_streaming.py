@@ -0,0 +1,676 @@
+"""
+Streaming Service Tests
+
+FFmpeg/DB 없이 검증 가능한 StreamingService 단위 테스트
+
+Run with: pytest tests/test_streaming.py -v
+"""
+
+import asyncio
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.config import settings
+from src.services.admission import LOAD_NORMAL, LOAD_SHEDDING, AdmissionController
+from src.services.cluster import HashRing
+from src.services.mezzanine import MezzanineService
+from src.services.source_cache import SourceCacheService
+from src.services.streaming import StreamingService
+from src.services.transcode_queue import TranscodeQueue, execute_job, make_tmp_path
+
+
+@pytest.fixture
+def service(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> StreamingService:
+    """임시 캐시 디렉터리를 사용하는 StreamingService"""
+    monkeypatch.setattr(settings, "HLS_CACHE_PATH", str(tmp_path / "hls"))
+    return StreamingService()
+
+
+def _touch_segments(service: StreamingService, file_id: str, indexes: range) -> None:
+    for i in indexes:
+        path = service.get_segment_path(file_id, i, "720p")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"ts")
+
+
+class TestFastStart:
+    """[STREAM] 탐색 직후 빠른 시작 인코딩"""
+
+    def test_seek_into_uncached_region_is_fast(self, service: StreamingService):
+        """캐시되지 않은 구간으로 탐색하면 빠른 프리셋을 사용한다."""
+        assert service._should_fast_start("f1", 100, "720p")
+
+    def test_sequential_playback_returns_to_normal(self, service: StreamingService):
+        """직전 N개 세그먼트가 캐시되면 정상 프리셋으로 돌아간다."""
+        window = settings.HLS_FAST_START_SEGMENTS
+        _touch_segments(service, "f1", range(100, 100 + window))
+        assert not service._should_fast_start("f1", 100 + window, "720p")
+
+    def test_disabled(self, service: StreamingService, monkeypatch: pytest.MonkeyPatch):
+        """비활성화 시 항상 정상 프리셋"""
+        monkeypatch.setattr(settings, "HLS_FAST_START_ENABLED", False)
+        assert not service._should_fast_start("f1", 0, "720p")
+
+    def test_fast_command_lowers_complexity(self, service: StreamingService, tmp_path: Path):
+        """빠른 시작 명령은 ultrafast + zerolatency"""
+        cmd = service.build_segment_command(
+            "/mnt/nas/a.mp4", 3, "720p", tmp_path / "out.ts", settings.HLS_FAST_START_PRESET
+        )
+        assert cmd[cmd.index("-preset") + 1] == settings.HLS_FAST_START_PRESET
+        assert "zerolatency" in cmd
+        assert cmd[cmd.index("-ss") + 1] == str(3 * service.segment_duration)
+
+        normal = service.build_segment_command(
+            "/mnt/nas/a.mp4", 3, "720p", tmp_path / "out.ts", settings.HLS_SEGMENT_PRESET
+        )
+        assert "zerolatency" not in normal
+
+
+class TestAdmissionControl:
+    """[STREAM] 부하 기반 승인 제어"""
+
+    def test_normal_load_keeps_quality(self):
+        controller = AdmissionController(max_concurrency=2, target_wait_ms=100)
+        assert controller.level == LOAD_NORMAL
+        assert controller.choose_preset("fast") == "fast"
+        assert controller.filter_qualities(["720p", "1080p"]) == ["720p", "1080p"]
+
+    def test_saturation_degrades_then_recovers(self):
+        controller = AdmissionController(max_concurrency=2, target_wait_ms=100)
+
+        controller._record(250, alpha=1.0)
+        assert controller.level == LOAD_SHEDDING
+        assert controller.choose_preset("fast") == settings.ADMISSION_DEGRADED_PRESET
+        assert "1080p" not in controller.filter_qualities(["480p", "720p", "1080p"])
+
+        # 목표 대기 시간 근처에서는 단계를 유지 (히스테리시스)
+        controller._record(80, alpha=1.0)
+        assert controller.level == LOAD_SHEDDING
+
+        controller._record(10, alpha=1.0)
+        assert controller.level == LOAD_NORMAL
+
+    def test_lower_qualities(self):
+        controller = AdmissionController()
+        assert controller.lower_qualities("720p") == ["480p", "360p"]
+        assert controller.lower_qualities("360p") == []
+
+    @pytest.mark.asyncio
+    async def test_slot_limits_concurrency(self):
+        controller = AdmissionController(max_concurrency=1, target_wait_ms=100)
+        async with controller.slot():
+            assert controller.stats()["running"] == 1
+        assert controller.stats()["running"] == 0
+
+
+class TestMezzanineProxy:
+    """[STREAM] 저해상도 프록시 입력 선택"""
+
+    @pytest.fixture
+    def mezzanine(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> MezzanineService:
+        monkeypatch.setattr(settings, "MEZZANINE_ENABLED", True)
+        monkeypatch.setattr(settings, "MEZZANINE_PATH", str(tmp_path / "mezz"))
+        service = MezzanineService()
+        monkeypatch.setattr(service, "schedule", lambda file_id, nas_path: None)
+        return service
+
+    def test_high_quality_reads_master(self, mezzanine: MezzanineService):
+        assert mezzanine.get_source("f1", "/mnt/nas/a.mp4", "1080p") == "/mnt/nas/a.mp4"
+
+    def test_low_quality_uses_ready_proxy(self, mezzanine: MezzanineService):
+        assert mezzanine.get_source("f1", "/mnt/nas/a.mp4", "360p") == "/mnt/nas/a.mp4"
+
+        proxy = mezzanine.get_proxy_path("f1")
+        proxy.parent.mkdir(parents=True)
+        proxy.write_bytes(b"mp4")
+        assert mezzanine.get_source("f1", "/mnt/nas/a.mp4", "360p") == str(proxy)
+
+    def test_proxy_is_keyframe_dense(self, mezzanine: MezzanineService, tmp_path: Path):
+        cmd = mezzanine.build_proxy_command("/mnt/nas/a.mp4", tmp_path / "p.mp4")
+        assert "-force_key_frames" in cmd
+        assert f"scale=-2:{settings.MEZZANINE_HEIGHT}" in cmd
+
+
+class TestSourceCache:
+    """[STREAM] NAS 원본 로컬 스테이징 캐시"""
+
+    @pytest.fixture
+    def nas(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        nas = tmp_path / "nas"
+        nas.mkdir()
+        monkeypatch.setattr(settings, "NAS_MOUNT_PATH", str(nas))
+        monkeypatch.setattr(settings, "SOURCE_CACHE_ENABLED", True)
+        monkeypatch.setattr(settings, "SOURCE_CACHE_PATH", str(tmp_path / "local"))
+        monkeypatch.setattr(settings, "SOURCE_CACHE_MAX_BYTES", 25)
+        monkeypatch.setattr(settings, "SOURCE_CACHE_HOT_THRESHOLD", 2)
+        return nas
+
+    @pytest.mark.asyncio
+    async def test_hot_source_is_staged_and_evicted(self, nas: Path):
+        cache = SourceCacheService()
+        a, b = nas / "a.mp4", nas / "b.mp4"
+        a.write_bytes(b"a" * 10)
+        b.write_bytes(b"b" * 20)
+
+        # 한 시청자의 반복 요청은 hot으로 보지 않음
+        for _ in range(5):
+            assert await cache.resolve(str(a)) == str(a)
+            await cache.record_playback(str(a), "1")
+        assert not cache._tasks
+
+        await cache.record_playback(str(a), "2")  # 서로 다른 시청자 임계치 도달 → 스테이징 예약
+        await asyncio.gather(*cache._tasks.values())
+        assert await cache.resolve(str(a)) == str(cache.get_local_path(str(a)))
+
+        # 용량 한도 초과 시 LRU 제거
+        await cache.stage(str(b))
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["bytes_used"] == 20
+        assert stats["hits"] == 1
+        assert not cache.get_local_path(str(a)).exists()
+
+    @pytest.mark.asyncio
+    async def test_playback_tracking_is_bounded(self, nas: Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(settings, "SOURCE_CACHE_MAX_TRACKED", 2)
+        cache = SourceCacheService()
+        for name in ("a", "b", "c"):
+            await cache.record_playback(str(nas / f"{name}.mp4"), "1")
+        assert list(cache._playbacks) == [str(nas / "b.mp4"), str(nas / "c.mp4")]
+
+    @pytest.mark.asyncio
+    async def test_non_nas_path_passthrough(self, nas: Path):
+        cache = SourceCacheService()
+        assert await cache.resolve("/tmp/mezzanine/f1_480p.mp4") == "/tmp/mezzanine/f1_480p.mp4"
+
+    @pytest.mark.asyncio
+    async def test_freshness_check_runs_off_loop_and_is_reused(
+        self, nas: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        import threading
+
+        cache = SourceCacheService()
+        a = nas / "a.mp4"
+        a.write_bytes(b"a" * 10)
+        local = await cache.stage(str(a))
+        checks = []
+        same_size = SourceCacheService._same_size
+
+        def tracking_same_size(nas_path, local_path):
+            checks.append(threading.current_thread() is threading.main_thread())
+            return same_size(nas_path, local_path)
+
+        monkeypatch.setattr(cache, "_same_size", tracking_same_size)
+        cache._verified_at.clear()
+        assert await cache.resolve(str(a)) == str(local)
+        assert await cache.resolve(str(a)) == str(local)
+        assert checks == [False]
+
+        # TTL 경과 후 원본이 바뀌었으면 사본 폐기
+        a.write_bytes(b"a" * 12)
+        cache._verified_at.clear()
+        assert await cache.resolve(str(a)) == str(a)
+        assert not local.exists()
+
+
+class TestTranscodeQueue:
+    """[STREAM] 트랜스코딩 작업 큐"""
+
+    @pytest.fixture
+    def fake_ffmpeg(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """마지막 인자(출력 경로)에 명령줄을 기록하는 가짜 ffmpeg"""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        script = bin_dir / "ffmpeg"
+        script.write_text('#!/bin/sh\nfor last; do :; done\necho "$*" > "$last"\n')
+        script.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}:{os.environ['PATH']}")
+
+    @pytest.mark.asyncio
+    async def test_local_backend_replaces_output_atomically(self, fake_ffmpeg, tmp_path: Path):
+        queue = TranscodeQueue()
+        output = tmp_path / "out" / "segment_00000.ts"
+        tmp = make_tmp_path(output)
+
+        assert await queue.run("segment", ["ffmpeg", "-y", str(tmp)], tmp, output)
+        assert output.read_text().strip() == f"-y {tmp}"
+        assert not tmp.exists()
+
+    @pytest.mark.asyncio
+    async def test_rejects_non_ffmpeg_commands(self, tmp_path: Path):
+        output = tmp_path / "out.ts"
+        job = {"cmd": ["sh", "-c", "true"], "tmp_path": str(tmp_path / "x"), "output_path": str(output)}
+        assert not await execute_job(job)
+
+
+    @pytest.mark.asyncio
+    async def test_redis_proxy_jobs_use_background_queue(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        import src.services.transcode_queue as transcode_queue_module
+
+        class FakeRedis:
+            def __init__(self):
+                self.lists: dict[str, list[str]] = {}
+                self.keys: dict[str, str] = {}
+                self.waits: list[int] = []
+
+            async def set(self, key, value, nx=False, ex=None):
+                if nx and key in self.keys:
+                    return None
+                self.keys[key] = value
+                return True
+
+            async def lpush(self, key, value):
+                self.lists.setdefault(key, []).insert(0, value)
+
+            async def blpop(self, keys, timeout=0):
+                self.waits.append(timeout)
+                return None
+
+        redis = FakeRedis()
+        monkeypatch.setattr(transcode_queue_module, "get_redis", lambda: redis)
+        monkeypatch.setattr(settings, "TRANSCODE_QUEUE_BACKEND", "redis")
+        queue = TranscodeQueue()
+        output = tmp_path / "f1_480p.mp4"
+
+        assert not await queue.run("proxy", ["ffmpeg"], make_tmp_path(output), output)
+        # 진행 중인 같은 출력의 프록시 작업은 다시 넣지 않음
+        assert not await queue.run("proxy", ["ffmpeg"], make_tmp_path(output), output)
+        await queue.run("segment", ["ffmpeg"], tmp_path / ".s.tmp", tmp_path / "s.ts")
+
+        assert len(redis.lists[queue.background_key]) == 1
+        assert len(redis.lists[queue.queue_key]) == 1
+        assert redis.waits == [queue.background_timeout, queue.timeout]
+
+
+class TestHashRing:
+    """[STREAM] 파일 담당 노드 consistent-hash 링"""
+
+    def test_owner_is_stable(self):
+        ring = HashRing({"a": "http://a", "b": "http://b", "c": "http://c"})
+        assert ring.owner("file-1") == ring.owner("file-1")
+        assert HashRing().owner("file-1") is None
+
+    def test_node_leave_moves_only_its_keys(self):
+        nodes = {"a": "http://a", "b": "http://b", "c": "http://c"}
+        ring = HashRing(nodes)
+        keys = [f"file-{i}" for i in range(1000)]
+        before = {k: ring.owner(k) for k in keys}
+
+        ring.rebuild({"a": "http://a", "b": "http://b"})
+        moved = [k for k in keys if ring.owner(k) != before[k]]
+
+        assert moved
+        assert all(before[k] == "c" for k in moved)
+
+
+class TestClusterRouting:
+    """[STREAM] 노드 간 전달 요청 서명"""
+
+    def test_routed_header_requires_valid_signature(self):
+        from src.services.cluster import ClusterService
+
+        node = ClusterService()
+        path = "/api/v1/stream/1/segment_00003.ts"
+        header = node.routed_header(path)
+
+        assert node.is_routed(header, path)
+        assert not node.is_routed(header, "/api/v1/stream/1/segment_00004.ts")
+        assert not node.is_routed("backend-2", path)
+        assert not node.is_routed(f"backend-2:{header.partition(':')[2]}", path)
+        assert not node.is_routed(None, path)
+
+
+class TestContentAddressedCache:
+    """[STREAM] 미디어 파일 + 렌디션 파라미터 기준 캐시 키"""
+
+    def test_segment_path_is_keyed_by_file_and_rendition(self, service: StreamingService):
+        path = service.get_segment_path("f1", 7, "720p")
+        assert path.parent.parent.name == "f1"
+        assert path.parent.name == service.get_rendition_key("720p")
+        assert path.name == "segment_00007.ts"
+
+    def test_rendition_key_changes_with_encoding_params(
+        self, service: StreamingService, monkeypatch: pytest.MonkeyPatch
+    ):
+        before = service.get_rendition_key("720p")
+        assert before != service.get_rendition_key("480p")
+
+        monkeypatch.setattr(service, "segment_duration", 4)
+        assert service.get_rendition_key("720p") != before
+
+
+class TestHandMarkers:
+    """[STREAM] 플레이리스트 내 핸드 마커 (EXT-X-DATERANGE)"""
+
+    @pytest.mark.asyncio
+    async def test_quality_manifest_embeds_hands(self, service: StreamingService):
+        hand = SimpleNamespace(
+            id=42,
+            hand_number=7,
+            start_sec=90,
+            end_sec=150,
+            grade="S",
+            player_names=["Negreanu", 'Ivey "Tiger"'],
+            pot_size_bb=125.5,
+            is_all_in=True,
+        )
+        start = datetime(2024, 7, 1, 12, 0, tzinfo=timezone.utc)
+
+        manifest = await service.generate_quality_manifest(
+            1, 600, "720p", hands=[hand], program_start=start
+        )
+        lines = manifest.splitlines()
+        daterange = next(line for line in lines if line.startswith("#EXT-X-DATERANGE"))
+
+        assert "#EXT-X-PROGRAM-DATE-TIME:2024-07-01T12:00:00.000Z" in lines
+        assert 'ID="hand-42"' in daterange
+        assert 'START-DATE="2024-07-01T12:01:30.000Z"' in daterange
+        assert "DURATION=60.000" in daterange
+        assert 'X-GRADE="S"' in daterange
+        assert "X-POT-BB=125.5" in daterange
+        assert "X-PLAYERS=\"Negreanu,Ivey 'Tiger'\"" in daterange
+
+    @pytest.mark.asyncio
+    async def test_markers_are_opt_in(self, service: StreamingService):
+        manifest = await service.generate_quality_manifest(1, 600, "720p")
+        assert "DATERANGE" not in manifest
+        assert "PROGRAM-DATE-TIME" not in manifest
+
+
+class TestLivePlaylist:
+    """[STREAM] 녹화 중 파일 EVENT 플레이리스트"""
+
+    @pytest.fixture
+    def recording(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        source = tmp_path / "table1.ts"
+        source.write_bytes(b"\0" * 1024)
+
+        self.probes = 0
+
+        async def fake_probe(path, timeout=None):
+            self.probes += 1
+            await asyncio.sleep(0.01)
+            return {"duration": os.path.getsize(path) / 16}
+
+        monkeypatch.setattr("src.services.streaming.probe_media", fake_probe)
+        monkeypatch.setattr(settings, "HLS_LIVE_POLL_INTERVAL_SEC", 0.01)
+        return source
+
+    @pytest.mark.asyncio
+    async def test_finished_file_is_not_live(self, service: StreamingService, recording: Path):
+        old = datetime(2024, 1, 1).timestamp()
+        os.utime(recording, (old, old))
+        assert await service.get_live_status(str(recording)) is None
+
+    @pytest.mark.asyncio
+    async def test_event_playlist_lists_ready_segments(
+        self, service: StreamingService, recording: Path
+    ):
+        media_sec, growing = await service.get_live_status(str(recording))
+        assert (media_sec, growing) == (64.0, True)
+
+        manifest = await service.generate_event_manifest(1, media_sec, "720p", growing)
+        assert "#EXT-X-PLAYLIST-TYPE:EVENT" in manifest
+        assert "CAN-BLOCK-RELOAD=YES" in manifest
+        assert "#EXT-X-ENDLIST" not in manifest
+        # 64초 = 완전한 세그먼트 10개, 쓰기 중인 끝부분 1개 제외
+        assert manifest.count("#EXTINF") == 9
+
+    @pytest.mark.asyncio
+    async def test_finished_recording_closes_playlist(
+        self, service: StreamingService, recording: Path
+    ):
+        await service.get_live_status(str(recording))
+        old = datetime(2024, 1, 1).timestamp()
+        os.utime(recording, (old, old))
+
+        media_sec, growing = await service.get_live_status(str(recording))
+        manifest = await service.generate_event_manifest(1, media_sec, "720p", growing)
+        assert not growing
+        assert manifest.count("#EXTINF") == 11
+        assert "#EXTINF:4.000," in manifest
+        assert manifest.endswith("#EXT-X-ENDLIST")
+
+    @pytest.mark.asyncio
+    async def test_growing_file_probes_are_shared_and_throttled(
+        self, service: StreamingService, recording: Path
+    ):
+        statuses = await asyncio.gather(
+            *(service.get_live_status(str(recording)) for _ in range(20))
+        )
+        assert self.probes == 1
+        assert set(statuses) == {(64.0, True)}
+
+        # 크기가 바뀌어도 재프로브 간격 안에서는 캐시된 길이 사용
+        with open(recording, "ab") as f:
+            f.write(b"\0" * 256)
+        assert await service.get_live_status(str(recording)) == (64.0, True)
+        assert self.probes == 1
+
+    @pytest.mark.asyncio
+    async def test_live_sources_are_bounded(
+        self, service: StreamingService, recording: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(settings, "HLS_LIVE_MAX_SOURCES", 2)
+        for name in ("a.ts", "b.ts", "c.ts"):
+            path = recording.with_name(name)
+            path.write_bytes(b"\0" * 16)
+            await service.get_live_status(str(path))
+        assert list(service._live_sources) == [
+            str(recording.with_name("b.ts")), str(recording.with_name("c.ts"))
+        ]
+
+    @pytest.mark.asyncio
+    async def test_blocking_reload_waits_for_segment(
+        self, service: StreamingService, recording: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(settings, "HLS_LIVE_PROBE_INTERVAL_SEC", 0)
+
+        async def grow():
+            await asyncio.sleep(0.05)
+            with open(recording, "ab") as f:
+                f.write(b"\0" * 256)
+
+        task = asyncio.create_task(grow())
+        media_sec, growing = await service.wait_for_segment(str(recording), 10, timeout=2)
+        await task
+        assert growing
+        assert service.count_ready_segments(media_sec, growing) > 10
+
+
+class TestMultiview:
+    """[STREAM] 멀티뷰 모자이크 합성"""
+
+    @pytest.fixture
+    def multiview(self, service: StreamingService, monkeypatch: pytest.MonkeyPatch):
+        from src.services import multiview
+
+        monkeypatch.setattr(multiview, "streaming_service", service)
+        return multiview.MultiviewService()
+
+    def test_four_tiles_use_grid_with_selected_audio(self, multiview, tmp_path: Path):
+        cmd = multiview.build_command(["a.mp4", "b.mp4", "c.mp4", "d.mp4"], 2, 3, tmp_path / "out.ts")
+        graph = cmd[cmd.index("-filter_complex") + 1]
+
+        assert cmd.count("-i") == 4
+        assert cmd[cmd.index("-ss") + 1] == str(2 * settings.HLS_SEGMENT_DURATION)
+        assert cmd[cmd.index("-output_ts_offset") + 1] == str(2 * settings.HLS_SEGMENT_DURATION)
+        assert "xstack=inputs=4:layout=0_0|960_0|0_540|960_540" in graph
+        assert "3:a:0?" in cmd
+
+    def test_three_tiles_pad_with_blank(self, multiview, tmp_path: Path):
+        cmd = multiview.build_command(["a.mp4", "b.mp4", "c.mp4"], 0, 0, tmp_path / "out.ts")
+        graph = cmd[cmd.index("-filter_complex") + 1]
+        assert "color=c=black" in graph
+        assert "xstack=inputs=4" in graph
+
+    def test_cache_key_depends_on_tiles_and_audio(self, multiview):
+        base = multiview.get_key(["f1", "f2"], 0)
+        assert base == multiview.get_key(["f1", "f2"], 0)
+        assert base != multiview.get_key(["f1", "f2"], 1)
+        assert base != multiview.get_key(["f2", "f1"], 0)
+        assert multiview.get_segment_path(base, 0).is_relative_to(multiview.cache_path)
+
+    def test_manifest_segments_keep_query(self, multiview):
+        manifest = multiview.generate_manifest(20, "ids=1,2&audio=1")
+        assert "segment_00003.ts?ids=1,2&audio=1" in manifest
+        assert "#EXTINF:2.000," in manifest
+
+    def test_segment_count_follows_segment_duration(self, multiview):
+        multiview.segment_duration = 4
+        manifest = multiview.generate_manifest(30, "ids=1,2")
+        assert multiview.segment_count(30) == manifest.count("#EXTINF") == 8
+
+
+class TestHandClip:
+    """[STREAM] 핸드 클립 smart cut"""
+
+    @pytest.fixture
+    def clips(self, service: StreamingService, monkeypatch: pytest.MonkeyPatch):
+        from src.services import clip
+
+        monkeypatch.setattr(clip, "streaming_service", service)
+        return clip.ClipService()
+
+    def test_parse_keyframes(self):
+        from src.services.clip import parse_keyframes
+
+        output = "9.000,K__\n9.033,___\n12.000,K_\n18.000,K_\n30.000,K_\nN/A,K_\n"
+        assert parse_keyframes(output, 10, 20) == [12.0, 18.0]
+
+    def test_plan_copies_between_keyframes(self, clips):
+        parts = clips.plan_cut(10, 100, [12.0, 48.0, 96.0])
+        assert parts == [("encode", 10, 12.0), ("copy", 12.0, 96.0), ("encode", 96.0, 100)]
+
+    def test_plan_without_inner_gop_reencodes(self, clips):
+        assert clips.plan_cut(10, 15, [12.0]) == [("encode", 10, 15)]
+
+    def test_clip_cache_keyed_by_hand_and_rendition(self, clips):
+        source = clips.get_clip_path(1, "f1", 10, 100, "source")
+        assert source != clips.get_clip_path(1, "f1", 10, 100, "720p")
+        assert source != clips.get_clip_path(1, "f1", 10, 101, "source")
+        assert source.name.startswith("hand_1_source-")
+
+    def test_mux_is_faststart_copy(self, clips, tmp_path: Path):
+        cmd = clips.build_mux_command(tmp_path / "parts.txt", "src.mp4", 10, 100, tmp_path / "o")
+        assert cmd[cmd.index("-c:v") + 1] == "copy"
+        assert cmd[cmd.index("-tag:v") + 1] == "avc3"
+        assert "+faststart" in cmd
+
+    def test_edge_encode_is_pinned_to_source(self):
+        from src.services.clip import edge_video_settings
+
+        h264 = {"codec": "h264", "pix_fmt": "yuv420p", "profile": "High", "level": 41,
+                "resolution": "1920x1080"}
+        settings_ = edge_video_settings(h264)
+        assert settings_[settings_.index("-profile:v") + 1] == "high"
+        assert settings_[settings_.index("-level:v") + 1] == "4.1"
+        assert settings_[settings_.index("-s") + 1] == "1920x1080"
+
+        assert edge_video_settings(h264 | {"codec": "hevc"}) is None
+        assert edge_video_settings(h264 | {"pix_fmt": "yuv420p10le"}) is None
+        assert edge_video_settings(h264 | {"profile": "High 4:4:4 Predictive"}) is None
+        assert edge_video_settings(None) is None
+
+    @pytest.mark.asyncio
+    async def test_incompatible_source_is_fully_reencoded(
+        self, clips, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        from src.services import clip
+
+        async def fake_keyframes(path, start, end):
+            return [12.0, 48.0, 96.0]
+
+        async def fake_probe(path, timeout=None):
+            return {"codec": "hevc", "pix_fmt": "yuv420p10le", "profile": "Main 10",
+                    "level": 150, "resolution": "3840x2160"}
+
+        jobs = []
+
+        async def fake_run(kind, cmd, tmp_path, output_path):
+            jobs.append(cmd)
+            return True
+
+        monkeypatch.setattr(clip, "probe_keyframes", fake_keyframes)
+        monkeypatch.setattr(clip, "probe_media", fake_probe)
+        monkeypatch.setattr(clip.transcode_queue, "run", fake_run)
+
+        clip_path = clips.get_clip_path(1, "f1", 10, 100, "source")
+        assert await clips._create_clip(clip_path, str(tmp_path / "a.mkv"), 10, 100, "source")
+        (cmd,) = jobs
+        assert cmd[cmd.index("-c:v") + 1] == "libx264"
+        assert "concat" not in cmd
+
+    @pytest.mark.asyncio
+    async def test_unwritable_cache_is_not_an_error(
+        self, clips, monkeypatch: pytest.MonkeyPatch
+    ):
+        def fail_mkdir(self, *args, **kwargs):
+            raise PermissionError("read-only")
+
+        monkeypatch.setattr(Path, "mkdir", fail_mkdir)
+        clip_path = clips.get_clip_path(1, "f1", 10, 100, "source")
+        assert not await clips._create_clip(clip_path, "/mnt/nas/a.mp4", 10, 100, "source")
+
+
+class TestAudioRendition:
+    """[STREAM] 오디오 전용 렌디션 그룹"""
+
+    @pytest.mark.asyncio
+    async def test_master_shares_audio_group(self, service: StreamingService):
+        manifest = await service.generate_master_manifest(1, 600)
+        lines = manifest.splitlines()
+
+        media = [line for line in lines if line.startswith("#EXT-X-MEDIA:")]
+        assert len(media) == 1
+        assert 'TYPE=AUDIO,GROUP-ID="aac"' in media[0]
+        assert 'URI="playlist_audio.m3u8"' in media[0]
+
+        variants = [line for line in lines if line.startswith("#EXT-X-STREAM-INF")]
+        assert all('AUDIO="aac"' in line for line in variants)
+        # 비디오 4개 + 오디오 전용 1개
+        assert len(variants) == 5
+        assert lines[-1] == "playlist_audio.m3u8"
+
+    @pytest.mark.asyncio
+    async def test_silent_source_omits_audio_group(
+        self, service: StreamingService, monkeypatch: pytest.MonkeyPatch
+    ):
+        async def fake_probe(path, timeout=None):
+            return {"has_audio": False}
+
+        monkeypatch.setattr("src.services.streaming.probe_media", fake_probe)
+        with_audio = await service.has_audio("/mnt/nas/silent.mp4")
+        manifest = await service.generate_master_manifest(1, 600, with_audio=with_audio)
+
+        assert not with_audio
+        assert "#EXT-X-MEDIA" not in manifest
+        assert "AUDIO=" not in manifest and "mp4a" not in manifest
+        assert manifest.count("#EXT-X-STREAM-INF") == 4
+
+    @pytest.mark.asyncio
+    async def test_segment_uris_carry_quality(self, service: StreamingService):
+        manifest = await service.generate_quality_manifest(1, 30, "audio")
+        assert "segment_00004.ts?quality=audio" in manifest
+
+    def test_video_is_demuxed_and_audio_encoded_once(self, service: StreamingService, tmp_path: Path):
+        video = service.build_segment_command("src.mp4", 3, "720p", tmp_path / "v.ts", "fast")
+        audio = service.build_segment_command("src.mp4", 3, "audio", tmp_path / "a.ts", "fast")
+
+        assert "-an" in video
+        assert "-c:a" not in video
+        assert "libx264" not in audio
+        assert audio[audio.index("-map") + 1] == "0:a:0"
+        offset = str(3 * settings.HLS_SEGMENT_DURATION)
+        assert video[video.index("-output_ts_offset") + 1] == offset
+        assert audio[audio.index("-output_ts_offset") + 1] == offset
+
+    def test_audio_has_own_cache(self, service: StreamingService):
+        assert service.get_rendition_key("audio").startswith("audio-")
+        assert service.get_segment_path("f1", 0, "audio") != service.get_segment_path("f1", 0, "720p")
@@ -1,6 +1,8 @@
 -- WSOPTV Database Schema
 -- PostgreSQL 16
 
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- ============================================================================
 -- Types (Enums)
 -- ============================================================================
@@ -92,10 +94,15 @@ CREATE TABLE files (
     codec VARCHAR(50),
     fps FLOAT,
     bitrate_kbps INTEGER,
+    probed_at TIMESTAMPTZ,
     hls_ready BOOLEAN NOT NULL DEFAULT FALSE,
-    hls_path VARCHAR(500)
+    hls_path VARCHAR(500),
+    content_hash VARCHAR(64),
+    duplicate_of VARCHAR(100) REFERENCES files(id) ON DELETE SET NULL
 );
 
+CREATE INDEX ix_files_content_hash ON files(content_hash);
+
 -- ============================================================================
 -- Contents
 -- ============================================================================
@@ -210,6 +217,35 @@ CREATE INDEX idx_view_events_user_id ON view_events(user_id);
 CREATE INDEX idx_view_events_content_id ON view_events(content_id);
 CREATE INDEX idx_view_events_created_at ON view_events(created_at);
 
+-- ============================================================================
+-- Jellyfin Items (Catalog Mirror)
+-- ============================================================================
+
+CREATE TABLE jellyfin_items (
+    id VARCHAR(64) PRIMARY KEY,
+    library_id VARCHAR(64) NOT NULL,
+    library_name VARCHAR(200) NOT NULL,
+    name VARCHAR(500) NOT NULL,
+    sort_name VARCHAR(500),
+    type VARCHAR(50) NOT NULL,
+    path TEXT,
+    series_name VARCHAR(500),
+    production_year INTEGER,
+    run_time_ticks BIGINT,
+    date_created TIMESTAMP WITH TIME ZONE,
+    date_last_saved TIMESTAMP WITH TIME ZONE,
+    data JSONB NOT NULL,
+    synced_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX ix_jellyfin_items_library_created ON jellyfin_items(library_id, date_created);
+CREATE INDEX ix_jellyfin_items_library_sort_name ON jellyfin_items(library_id, sort_name);
+CREATE INDEX ix_jellyfin_items_date_last_saved ON jellyfin_items(date_last_saved);
+CREATE INDEX ix_jellyfin_items_library_name_created
+    ON jellyfin_items(lower(library_name), date_created DESC NULLS LAST, id);
+CREATE INDEX ix_jellyfin_items_created ON jellyfin_items(date_created DESC NULLS LAST, id);
+CREATE INDEX ix_jellyfin_items_name_trgm ON jellyfin_items USING gin (name gin_trgm_ops);
+
 -- ============================================================================
 -- Initial Data
 -- ============================================================================